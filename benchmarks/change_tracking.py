@@ -0,0 +1,68 @@
+"""
+Compares the tile change check of color waits with the color search it lets them skip.
+
+Run from the repository root:
+
+    python benchmarks/change_tracking.py [width height]
+
+On one core with a 1920 x 1080 frame it printed:
+
+    operation                 ms
+    tracker, unchanged      1.36
+    tracker, one pixel      1.73
+    ColorQuery.first       27.10
+    ColorQuery.points      33.00
+"""
+import sys
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from simpleautogui.screen.changes import TileChangeTracker  # noqa: E402
+from simpleautogui.screen.colors import ColorQuery  # noqa: E402
+
+
+def best_time(function, runs: int = 20) -> float:
+    times = []
+    for _ in range(runs):
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    width, height = (int(value) for value in sys.argv[1:3]) if len(sys.argv) > 2 else (1920, 1080)
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    changed = frame.copy()
+    changed[height // 2, width // 2] ^= 1
+    query = ColorQuery([(1, 2, 3)], confidence=0.9)
+
+    same = frame.copy()
+    unchanged = TileChangeTracker()
+    unchanged.update(frame)
+    # Every update of the alternating tracker sees one changed pixel.
+    alternating = TileChangeTracker()
+    alternating.update(frame)
+    pair = [frame, changed]
+
+    def update_changed():
+        pair.reverse()
+        alternating.update(pair[0])
+
+    print(f'{"operation":<20} {"ms":>7}')
+    for name, function in (
+            ('tracker, unchanged', lambda: unchanged.update(same)),
+            ('tracker, one pixel', update_changed),
+            ('ColorQuery.first', lambda: query.first(frame)),
+            ('ColorQuery.points', lambda: query.points(frame)),
+    ):
+        print(f'{name:<20} {best_time(function) * 1000:7.2f}')
+
+
+if __name__ == '__main__':
+    main()
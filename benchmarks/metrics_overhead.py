@@ -0,0 +1,45 @@
+"""
+Measures the cost of one instrumented span with metrics disabled and enabled.
+
+Run from the repository root:
+
+    python benchmarks/metrics_overhead.py [iterations]
+"""
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from simpleautogui.screen.metrics import Metrics, span, use_metrics  # noqa: E402
+
+
+def span_cost(iterations: int) -> float:
+    start = perf_counter()
+    for _ in range(iterations):
+        with span('capture'):
+            pass
+    return (perf_counter() - start) / iterations
+
+
+def loop_cost(iterations: int) -> float:
+    start = perf_counter()
+    for _ in range(iterations):
+        pass
+    return (perf_counter() - start) / iterations
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    empty = loop_cost(iterations)
+    disabled = span_cost(iterations) - empty
+    with use_metrics(Metrics()):
+        enabled = span_cost(iterations) - empty
+
+    print(f'{"metrics":>8} {"ns per span":>12}')
+    print(f'{"disabled":>8} {disabled * 1e9:12.0f}')
+    print(f'{"enabled":>8} {enabled * 1e9:12.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures every OCR preprocessing stage and compares the legacy PIL pipeline with the numpy one.
+
+Run from the repository root:
+
+    python benchmarks/preprocess.py [width height scale]
+"""
+import sys
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+from PIL import Image, ImageEnhance, ImageFilter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from simpleautogui.screen.ocr.preprocess import (  # noqa: E402
+    Contrast, Denoise, Grayscale, Pipeline, Scale, Sharpen, Threshold
+)
+
+
+def pil_pipeline(image: Image.Image, contrast: float, resize: float) -> Image.Image:
+    image = image.resize([int(resize * size) for size in image.size], Image.LANCZOS)
+    image = ImageEnhance.Contrast(image).enhance(contrast)
+    return image.filter(ImageFilter.SHARPEN)
+
+
+def measure(function, *args, repeat: int = 3) -> float:
+    function(*args)
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        function(*args)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    width, height, scale = (int(value) for value in sys.argv[1:4]) if len(sys.argv) > 3 else (1920, 1080, 4)
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    scaled = Pipeline(Scale(scale)).run(frame)
+    gray = Pipeline(Grayscale()).run(scaled)
+
+    print(f'{width}x{height}, scale {scale}')
+    print(f'{"stage":>24} {"input":>12} {"time, ms":>10}')
+    stages = (
+        ('Scale', Scale(scale), frame),
+        ('Grayscale', Grayscale(), scaled),
+        ('Contrast rgb', Contrast(1.5), scaled),
+        ('Contrast gray', Contrast(1.5), gray),
+        ('Sharpen rgb', Sharpen(), scaled),
+        ('Sharpen gray', Sharpen(), gray),
+        ('Threshold', Threshold(), gray),
+        ('Denoise', Denoise(3), gray),
+    )
+    for name, stage, image in stages:
+        out = np.empty(stage.output_shape(image.shape), dtype=np.uint8)
+        shape = 'x'.join(map(str, image.shape[1::-1]))
+        print(f'{name:>24} {shape:>12} {measure(stage.apply, image, out) * 1000:10.1f}')
+
+    legacy = Pipeline(Scale(scale), Contrast(1.5), Sharpen())
+    gray_pipeline = Pipeline(Grayscale(), Scale(scale), Contrast(1.5), Sharpen())
+    print()
+    pil_time = measure(pil_pipeline, Image.fromarray(frame), 1.5, scale)
+    print(f'{"PIL resize/contrast/sharpen":>36} {pil_time * 1000:10.1f} ms')
+    print(f'{"numpy scale/contrast/sharpen":>36} {measure(legacy, frame) * 1000:10.1f} ms')
+    print(f'{"numpy gray/scale/contrast/sharpen":>36} {measure(gray_pipeline, frame) * 1000:10.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
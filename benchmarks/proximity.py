@@ -0,0 +1,57 @@
+"""
+Compares greedy proximity filtering with the grid hash against the former pairwise scan.
+
+Run from the repository root:
+
+    python benchmarks/proximity.py
+"""
+import sys
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from simpleautogui.screen.proximity import proximity_filter  # noqa: E402
+
+
+def pairwise_filter(coordinates: list[tuple[int, int]], proximity_threshold_px: int) -> list[tuple[int, int]]:
+    result = []
+    for x, y in coordinates:
+        if not any(
+                abs(x - saved_x) <= proximity_threshold_px and abs(y - saved_y) <= proximity_threshold_px
+                for saved_x, saved_y in result
+        ):
+            result.append((x, y))
+    return result
+
+
+def measure(function, *args) -> float:
+    start = perf_counter()
+    function(*args)
+    return perf_counter() - start
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    threshold = 2
+    print(f'{"candidates":>10} {"layout":>8} {"kept":>8} {"grid, s":>9} {"pairwise, s":>12}')
+    for count in (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6):
+        layouts = {
+            # Every pixel of a solid block, the worst case produced by wait_colors.
+            'block': np.argwhere(np.ones((count // 1000, 1000), dtype=bool))[:, ::-1],
+            'scatter': rng.integers(0, 3840, size=(count, 2)),
+        }
+        for name, coordinates in layouts.items():
+            kept = proximity_filter(coordinates, threshold)
+            grid_time = measure(proximity_filter, coordinates, threshold)
+            if count <= 10 ** 4:
+                pairwise_time = f'{measure(pairwise_filter, coordinates.tolist(), threshold):12.3f}'
+            else:
+                pairwise_time = f'{"skipped":>12}'
+            print(f'{count:>10} {name:>8} {len(kept):>8} {grid_time:9.3f} {pairwise_time}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Measures how long MacroRunner.stop waits for a macro that is busy matching a template against a large frame,
+and how long one cancellable match takes compared to an unbanded one.
+
+Run from the repository root:
+
+    python benchmarks/stop_latency.py [width height template_side]
+
+On one core with a 1920 x 1080 frame it printed:
+
+     band rows  median, ms  max, ms
+           256        19.4     52.1
+      unbanded       150.4    291.9
+
+      template  unbanded, ms  banded, ms
+            32         253.9       212.2
+           300         439.8       459.9
+
+A 300 px template leaves fewer placement rows than one band, so that match runs unbanded either way.
+"""
+import sys
+from pathlib import Path
+from threading import Event
+from time import perf_counter, sleep
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from simpleautogui.macro import AbstractMacro, MacroContext, MacroRunner  # noqa: E402
+from simpleautogui.screen.classes.base import Region  # noqa: E402
+from simpleautogui.screen.frames import ReplayFrameSource, set_frame_source  # noqa: E402
+from simpleautogui.screen.matching import TemplateMatcher  # noqa: E402
+from simpleautogui.screen.templates import Template  # noqa: E402
+
+
+class MatchMacro(AbstractMacro):
+    def __init__(self, region: Region, template: Template):
+        self.region = region
+        self.template = template
+        self.waiting = Event()
+
+    def run(self, context: MacroContext) -> None:
+        self.waiting.set()
+        context.wait_image(self.region, self.template, timeout=60, check_interval=0.01)
+
+
+def stop_latencies(region: Region, template: Template, runs: int) -> list[float]:
+    latencies = []
+    for run in range(runs):
+        macro = MatchMacro(region, template)
+        runner = MacroRunner(macro)
+        runner.start()
+        macro.waiting.wait()
+        # Spread stop requests over the matching of a frame.
+        sleep(0.05 + 0.031 * run)
+        start = perf_counter()
+        runner.stop(wait=True)
+        latencies.append(perf_counter() - start)
+    return latencies
+
+
+def match_time(frame: np.ndarray, template: Template, cancel: Event | None, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = perf_counter()
+        TemplateMatcher.match_template(frame, template, 0.99, cancel=cancel)
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    width, height, side = (int(value) for value in sys.argv[1:4]) if len(sys.argv) > 3 else (1920, 1080, 64)
+    rng = np.random.default_rng(0)
+    set_frame_source(ReplayFrameSource([rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)]))
+    region = Region(0, 0, width, height)
+    template = Template.from_array(rng.integers(0, 256, size=(side, side, 3), dtype=np.uint8), name='missing')
+
+    print(f'{"band rows":>10} {"median, ms":>11} {"max, ms":>8}')
+    for band_rows in (TemplateMatcher.BAND_ROWS, 10 ** 6):
+        with patch.object(TemplateMatcher, 'BAND_ROWS', band_rows):
+            latencies = np.array(stop_latencies(region, template, runs=10)) * 1000
+        name = band_rows if band_rows < 10 ** 6 else 'unbanded'
+        print(f'{name:>10} {np.median(latencies):11.1f} {latencies.max():8.1f}')
+
+    frame = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    print()
+    print(f'{"template":>10} {"unbanded, ms":>13} {"banded, ms":>11}')
+    for template_side in (32, 300):
+        template = Template.from_array(rng.integers(0, 256, size=(template_side, template_side, 3), dtype=np.uint8))
+        unbanded = match_time(frame, template, None, runs=10) * 1000
+        banded = match_time(frame, template, Event(), runs=10) * 1000
+        print(f'{template_side:>10} {unbanded:13.1f} {banded:11.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,9 @@
 import simpleautogui.screen
 import simpleautogui.win
 from simpleautogui._version import __version__
-from simpleautogui.macro import AbstractMacro, MacroContext, MacroRunner, MacroState, MacroStopped
-from simpleautogui.screen.classes.base import Point, Region
+from simpleautogui.async_macro import AbstractAsyncMacro, AsyncMacroContext, AsyncMacroRunner, CaptureHub
+from simpleautogui.macro import AbstractMacro, MacroContext, MacroRunner, MacroState, MacroStopped, PriorityLock
+from simpleautogui.macro_pool import MacroPool
+from simpleautogui.screen.classes.base import Point, PointSet, Region, RegionSet
 from simpleautogui.win.windows.classes import Window, WindowsGrid, Monitor
 from simpleautogui.win.console.base import cmd, powershell
@@ -0,0 +1,462 @@
+from __future__ import annotations
+
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from pathlib import Path
+from threading import Event
+from typing import Any, AsyncIterator, Callable, TypeVar
+
+from simpleautogui.macro import MacroRunner, MacroState, MacroStopped, PriorityLock
+from simpleautogui.screen.cancel import OperationCancelled, cancel_scope
+from simpleautogui.screen.changes import TileChangeTracker
+from simpleautogui.screen.classes.base import Point, PointSet, Region, RegionSet
+from simpleautogui.screen.colors import Blob
+from simpleautogui.screen.conditions import Condition, Fired, check_all, check_any
+from simpleautogui.screen.frames import FrameSource, get_frame_source
+from simpleautogui.screen.metrics import Metrics, get_metrics, span, use_metrics
+from simpleautogui.screen.polling import PollStrategy, Poller
+from simpleautogui.screen.snapshot import ScreenSnapshot
+from simpleautogui.screen.templates import TemplateLike
+from simpleautogui.screen.trace import get_trace_recorder, record_wait, use_trace_recorder
+
+T = TypeVar("T")
+
+
+class CaptureHub:
+    """Grabs one ScreenSnapshot per tick covering the regions of all async waits that asked for a frame."""
+
+    def __init__(
+            self,
+            interval: int | float = 0.02,
+            source: FrameSource | None = None,
+            executor: Executor | None = None,
+    ):
+        if interval < 0:
+            raise ValueError("interval must be greater than or equal to 0.")
+        self.interval = float(interval)
+        self.source = source or get_frame_source()
+        self.executor = executor
+        self.metrics = get_metrics()
+        self.captures = 0
+        self._regions: set[tuple[int, int, int, int]] = set()
+        self._next: asyncio.Future[ScreenSnapshot] | None = None
+        self._task: asyncio.Task | None = None
+        self._last = float("-inf")
+
+    async def snapshot(self, *regions: Region) -> ScreenSnapshot:
+        """Returns the next capture, which contains the regions; waits asking before it starts share it."""
+        self._regions.update(region.to_tuple() for region in regions)
+        if self._next is None:
+            loop = asyncio.get_running_loop()
+            self._next = loop.create_future()
+            self._task = loop.create_task(self._capture(self._next))
+        return await asyncio.shield(self._next)
+
+    async def _capture(self, future: asyncio.Future[ScreenSnapshot]) -> None:
+        loop = asyncio.get_running_loop()
+        # Sleeping at least once lets waits started in the same loop iteration join this capture.
+        await asyncio.sleep(max(self._last + self.interval - loop.time(), 0))
+        regions, self._regions = self._regions, set()
+        self._next = None
+        self._last = loop.time()
+        try:
+            snapshot = await loop.run_in_executor(self.executor, self._grab, regions)
+        except Exception as error:
+            future.set_exception(error)
+        else:
+            self.captures += 1
+            future.set_result(snapshot)
+
+    def _grab(self, regions: set[tuple[int, int, int, int]]) -> ScreenSnapshot:
+        with use_metrics(self.metrics):
+            return ScreenSnapshot(regions, self.source)
+
+
+class AsyncMacroContext:
+    """Runtime context passed to an async macro execution; waits are coroutines that can run concurrently."""
+
+    def __init__(
+            self,
+            stop_event: Event,
+            hub: CaptureHub | None = None,
+            executor: Executor | None = None,
+            input_lock: PriorityLock | None = None,
+            priority: int = 0,
+            stats: Metrics | None = None,
+    ):
+        self._stop_event = stop_event
+        self._stopped = asyncio.Event()
+        if stop_event.is_set():
+            self._stopped.set()
+        self.executor = executor
+        self.hub = hub or CaptureHub(executor=executor)
+        self.input_lock = input_lock
+        self.priority = priority
+        self.stats = stats
+        self.last_poller: Poller | None = None
+        self._recorder = get_trace_recorder()
+
+    @property
+    def is_stop_requested(self) -> bool:
+        return self._stop_event.is_set()
+
+    @property
+    def is_running(self) -> bool:
+        return not self.is_stop_requested
+
+    def stop(self) -> None:
+        """Requests stop; call it from the event loop thread, other threads use AsyncMacroRunner.stop."""
+        self._stop_event.set()
+        self._stopped.set()
+
+    def check_stop(self) -> None:
+        if self.is_stop_requested:
+            raise MacroStopped()
+
+    async def sleep(self, seconds: int | float) -> None:
+        self.check_stop()
+        with span("sleep"):
+            await self._sleep_or_stop(float(seconds))
+
+    def poller(
+            self,
+            timeout: int | float,
+            check_interval: int | float = 0.1,
+            strategy: PollStrategy | None = None,
+    ) -> Poller:
+        """Creates a Poller for ``async for`` whose sleeps end with MacroStopped as soon as stop is requested."""
+        if check_interval <= 0:
+            raise ValueError("check_interval must be greater than 0.")
+        self.check_stop()
+        self.last_poller = Poller(timeout, check_interval, strategy=strategy, sleep=self._sleep_or_stop)
+        return self.last_poller
+
+    @asynccontextmanager
+    async def input(self) -> AsyncIterator[AsyncMacroContext]:
+        """Holds the shared input lock for mouse and keyboard actions; waiting for it does not block the loop."""
+        if self.input_lock is None:
+            yield self
+            return
+        if not await self.run_in_executor(self.input_lock.acquire, self, self.priority, None, self._stop_event):
+            raise MacroStopped()
+        try:
+            yield self
+        finally:
+            self.input_lock.release(self)
+
+    async def run_in_executor(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Runs a blocking call on the executor; matching and OCR inside it end with MacroStopped on stop."""
+        self.check_stop()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.executor, partial(self._call, function, args, kwargs))
+        except OperationCancelled:
+            raise MacroStopped() from None
+
+    async def wait_image(
+            self,
+            region: Region,
+            paths: TemplateLike | tuple[TemplateLike, ...] | list[TemplateLike],
+            timeout: int | float = 10,
+            confidence: float = 0.9,
+            check_interval: int | float = 0.1,
+            pyramid: bool | int = False,
+            strategy: PollStrategy | None = None,
+    ) -> Region | None:
+        found = await self._wait(
+            region, timeout, check_interval, strategy,
+            ScreenSnapshot.find_image, paths, confidence=confidence, pyramid=pyramid,
+        )
+        return record_wait("wait_image", region, found)
+
+    async def wait_images(
+            self,
+            region: Region,
+            paths: TemplateLike | tuple[TemplateLike, ...] | list[TemplateLike],
+            timeout: int | float = 10,
+            confidence: float = 0.9,
+            check_interval: int | float = 0.1,
+            proximity_threshold_px: int = 2,
+            min_matches: int = 1,
+            pyramid: bool | int = False,
+            strategy: PollStrategy | None = None,
+    ) -> RegionSet:
+        found = await self._wait(
+            region, timeout, check_interval, strategy,
+            ScreenSnapshot.find_images, paths, confidence=confidence, pyramid=pyramid,
+            proximity_threshold_px=proximity_threshold_px, min_matches=min_matches,
+        )
+        return record_wait("wait_images", region, found or RegionSet())
+
+    async def wait_text(
+            self,
+            region: Region,
+            text: str,
+            timeout: int | float = 10,
+            lang: str = "eng+rus",
+            check_interval: int | float = 0.1,
+            case_sensitive: bool = False,
+            min_confidence: int = 80,
+            max_distance: int = 0,
+            strategy: PollStrategy | None = None,
+            **preprocess_kwargs,
+    ) -> Region | None:
+        found = await self._wait(
+            region, timeout, check_interval, strategy,
+            self._find_first_text, text, lang=lang, case_sensitive=case_sensitive,
+            min_confidence=min_confidence, max_distance=max_distance, **preprocess_kwargs,
+        )
+        return record_wait("wait_text", region, found)
+
+    async def wait_color(
+            self,
+            region: Region,
+            color: str | tuple[int, int, int] | list[int],
+            timeout: int | float = 10,
+            confidence: float = 0.9,
+            check_interval: int | float = 0.1,
+            strategy: PollStrategy | None = None,
+    ) -> Point | None:
+        found = await self._wait(
+            region, timeout, check_interval, strategy,
+            ScreenSnapshot.find_color, color, confidence=confidence,
+        )
+        return record_wait("wait_color", region, found)
+
+    async def wait_colors(
+            self,
+            region: Region,
+            color: str
+                   | tuple[int, int, int]
+                   | list[int]
+                   | tuple[str | tuple[int, int, int], ...]
+                   | list[str | tuple[int, int, int]],
+            timeout: int | float = 10,
+            confidence: float = 0.9,
+            check_interval: int | float = 0.1,
+            proximity_threshold_px: int = 2,
+            min_matches: int = 0,
+            strategy: PollStrategy | None = None,
+    ) -> PointSet | None:
+        found = await self._wait(
+            region, timeout, check_interval, strategy,
+            ScreenSnapshot.find_colors, color, confidence=confidence,
+            proximity_threshold_px=proximity_threshold_px, min_matches=min_matches,
+        )
+        return record_wait("wait_colors", region, found)
+
+    async def wait_blobs(
+            self,
+            region: Region,
+            color: str
+                   | tuple[int, int, int]
+                   | list[int]
+                   | tuple[str | tuple[int, int, int], ...]
+                   | list[str | tuple[int, int, int]],
+            timeout: int | float = 10,
+            confidence: float = 0.9,
+            check_interval: int | float = 0.1,
+            min_area: int = 1,
+            min_matches: int = 1,
+            strategy: PollStrategy | None = None,
+    ) -> list[Blob]:
+        found = await self._wait(
+            region, timeout, check_interval, strategy,
+            ScreenSnapshot.find_blobs, color, confidence=confidence, min_area=min_area, min_matches=min_matches,
+        )
+        return record_wait("wait_blobs", region, found or [])
+
+    async def wait_any(
+            self,
+            *conditions: Condition,
+            timeout: int | float = 10,
+            check_interval: int | float = 0.1,
+            strategy: PollStrategy | None = None,
+    ) -> Fired | None:
+        """Waits until one of the conditions holds, checking all of them on one shared capture per poll."""
+        found = await self._wait_conditions(check_any, conditions, timeout, check_interval, strategy)
+        return record_wait("wait_any", conditions, found)
+
+    async def wait_all(
+            self,
+            *conditions: Condition,
+            timeout: int | float = 10,
+            check_interval: int | float = 0.1,
+            strategy: PollStrategy | None = None,
+    ) -> list | None:
+        """Waits until all conditions hold on the same capture and returns their results."""
+        found = await self._wait_conditions(check_all, conditions, timeout, check_interval, strategy)
+        return record_wait("wait_all", conditions, found)
+
+    async def _wait_conditions(
+            self,
+            check: Callable[[list[Condition], ScreenSnapshot], T | None],
+            conditions: tuple[Condition, ...],
+            timeout: int | float,
+            check_interval: int | float,
+            strategy: PollStrategy | None,
+    ) -> T | None:
+        if not conditions:
+            raise ValueError("At least one condition must be provided.")
+        regions = [condition.region for condition in conditions]
+        poller = self.poller(timeout, check_interval, strategy)
+        async for _ in poller:
+            snapshot = await self.hub.snapshot(*regions)
+            result = await self.run_in_executor(check, conditions, snapshot)
+            if result is not None:
+                poller.found()
+                return result
+        return None
+
+    async def _wait(
+            self,
+            region: Region,
+            timeout: int | float,
+            check_interval: int | float,
+            strategy: PollStrategy | None,
+            check: Callable[..., T],
+            *args: Any,
+            **kwargs: Any,
+    ) -> T | None:
+        changes = TileChangeTracker()
+        poller = self.poller(timeout, check_interval, strategy)
+        async for _ in poller:
+            snapshot = await self.hub.snapshot(region)
+            self.check_stop()
+            if changes.update(snapshot.view(region)) is None:
+                continue
+            found = await self.run_in_executor(check, snapshot, region, *args, **kwargs)
+            if found:
+                poller.found()
+                return found
+        return None
+
+    async def _sleep_or_stop(self, seconds: float) -> None:
+        if seconds <= 0:
+            await asyncio.sleep(0)
+        else:
+            try:
+                await asyncio.wait_for(self._stopped.wait(), seconds)
+            except asyncio.TimeoutError:
+                pass
+        self.check_stop()
+
+    def _call(self, function: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        with cancel_scope(self._stop_event), use_metrics(self.stats), use_trace_recorder(self._recorder):
+            return function(*args, **kwargs)
+
+    @staticmethod
+    def _find_first_text(snapshot: ScreenSnapshot, region: Region, text: str, **kwargs) -> Region | None:
+        found = snapshot.find_text(region, text, **kwargs)
+        return found[0] if found else None
+
+
+class AbstractAsyncMacro(ABC):
+    """Abstract base class for automation scripts whose hooks are coroutines."""
+
+    async def on_start(self, context: AsyncMacroContext) -> None:
+        pass
+
+    @abstractmethod
+    async def run(self, context: AsyncMacroContext) -> None:
+        pass
+
+    async def on_stop(self, context: AsyncMacroContext) -> None:
+        pass
+
+    async def on_error(self, context: AsyncMacroContext, error: Exception) -> None:
+        raise error
+
+
+class AsyncMacroRunner(MacroRunner):
+    """Runs an AbstractAsyncMacro on an event loop in a worker thread and controls it like MacroRunner."""
+
+    def __init__(
+            self,
+            macro: AbstractAsyncMacro | Callable[[], AbstractAsyncMacro],
+            start_hotkey: str | None = None,
+            stop_hotkey: str | None = None,
+            toggle_hotkey: str | None = None,
+            daemon: bool = True,
+            frame_source: FrameSource | None = None,
+            input_lock: PriorityLock | None = None,
+            priority: int = 0,
+            stats: Metrics | bool | None = None,
+            trace: str | Path | None = None,
+            capture_interval: int | float = 0.02,
+            max_workers: int | None = None,
+    ):
+        super().__init__(
+            macro, start_hotkey, stop_hotkey, toggle_hotkey, daemon,
+            frame_source=frame_source, input_lock=input_lock, priority=priority, stats=stats, trace=trace,
+        )
+        self.capture_interval = capture_interval
+        self.max_workers = max_workers
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._context: AsyncMacroContext | None = None
+
+    def stop(self, wait: bool = False, timeout: int | float | None = None) -> bool:
+        if not super().stop():
+            return False
+        with self._lock:
+            loop, context = self._loop, self._context
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(context.stop)
+            except RuntimeError:
+                # The loop has already finished.
+                pass
+        if wait:
+            self.wait(timeout)
+        return True
+
+    def _run_worker(self) -> None:
+        try:
+            with self._use_frame_source(), use_metrics(self.stats):
+                asyncio.run(self._run_macro())
+        finally:
+            self._flush_stats()
+            with self._lock:
+                self._state = MacroState.IDLE
+                self._thread = None
+                self._loop = None
+                self._context = None
+
+    async def _run_macro(self) -> None:
+        executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="simpleautogui-async-macro")
+        context = AsyncMacroContext(
+            self._stop_event, CaptureHub(self.capture_interval, executor=executor), executor,
+            input_lock=self.input_lock, priority=self.priority, stats=self.stats,
+        )
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._context = context
+        if self._stop_event.is_set():
+            context.stop()
+
+        macro = self._create_macro()
+        try:
+            await macro.on_start(context)
+            context.check_stop()
+            await macro.run(context)
+        except MacroStopped:
+            pass
+        except Exception as error:
+            self.last_error = error
+            try:
+                await macro.on_error(context, error)
+            except Exception as hook_error:
+                self.last_error = hook_error
+        finally:
+            try:
+                await macro.on_stop(context)
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _create_macro(self) -> AbstractAsyncMacro:
+        if isinstance(self.macro, AbstractAsyncMacro):
+            return self.macro
+        return self.macro()
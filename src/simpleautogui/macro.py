@@ -1,11 +1,26 @@
 from __future__ import annotations
 
+import heapq
 from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
 from enum import Enum
+from itertools import count
+from pathlib import Path
+from threading import Condition as ThreadCondition
 from threading import Event, Lock, Thread
-from typing import Callable
+from time import monotonic
+from typing import Callable, Hashable, Iterator
 
-from simpleautogui.screen.classes.base import Point, Region
+from simpleautogui.screen.cancel import CANCEL_POLL_INTERVAL, OperationCancelled, cancel_scope
+from simpleautogui.screen.classes.base import Point, PointSet, Region, RegionSet
+from simpleautogui.screen.colors import Blob
+from simpleautogui.screen.conditions import Condition, Fired, wait_all, wait_any
+from simpleautogui.screen.frames import FrameSource, get_frame_source, use_frame_source
+from simpleautogui.screen.metrics import Metrics, span, use_metrics
+from simpleautogui.screen.ocr import OcrWatcher
+from simpleautogui.screen.polling import PollStrategy, Poller
+from simpleautogui.screen.templates import TemplateLike
+from simpleautogui.screen.trace import TraceRecorder, record_wait, use_trace_recorder
 
 
 class MacroStopped(Exception):
@@ -18,11 +33,78 @@ class MacroState(str, Enum):
     STOPPING = "stopping"
 
 
+class PriorityLock:
+    """Reentrant lock handed to the waiting owner with the highest priority, first come first served on ties."""
+
+    def __init__(self):
+        self._condition = ThreadCondition()
+        self._owner: Hashable | None = None
+        self._depth = 0
+        self._waiting: list[tuple[int, int, Hashable]] = []
+        self._order = count()
+
+    @property
+    def owner(self) -> Hashable | None:
+        return self._owner
+
+    def acquire(
+            self,
+            owner: Hashable,
+            priority: int = 0,
+            timeout: int | float | None = None,
+            cancel: Event | None = None,
+    ) -> bool:
+        """Waits for the lock; returns False on timeout or when cancel is set first."""
+        deadline = None if timeout is None else monotonic() + timeout
+        with self._condition:
+            if self._owner == owner:
+                self._depth += 1
+                return True
+            entry = (-priority, next(self._order), owner)
+            heapq.heappush(self._waiting, entry)
+            try:
+                while self._owner is not None or self._waiting[0] is not entry:
+                    if cancel is not None and cancel.is_set():
+                        return False
+                    remaining = None if deadline is None else deadline - monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    if cancel is not None:
+                        remaining = CANCEL_POLL_INTERVAL if remaining is None else min(remaining, CANCEL_POLL_INTERVAL)
+                    self._condition.wait(remaining)
+                self._owner = owner
+                self._depth = 1
+                return True
+            finally:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+    def release(self, owner: Hashable) -> None:
+        with self._condition:
+            if self._owner != owner:
+                raise RuntimeError("PriorityLock released by an owner that does not hold it.")
+            self._depth -= 1
+            if not self._depth:
+                self._owner = None
+                self._condition.notify_all()
+
+
 class MacroContext:
     """Runtime context passed to a macro execution."""
 
-    def __init__(self, stop_event: Event):
+    def __init__(
+            self,
+            stop_event: Event,
+            input_lock: PriorityLock | None = None,
+            priority: int = 0,
+            stats: Metrics | None = None,
+    ):
         self._stop_event = stop_event
+        self.input_lock = input_lock
+        self.priority = priority
+        self.stats = stats
+        self.last_poller: Poller | None = None
 
     @property
     def is_stop_requested(self) -> bool:
@@ -41,94 +123,125 @@ class MacroContext:
 
     def sleep(self, seconds: int | float, check_interval: int | float = 0.05) -> None:
         self._check_positive_interval(check_interval, "check_interval")
-        end_time = float(seconds)
-        if end_time <= 0:
-            self.check_stop()
+        self.check_stop()
+        deadline = monotonic() + float(seconds)
+        with span("sleep"):
+            while True:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    return
+                if self._stop_event.wait(min(float(check_interval), remaining)):
+                    raise MacroStopped()
+
+    @contextmanager
+    def input(self) -> Iterator[MacroContext]:
+        """Holds the shared input lock for mouse and keyboard actions so they do not interleave with other macros."""
+        if self.input_lock is None:
+            yield self
             return
+        if not self.input_lock.acquire(self, self.priority, cancel=self._stop_event):
+            raise MacroStopped()
+        try:
+            yield self
+        finally:
+            self.input_lock.release(self)
+
+    @contextmanager
+    def cancellable(self) -> Iterator[MacroContext]:
+        """Makes template matching and OCR inside the block end with MacroStopped as soon as stop is requested."""
+        try:
+            with cancel_scope(self._stop_event):
+                yield self
+        except OperationCancelled:
+            raise MacroStopped() from None
 
-        elapsed = 0.0
-        while elapsed < end_time:
-            self.check_stop()
-            step = min(float(check_interval), end_time - elapsed)
-            if self._stop_event.wait(step):
-                raise MacroStopped()
-            elapsed += step
+    def poller(
+            self,
+            timeout: int | float,
+            check_interval: int | float = 0.1,
+            strategy: PollStrategy | None = None,
+    ) -> Poller:
+        """Creates a Poller whose sleeps end with MacroStopped as soon as stop is requested."""
+        self._check_positive_interval(check_interval, "check_interval")
+        self.check_stop()
+        self.last_poller = Poller(timeout, check_interval, strategy=strategy, sleep=self._sleep_or_stop)
+        return self.last_poller
 
     def wait_image(
             self,
             region: Region,
-            paths: str | tuple[str, ...] | list[str],
+            paths: TemplateLike | tuple[TemplateLike, ...] | list[TemplateLike],
             timeout: int | float = 10,
             confidence: float = 0.9,
             check_interval: int | float = 0.1,
             error_dialog: bool = False,
+            pyramid: bool | int = False,
+            strategy: PollStrategy | None = None,
     ) -> Region | None:
-        self._check_positive_interval(check_interval, "check_interval")
-        self.check_stop()
-        elapsed = 0.0
-        while elapsed <= timeout:
-            self.check_stop()
-            result = region.wait_image(
+        with self.cancellable():
+            found = region.wait_image(
                 paths=paths,
-                timeout=0,
                 confidence=confidence,
-                error_dialog=False,
-                check_interval=check_interval,
+                error_dialog=error_dialog,
+                pyramid=pyramid,
+                poller=self.poller(timeout, check_interval, strategy),
             )
-            if result is not None:
-                return result
-
-            if timeout == 0:
-                break
-            step = min(float(check_interval), float(timeout) - elapsed)
-            if step <= 0:
-                break
-            self.sleep(step, check_interval=step)
-            elapsed += step
-
-        if error_dialog:
-            region.wait_image(paths, timeout=0, confidence=confidence, error_dialog=True)
-        return None
+        return record_wait("wait_image", region, found)
 
     def wait_images(
             self,
             region: Region,
-            paths: str | tuple[str, ...] | list[str],
+            paths: TemplateLike | tuple[TemplateLike, ...] | list[TemplateLike],
             timeout: int | float = 10,
             confidence: float = 0.9,
             check_interval: int | float = 0.1,
             proximity_threshold_px: int = 2,
             min_matches: int = 1,
             error_dialog: bool = False,
-    ) -> list[Region]:
-        self._check_positive_interval(check_interval, "check_interval")
-        self.check_stop()
-        elapsed = 0.0
-        while elapsed <= timeout:
-            self.check_stop()
-            result = region.wait_images(
+            pyramid: bool | int = False,
+            strategy: PollStrategy | None = None,
+    ) -> RegionSet:
+        with self.cancellable():
+            found = region.wait_images(
                 paths=paths,
-                timeout=0,
                 confidence=confidence,
-                error_dialog=False,
-                check_interval=check_interval,
+                error_dialog=error_dialog,
                 proximity_threshold_px=proximity_threshold_px,
                 min_matches=min_matches,
+                pyramid=pyramid,
+                poller=self.poller(timeout, check_interval, strategy),
             )
-            if result:
-                return result
-
-            if timeout == 0:
-                break
-            step = min(float(check_interval), float(timeout) - elapsed)
-            if step <= 0:
-                break
-            self.sleep(step, check_interval=step)
-            elapsed += step
+        return record_wait("wait_images", region, found)
 
-        if error_dialog:
-            region.wait_images(paths, timeout=0, confidence=confidence, error_dialog=True)
-        return []
+    def wait_text(
+            self,
+            region: Region,
+            text: str,
+            timeout: int | float = 10,
+            lang: str = "eng+rus",
+            check_interval: int | float = 0.1,
+            case_sensitive: bool = False,
+            min_confidence: int = 80,
+            max_distance: int = 0,
+            error_dialog: bool = False,
+            watcher: OcrWatcher | None = None,
+            strategy: PollStrategy | None = None,
+            **preprocess_kwargs,
+    ) -> Region | None:
+        with self.cancellable():
+            found = region.wait_text(
+                text=text,
+                lang=lang,
+                case_sensitive=case_sensitive,
+                min_confidence=min_confidence,
+                max_distance=max_distance,
+                error_dialog=error_dialog,
+                check_interval=check_interval,
+                watcher=watcher,
+                poller=self.poller(timeout, check_interval, strategy),
+                **preprocess_kwargs,
+            )
+        return record_wait("wait_text", region, found)
 
     def wait_color(
             self,
@@ -138,33 +251,16 @@ class MacroContext:
             confidence: float = 0.9,
             check_interval: int | float = 0.1,
             error_dialog: bool = False,
+            strategy: PollStrategy | None = None,
     ) -> Point | None:
-        self._check_positive_interval(check_interval, "check_interval")
-        self.check_stop()
-        elapsed = 0.0
-        while elapsed <= timeout:
-            self.check_stop()
-            result = region.wait_color(
+        with self.cancellable():
+            found = region.wait_color(
                 color=color,
-                timeout=0,
                 confidence=confidence,
-                error_dialog=False,
-                check_interval=check_interval,
+                error_dialog=error_dialog,
+                poller=self.poller(timeout, check_interval, strategy),
             )
-            if result is not None:
-                return result
-
-            if timeout == 0:
-                break
-            step = min(float(check_interval), float(timeout) - elapsed)
-            if step <= 0:
-                break
-            self.sleep(step, check_interval=step)
-            elapsed += step
-
-        if error_dialog:
-            region.wait_color(color, timeout=0, confidence=confidence, error_dialog=True)
-        return None
+        return record_wait("wait_color", region, found)
 
     def wait_colors(
             self,
@@ -180,35 +276,73 @@ class MacroContext:
             proximity_threshold_px: int = 2,
             min_matches: int = 0,
             error_dialog: bool = False,
-    ) -> list[Point] | None:
-        self._check_positive_interval(check_interval, "check_interval")
-        self.check_stop()
-        elapsed = 0.0
-        while elapsed <= timeout:
-            self.check_stop()
-            result = region.wait_colors(
+            strategy: PollStrategy | None = None,
+    ) -> PointSet | None:
+        with self.cancellable():
+            found = region.wait_colors(
                 color=color,
-                timeout=0,
                 confidence=confidence,
-                error_dialog=False,
-                check_interval=check_interval,
+                error_dialog=error_dialog,
                 proximity_threshold_px=proximity_threshold_px,
                 min_matches=min_matches,
+                poller=self.poller(timeout, check_interval, strategy),
             )
-            if result:
-                return result
+        return record_wait("wait_colors", region, found)
 
-            if timeout == 0:
-                break
-            step = min(float(check_interval), float(timeout) - elapsed)
-            if step <= 0:
-                break
-            self.sleep(step, check_interval=step)
-            elapsed += step
+    def wait_blobs(
+            self,
+            region: Region,
+            color: str
+                   | tuple[int, int, int]
+                   | list[int]
+                   | tuple[str | tuple[int, int, int], ...]
+                   | list[str | tuple[int, int, int]],
+            timeout: int | float = 10,
+            confidence: float = 0.9,
+            check_interval: int | float = 0.1,
+            min_area: int = 1,
+            min_matches: int = 1,
+            error_dialog: bool = False,
+            strategy: PollStrategy | None = None,
+    ) -> list[Blob]:
+        with self.cancellable():
+            found = region.wait_blobs(
+                color=color,
+                confidence=confidence,
+                error_dialog=error_dialog,
+                min_area=min_area,
+                min_matches=min_matches,
+                poller=self.poller(timeout, check_interval, strategy),
+            )
+        return record_wait("wait_blobs", region, found)
 
-        if error_dialog:
-            region.wait_colors(color, timeout=0, confidence=confidence, error_dialog=True)
-        return None
+    def wait_any(
+            self,
+            *conditions: Condition,
+            timeout: int | float = 10,
+            check_interval: int | float = 0.1,
+            strategy: PollStrategy | None = None,
+    ) -> Fired | None:
+        """Waits until one of the conditions holds, checking all of them on one snapshot per poll."""
+        with self.cancellable():
+            found = wait_any(*conditions, poller=self.poller(timeout, check_interval, strategy))
+        return record_wait("wait_any", conditions, found)
+
+    def wait_all(
+            self,
+            *conditions: Condition,
+            timeout: int | float = 10,
+            check_interval: int | float = 0.1,
+            strategy: PollStrategy | None = None,
+    ) -> list | None:
+        """Waits until all conditions hold on the same snapshot and returns their results."""
+        with self.cancellable():
+            found = wait_all(*conditions, poller=self.poller(timeout, check_interval, strategy))
+        return record_wait("wait_all", conditions, found)
+
+    def _sleep_or_stop(self, seconds: float) -> None:
+        if self._stop_event.wait(seconds):
+            raise MacroStopped()
 
     @staticmethod
     def _check_positive_interval(value: int | float, name: str) -> None:
@@ -234,7 +368,12 @@ class AbstractMacro(ABC):
 
 
 class MacroRunner:
-    """Runs an AbstractMacro in a worker thread and controls it with optional hotkeys."""
+    """
+    Runs an AbstractMacro in a worker thread and controls it with optional hotkeys.
+
+    With stats=True or a Metrics, timings of the macro's screen operations are collected; they are off by default.
+    With trace, every run records its frames, input actions and wait results into that directory, see TraceRecorder.
+    """
 
     def __init__(
             self,
@@ -243,12 +382,22 @@ class MacroRunner:
             stop_hotkey: str | None = None,
             toggle_hotkey: str | None = None,
             daemon: bool = True,
+            frame_source: FrameSource | None = None,
+            input_lock: PriorityLock | None = None,
+            priority: int = 0,
+            stats: Metrics | bool | None = None,
+            trace: str | Path | None = None,
     ):
         self.macro = macro
         self.start_hotkey = start_hotkey
         self.stop_hotkey = stop_hotkey
         self.toggle_hotkey = toggle_hotkey
         self.daemon = daemon
+        self.frame_source = frame_source
+        self.input_lock = input_lock
+        self.priority = priority
+        self.stats = Metrics() if stats is True else stats or None
+        self.trace = trace
         self.last_error: Exception | None = None
 
         self._state = MacroState.IDLE
@@ -332,12 +481,13 @@ class MacroRunner:
             self.unbind_hotkeys()
 
     def _run_worker(self) -> None:
-        context = MacroContext(self._stop_event)
+        context = MacroContext(self._stop_event, self.input_lock, self.priority, self.stats)
         macro = self._create_macro()
         try:
-            macro.on_start(context)
-            context.check_stop()
-            macro.run(context)
+            with self._use_frame_source(), use_metrics(self.stats), context.cancellable():
+                macro.on_start(context)
+                context.check_stop()
+                macro.run(context)
         except MacroStopped:
             pass
         except Exception as error:
@@ -350,6 +500,7 @@ class MacroRunner:
             try:
                 macro.on_stop(context)
             finally:
+                self._flush_stats()
                 with self._lock:
                     self._state = MacroState.IDLE
                     self._thread = None
@@ -359,6 +510,23 @@ class MacroRunner:
             return self.macro
         return self.macro()
 
+    def _flush_stats(self) -> None:
+        if self.stats is not None:
+            try:
+                self.stats.flush()
+            except Exception as error:
+                self.last_error = self.last_error or error
+
+    @contextmanager
+    def _use_frame_source(self) -> Iterator[None]:
+        if self.trace is None:
+            with use_frame_source(self.frame_source) if self.frame_source is not None else nullcontext():
+                yield
+            return
+        with TraceRecorder(self.trace, self.frame_source or get_frame_source()) as recorder:
+            with use_frame_source(recorder), use_trace_recorder(recorder):
+                yield
+
     @staticmethod
     def _keyboard():
         import keyboard
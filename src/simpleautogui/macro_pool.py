@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from typing import Callable
+
+from simpleautogui.async_macro import AbstractAsyncMacro, AsyncMacroRunner
+from simpleautogui.macro import AbstractMacro, MacroRunner, MacroState, PriorityLock
+from simpleautogui.screen.frames import FrameSource, SharedFrameSource
+from simpleautogui.screen.metrics import Metrics
+
+
+class MacroPool:
+    """Runs many macros side by side on one shared frame source, with a priority lock for input actions."""
+
+    def __init__(
+            self,
+            source: FrameSource | None = None,
+            max_age: int | float = 0.02,
+            daemon: bool = True,
+    ):
+        self.frame_source = SharedFrameSource(source, max_age=max_age)
+        self.input_lock = PriorityLock()
+        self.daemon = daemon
+        self._runners: dict[str, MacroRunner] = {}
+        self._lock = Lock()
+
+    @property
+    def names(self) -> list[str]:
+        with self._lock:
+            return list(self._runners)
+
+    @property
+    def states(self) -> dict[str, MacroState]:
+        with self._lock:
+            return {name: runner.state for name, runner in self._runners.items()}
+
+    @property
+    def stats(self) -> dict[str, Metrics | None]:
+        with self._lock:
+            return {name: runner.stats for name, runner in self._runners.items()}
+
+    @property
+    def errors(self) -> dict[str, Exception]:
+        """Last errors of macros that failed, by macro name."""
+        with self._lock:
+            return {name: runner.last_error for name, runner in self._runners.items() if runner.last_error}
+
+    def add(
+            self,
+            name: str,
+            macro: AbstractMacro | AbstractAsyncMacro | Callable[[], AbstractMacro | AbstractAsyncMacro],
+            priority: int = 0,
+            start_hotkey: str | None = None,
+            stop_hotkey: str | None = None,
+            toggle_hotkey: str | None = None,
+            stats: Metrics | bool | None = None,
+            trace: str | Path | None = None,
+    ) -> MacroRunner:
+        """Adds a macro; higher priority macros get the input lock first. Async macros run on their own loop."""
+        is_async = isinstance(macro, AbstractAsyncMacro) or (
+                isinstance(macro, type) and issubclass(macro, AbstractAsyncMacro)
+        )
+        runner_class = AsyncMacroRunner if is_async else MacroRunner
+        runner = runner_class(
+            macro, start_hotkey, stop_hotkey, toggle_hotkey, self.daemon,
+            frame_source=self.frame_source, input_lock=self.input_lock, priority=priority, stats=stats, trace=trace,
+        )
+        with self._lock:
+            if name in self._runners:
+                raise ValueError(f"Macro {name!r} is already in the pool.")
+            self._runners[name] = runner
+        return runner
+
+    def remove(self, name: str, timeout: int | float | None = None) -> None:
+        """Stops the macro, waits for it up to timeout seconds and removes it from the pool."""
+        runner = self.runner(name)
+        runner.stop(wait=True, timeout=timeout)
+        runner.unbind_hotkeys()
+        with self._lock:
+            del self._runners[name]
+
+    def runner(self, name: str) -> MacroRunner:
+        with self._lock:
+            try:
+                return self._runners[name]
+            except KeyError:
+                raise KeyError(f"Macro {name!r} is not in the pool.") from None
+
+    def state(self, name: str) -> MacroState:
+        return self.runner(name).state
+
+    def start(self, *names: str) -> list[str]:
+        """Starts the named macros, or all of them, and returns names of macros that were started."""
+        return [name for name, runner in self._select(names) if runner.start()]
+
+    def stop(self, *names: str, wait: bool = False, timeout: int | float | None = None) -> None:
+        """Requests stop of the named macros, or all of them, at once and optionally waits for them."""
+        runners = [runner for _, runner in self._select(names)]
+        for runner in runners:
+            runner.stop()
+        if wait:
+            self._wait(runners, timeout)
+
+    def toggle(self, name: str) -> bool:
+        return self.runner(name).toggle()
+
+    def wait(self, timeout: int | float | None = None) -> None:
+        self._wait([runner for _, runner in self._select(())], timeout)
+
+    def bind_hotkeys(self) -> None:
+        for _, runner in self._select(()):
+            runner.bind_hotkeys()
+
+    def unbind_hotkeys(self) -> None:
+        for _, runner in self._select(()):
+            runner.unbind_hotkeys()
+
+    def listen(self, exit_hotkey: str = "esc") -> None:
+        self.bind_hotkeys()
+        try:
+            MacroRunner._keyboard().wait(exit_hotkey)
+        finally:
+            self.stop(wait=True)
+            self.unbind_hotkeys()
+
+    def _select(self, names: tuple[str, ...]) -> list[tuple[str, MacroRunner]]:
+        if not names:
+            with self._lock:
+                return list(self._runners.items())
+        return [(name, self.runner(name)) for name in names]
+
+    @staticmethod
+    def _wait(runners: list[MacroRunner], timeout: int | float | None) -> None:
+        deadline = None if timeout is None else monotonic() + timeout
+        for runner in runners:
+            runner.wait(None if deadline is None else max(deadline - monotonic(), 0))
@@ -1,4 +1,22 @@
-from simpleautogui.screen.classes.base import Point, Region
+from simpleautogui.screen.cancel import OperationCancelled, cancel_scope
+from simpleautogui.screen.classes.base import Point, PointSet, Region, RegionSet
+from simpleautogui.screen.colors import Blob, ColorQuery
+from simpleautogui.screen.conditions import (
+    ColorCondition, Condition, Fired, ImageCondition, PixelCondition, TextCondition,
+    check_all, check_any, wait_all, wait_any
+)
+from simpleautogui.screen.frames import (
+    FrameSource, ReplayFrameSource, ScreenFrameSource, SharedFrameSource,
+    get_frame_source, set_frame_source, use_frame_source
+)
+from simpleautogui.screen.matching import Match, TemplateMatcher, get_matcher, set_matcher
+from simpleautogui.screen.metrics import (
+    Histogram, JsonlSink, MemorySink, Metrics, MetricsSink, PrometheusSink, get_metrics, set_metrics, use_metrics
+)
+from simpleautogui.screen.polling import ExponentialBackoff, FixedInterval, LearnedInterval, PollStrategy, Poller
+from simpleautogui.screen.snapshot import ScreenSnapshot
+from simpleautogui.screen.templates import Template, TemplateRegistry, get_template_registry
+from simpleautogui.screen.trace import Trace, TraceFrameSource, TraceRecorder, use_trace_recorder
 
 
 def wait_color(color, region: Region | tuple[int, int, int, int] | None = None, **kwargs):
@@ -9,3 +27,8 @@ def wait_color(color, region: Region | tuple[int, int, int, int] | None = None,
 def wait_colors(color, region: Region | tuple[int, int, int, int] | None = None, **kwargs):
     target_region = region if isinstance(region, Region) else Region(*(region or ()))
     return target_region.wait_colors(color, **kwargs)
+
+
+def wait_blobs(color, region: Region | tuple[int, int, int, int] | None = None, **kwargs):
+    target_region = region if isinstance(region, Region) else Region(*(region or ()))
+    return target_region.wait_blobs(color, **kwargs)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Iterator, TypeVar
+
+T = TypeVar('T')
+
+# Seconds between cancel checks while waiting for work running on another thread or process.
+CANCEL_POLL_INTERVAL = 0.01
+
+
+class OperationCancelled(Exception):
+    """
+    Raised by long screen operations when the cancel event of the calling thread is set.
+    """
+
+
+_local = threading.local()
+
+
+def get_cancel_event() -> threading.Event | None:
+    """
+    Returns the cancel event of the current thread, or None outside of cancel_scope.
+    """
+    return getattr(_local, 'event', None)
+
+
+@contextmanager
+def cancel_scope(event: threading.Event) -> Iterator[threading.Event]:
+    """
+    Makes template matching and OCR started by the current thread stop with OperationCancelled once event is set.
+
+    Matching checks the event between bands of the frame, and OCR running in pool threads or
+    worker processes is abandoned: the call returns immediately and the result is dropped when it arrives.
+    """
+    previous = get_cancel_event()
+    _local.event = event
+    try:
+        yield event
+    finally:
+        _local.event = previous
+
+
+def check_cancelled(event: threading.Event | None = None) -> None:
+    """
+    Raises OperationCancelled if event, by default the cancel event of the current thread, is set.
+    """
+    event = event or get_cancel_event()
+    if event is not None and event.is_set():
+        raise OperationCancelled()
+
+
+def wait_future(future: Future[T], event: threading.Event | None = None) -> T:
+    """
+    Returns the result of future, or cancels it and raises OperationCancelled as soon as event is set.
+    """
+    if event is None:
+        return future.result()
+    while True:
+        if event.is_set():
+            future.cancel()
+            raise OperationCancelled()
+        try:
+            return future.result(CANCEL_POLL_INTERVAL)
+        except FutureTimeoutError:
+            pass
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+class TileChangeTracker:
+    """
+    Finds screen tiles that changed since the previous frame.
+
+    The frame is split into tile_size x tile_size tiles and compared with the previous frame
+    of the same wait. Comparing pixels is exact, so even a one pixel change marks its tile dirty.
+    Frames from a FrameSource are never modified, so the previous frame is kept by reference.
+
+    The comparison is written into a buffer reused across frames, whose rows are reduced along memory first;
+    only tile rows with a changed pixel are reduced per tile, so an unchanged frame costs about one pass
+    over its bytes.
+    """
+
+    def __init__(self, tile_size: int = 32):
+        if tile_size <= 0:
+            raise ValueError('tile_size must be greater than 0.')
+        self.tile_size = tile_size
+        self.dirty_tiles: np.ndarray | None = None
+        self._previous: np.ndarray | None = None
+        self._difference: np.ndarray | None = None
+
+    def reset(self) -> None:
+        self.dirty_tiles = None
+        self._previous = None
+        self._difference = None
+
+    def update(self, frame: np.ndarray) -> tuple[int, int, int, int] | None:
+        """
+        Stores the frame and returns the (x, y, w, h) bounding box of changed tiles in frame coordinates.
+
+        Returns the whole frame for the first frame or a frame of another size, and None when nothing changed.
+        """
+        height, width = frame.shape[:2]
+        rows = -(-height // self.tile_size)
+        cols = -(-width // self.tile_size)
+        if self._previous is None or self._previous.shape != frame.shape:
+            self._previous = frame
+            self._difference = np.empty((height, frame.size // max(height, 1)), dtype=bool)
+            self.dirty_tiles = np.ones((rows, cols), dtype=bool)
+            return 0, 0, width, height
+
+        # One row of the buffer holds all channels of a frame row, so tiles span tile_size * channels columns.
+        np.not_equal(frame, self._previous, out=self._difference.reshape(frame.shape))
+        changed_rows = self._difference.any(axis=1)
+        dirty_bands = np.flatnonzero(np.logical_or.reduceat(changed_rows, np.arange(0, height, self.tile_size)))
+        self.dirty_tiles = np.zeros((rows, cols), dtype=bool)
+        if not dirty_bands.size:
+            return None
+
+        tile_columns = np.arange(0, self._difference.shape[1], self._difference.shape[1] // width * self.tile_size)
+        for band in dirty_bands.tolist():
+            changed_columns = self._difference[band * self.tile_size:(band + 1) * self.tile_size].any(axis=0)
+            self.dirty_tiles[band] = np.logical_or.reduceat(changed_columns, tile_columns)
+
+        self._previous = frame
+        dirty_cols = np.flatnonzero(self.dirty_tiles.any(axis=0))
+        left = int(dirty_cols[0]) * self.tile_size
+        top = int(dirty_bands[0]) * self.tile_size
+        right = min((int(dirty_cols[-1]) + 1) * self.tile_size, width)
+        bottom = min((int(dirty_bands[-1]) + 1) * self.tile_size, height)
+        return left, top, right - left, bottom - top
+
+
+def boxes_overlap(boxes: np.ndarray, area: tuple[int, int, int, int]) -> np.ndarray:
+    """
+    Returns a boolean mask of (x, y, w, h) rows that intersect the (x, y, w, h) area.
+    """
+    x, y, w, h = area
+    boxes = np.asarray(boxes).reshape(-1, 4)
+    return (
+            (boxes[:, 0] < x + w) & (boxes[:, 0] + boxes[:, 2] > x)
+            & (boxes[:, 1] < y + h) & (boxes[:, 1] + boxes[:, 3] > y)
+    )
+
+
+def merge_points(previous: np.ndarray, fresh: np.ndarray, area: tuple[int, int, int, int]) -> np.ndarray:
+    """
+    Replaces (x, y) rows of previous that lie in area with fresh ones and keeps row-major order.
+    """
+    x, y, w, h = area
+    inside = (previous[:, 0] >= x) & (previous[:, 0] < x + w) & (previous[:, 1] >= y) & (previous[:, 1] < y + h)
+    merged = np.concatenate((previous[~inside], fresh))
+    return merged[np.lexsort((merged[:, 0], merged[:, 1]))]
@@ -1 +1 @@
-from simpleautogui.screen.classes.base import Point, Region
+from simpleautogui.screen.classes.base import Point, PointSet, Region, RegionSet
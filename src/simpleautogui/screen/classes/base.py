@@ -1,21 +1,37 @@
 from __future__ import annotations
 
 import math
-from time import sleep, time
+from pathlib import Path
+from time import monotonic, sleep, time
 from typing import Iterable
 
 import keyboard
 import mouse
 import numpy as np
 import pyautogui as pg
-import pytesseract
-from PIL import Image, ImageEnhance, ImageFilter, ImageGrab
+from PIL import Image
 
 from simpleautogui.notify import Notify
+from simpleautogui.screen.changes import TileChangeTracker, merge_points
+from simpleautogui.screen.colors import Blob, ColorQuery
+from simpleautogui.screen.frames import get_frame_source
+from simpleautogui.screen.matching import Match, get_matcher
+from simpleautogui.screen.metrics import span
+from simpleautogui.screen.ocr import (
+    IncrementalOcr, OcrWatcher, Pipeline, TextIndex, detect_text_areas, get_ocr_pool, get_tiled_ocr,
+    recognize_areas, recognize_areas_text
+)
+from simpleautogui.screen.ocr.preprocess import get_pipeline, legacy_pipeline
+from simpleautogui.screen.polling import Poller
+from simpleautogui.screen.proximity import proximity_filter
+from simpleautogui.screen.templates import Template, TemplateLike, get_template_registry
+from simpleautogui.screen.trace import record_event
 from simpleautogui.screen.utils import parse_color
 
 
 class Point:
+    __slots__ = ('x', 'y')
+
     def __init__(self, x: int = None, y: int = None):
         if x is None or y is None:
             current_position = pg.position()
@@ -41,6 +57,7 @@ class Point:
         :param o_y: The offset added to the y-coordinate.
         :param click_kwargs: Additional keyword arguments for pyautogui.click().
         """
+        record_event('click', x=self.x + o_x, y=self.y + o_y, **click_kwargs)
         pg.click(self.x + o_x, self.y + o_y, **click_kwargs)
 
     def move_in(self, o_x: int = 0, o_y: int = 0, **move_kwargs) -> None:
@@ -51,6 +68,7 @@ class Point:
         :param o_y: The offset added to the y-coordinate.
         :param move_kwargs: Additional keyword arguments for pyautogui.moveTo().
         """
+        record_event('move', x=self.x + o_x, y=self.y + o_y, **move_kwargs)
         pg.moveTo(self.x + o_x, self.y + o_y, **move_kwargs)
 
     def drag_to(self, to_point: 'Point', **drag_kwargs) -> None:
@@ -58,6 +76,7 @@ class Point:
         Drags from the current point and drops to a target point.
         """
         self.move_in()
+        record_event('drag', x=to_point.x, y=to_point.y, **drag_kwargs)
         pg.dragTo(to_point.x, to_point.y, **drag_kwargs)
 
     def drag_rel(self, rel_x: int, rel_y: int, **drag_kwargs) -> None:
@@ -65,6 +84,7 @@ class Point:
         Drags from the current point with offset to a relative position.
         """
         self.move_in()
+        record_event('drag_rel', dx=rel_x, dy=rel_y, **drag_kwargs)
         pg.dragRel(rel_x, rel_y, **drag_kwargs)
 
     @property
@@ -132,19 +152,20 @@ class Point:
         return abs(deviation_x), abs(deviation_y)
 
     @staticmethod
-    def remove_proximity(points: Iterable['Point'], proximity_threshold_px: int) -> list['Point']:
+    def remove_proximity(
+            points: Iterable['Point'] | np.ndarray,
+            proximity_threshold_px: int
+    ) -> list['Point'] | np.ndarray:
         """
         Filters out points that are within a certain proximity threshold.
+
+        Accepts Point objects or an (n, 2) array of x, y coordinates and returns the same kind.
         """
-        result = []
-        for point in points:
-            if not any(
-                    abs(point.x - saved_point.x) <= proximity_threshold_px
-                    and abs(point.y - saved_point.y) <= proximity_threshold_px
-                    for saved_point in result
-            ):
-                result.append(point)
-        return result
+        if isinstance(points, np.ndarray):
+            return points[proximity_filter(points, proximity_threshold_px)]
+        points = list(points)
+        coordinates = [(point.x, point.y) for point in points]
+        return [points[index] for index in proximity_filter(coordinates, proximity_threshold_px).tolist()]
 
 
 class Region:
@@ -159,11 +180,14 @@ class Region:
             w: int = None,
             h: int = None
     ):
-        screen_size = pg.size()
+        if w is None or h is None:
+            screen_size = pg.size()
+            w = screen_size.width if w is None else w
+            h = screen_size.height if h is None else h
         self.x = x
         self.y = y
-        self.w = screen_size.width if w is None else w
-        self.h = screen_size.height if h is None else h
+        self.w = w
+        self.h = h
         self.cx = self.x + self.w // 2
         self.cy = self.y + self.h // 2
 
@@ -182,8 +206,8 @@ class Region:
     def to_tuple(self) -> tuple[int, int, int, int]:
         return self.x, self.y, self.w, self.h
 
-    def screenshot(self):
-        return pg.screenshot(region=self.to_tuple())
+    def screenshot(self) -> Image.Image:
+        return Image.fromarray(self._screenshot_array())
 
     def find_text(
             self,
@@ -194,54 +218,83 @@ class Region:
             sharpen: bool = True,
             case_sensitive: bool = False,
             min_confidence: int = 80,
+            incremental: IncrementalOcr | None = None,
+            preprocess: str | Pipeline | None = None,
+            max_distance: int = 0,
+            detect_text: bool = False,
+            tiled: bool = False,
             **image_to_data_kwargs
-    ) -> list['Region']:
+    ) -> 'RegionSet':
         """
         Searches text within the region using OCR and returns matching regions.
+
+        :param preprocess: Preprocessing preset name or Pipeline used instead of contrast, resize and sharpen.
+        :param incremental: Text model reused between calls; only changed text lines are recognized again.
+            Its own language and options are used instead of lang and image_to_data_kwargs.
+        :param max_distance: Number of character edits allowed between the text and recognized words.
+        :param detect_text: Locate text areas first and recognize only them, in parallel. Faster on sparse screens.
+        :param tiled: Recognize overlapping horizontal bands in a process pool, see TiledOcr. Faster on large regions.
         """
-        image, scale = self._preprocess_image(
-            self.screenshot(),
+        return self.find_texts(
+            [text],
+            lang=lang,
             contrast=contrast,
             resize=resize,
             sharpen=sharpen,
-        )
-        data = pytesseract.image_to_data(
-            image,
-            lang=lang,
-            output_type=pytesseract.Output.DICT,
+            case_sensitive=case_sensitive,
+            min_confidence=min_confidence,
+            incremental=incremental,
+            preprocess=preprocess,
+            max_distance=max_distance,
+            detect_text=detect_text,
+            tiled=tiled,
             **image_to_data_kwargs,
+        )[text]
+
+    def find_texts(
+            self,
+            texts: Iterable[str],
+            lang: str = 'eng+rus',
+            contrast: int | float = 0,
+            resize: int | float = 0,
+            sharpen: bool = True,
+            case_sensitive: bool = False,
+            min_confidence: int = 80,
+            incremental: IncrementalOcr | None = None,
+            preprocess: str | Pipeline | None = None,
+            max_distance: int = 0,
+            detect_text: bool = False,
+            tiled: bool = False,
+            **image_to_data_kwargs
+    ) -> dict[str, 'RegionSet']:
+        """
+        Searches many texts with one OCR pass and returns matching regions for every text.
+
+        Arguments are the same as in find_text.
+        """
+        frame = self._screenshot_array()
+        image, scale = self._preprocess_image(
+            frame,
+            contrast=contrast,
+            resize=resize,
+            sharpen=sharpen,
+            preprocess=preprocess,
         )
-        search_text = self._normalize_text(text, case_sensitive)
-        if not search_text:
-            return []
-
-        regions = []
-        line_items = {}
-        for index in range(len(data['text'])):
-            detected_text = data['text'][index].strip()
-            if not detected_text or self._read_confidence(data['conf'][index]) < min_confidence:
-                continue
-
-            item = {
-                'text': detected_text,
-                'left': self._data_value(data, 'left', index),
-                'top': self._data_value(data, 'top', index),
-                'width': self._data_value(data, 'width', index),
-                'height': self._data_value(data, 'height', index),
-            }
-
-            if self._normalize_text(detected_text, case_sensitive) == search_text:
-                regions.append(self._bbox_region(self, [item], scale))
-
-            line_items.setdefault(self._line_key(data, index), []).append(item)
-
-        if ' ' in search_text:
-            for items in line_items.values():
-                line_text = self._normalize_text(' '.join(item['text'] for item in items), case_sensitive)
-                if search_text in line_text:
-                    regions.append(self._bbox_region(self, items, scale))
-
-        return self.remove_proximity(regions)
+        with span('ocr'):
+            if incremental is not None:
+                result = incremental.update(image)
+            elif detect_text:
+                result = recognize_areas(image, self._text_areas(frame, scale), lang=lang, **image_to_data_kwargs)
+            elif tiled:
+                result = get_tiled_ocr().result(image, lang=lang, **image_to_data_kwargs)
+            else:
+                result = get_ocr_pool().result(image, lang=lang, **image_to_data_kwargs)
+
+        index = TextIndex(result, min_confidence, case_sensitive)
+        return {
+            text: self._scaled_regions(index.find(text, max_distance), scale).remove_proximity()
+            for text in texts
+        }
 
     def text(
             self,
@@ -249,18 +302,37 @@ class Region:
             contrast: int | float = 0,
             resize: int | float = 0,
             sharpen: bool = True,
+            incremental: IncrementalOcr | None = None,
+            preprocess: str | Pipeline | None = None,
+            detect_text: bool = False,
+            tiled: bool = False,
             **image_to_string_kwargs
     ) -> str:
         """
         Recognizes and returns text in the specified screen region.
+
+        :param preprocess: Preprocessing preset name or Pipeline, see find_text.
+        :param incremental: Text model reused between calls, see find_text. The text is joined from its lines.
+        :param detect_text: Recognize only detected text areas, see find_text. Their texts are joined by lines.
+        :param tiled: Recognize bands in a process pool, see find_text. The text is joined from recognized lines.
         """
-        image, _ = self._preprocess_image(
-            self.screenshot(),
+        frame = self._screenshot_array()
+        image, scale = self._preprocess_image(
+            frame,
             contrast=contrast,
             resize=resize,
             sharpen=sharpen,
+            preprocess=preprocess,
         )
-        return pytesseract.image_to_string(image, lang=lang, **image_to_string_kwargs)
+        with span('ocr'):
+            if incremental is not None:
+                incremental.update(image)
+                return incremental.text
+            if detect_text:
+                return recognize_areas_text(image, self._text_areas(frame, scale), lang=lang, **image_to_string_kwargs)
+            if tiled:
+                return get_tiled_ocr().string(image, lang=lang, **image_to_string_kwargs)
+            return get_ocr_pool().string(image, lang=lang, **image_to_string_kwargs)
 
     def click(self, center: bool = True, o_x: int = 0, o_y: int = 0, **click_kwargs) -> None:
         """
@@ -277,6 +349,7 @@ class Region:
         """
         move_x = self.cx + o_x if center else self.x + o_x
         move_y = self.cy + o_y if center else self.y + o_y
+        record_event('move', x=move_x, y=move_y, **move_kwargs)
         pg.moveTo(move_x, move_y, **move_kwargs)
 
     def drag_to(self, to: Point, center: bool = True, o_x: int = 0, o_y: int = 0, **drag_kwargs) -> None:
@@ -284,6 +357,7 @@ class Region:
         Drags from the current region and drops to a target point.
         """
         (Point(self.cx, self.cy) if center else Point(self.x, self.y)).move_in(o_x, o_y)
+        record_event('drag', x=to.x, y=to.y, **drag_kwargs)
         pg.dragTo(to.x, to.y, **drag_kwargs)
 
     def drag_rel(
@@ -299,97 +373,167 @@ class Region:
         Drags from the current region to a relative position.
         """
         (Point(self.cx, self.cy) if center else Point(self.x, self.y)).move_in(o_x, o_y)
+        record_event('drag_rel', dx=rel_x, dy=rel_y, **drag_kwargs)
         pg.dragRel(rel_x, rel_y, **drag_kwargs)
 
     @staticmethod
-    def remove_proximity(regions: Iterable['Region'], proximity_threshold_px: int = 10) -> list['Region']:
+    def remove_proximity(
+            regions: Iterable['Region'] | np.ndarray,
+            proximity_threshold_px: int = 10
+    ) -> list['Region'] | np.ndarray:
         """
         Filters out regions that are within a certain proximity threshold.
+
+        Accepts Region objects or an (n, 4) array of x, y, w, h rows and returns the same kind.
         """
-        result = []
-        for region in regions:
-            if not any(
-                    abs(region.x - saved_region.x) <= proximity_threshold_px
-                    and abs(region.y - saved_region.y) <= proximity_threshold_px
-                    for saved_region in result
-            ):
-                result.append(region)
-        return result
+        if isinstance(regions, np.ndarray):
+            return regions[proximity_filter(regions[:, :2], proximity_threshold_px)]
+        regions = list(regions)
+        coordinates = [(region.x, region.y) for region in regions]
+        return [regions[index] for index in proximity_filter(coordinates, proximity_threshold_px).tolist()]
 
     def wait_image(
             self,
-            paths: str | tuple[str, ...] | list[str],
+            paths: TemplateLike | tuple[TemplateLike, ...] | list[TemplateLike],
             timeout: int | float = 10,
             confidence: float = 0.9,
             error_dialog: bool = False,
-            check_interval: int | float = 0.1
+            check_interval: int | float = 0.1,
+            pyramid: bool | int = False,
+            poller: Poller | None = None
     ) -> 'Region' | None:
         """
         Waits for a specified image or images to appear in the region.
+
+        :param pyramid: Search downscaled first and verify candidates at full resolution.
+            True picks the level from the region width, an int sets the number of halvings.
+        :param poller: Custom polling schedule. When given, timeout and check_interval are taken from it.
         """
         image_paths = self._normalize_paths(paths)
-        end_time = time() + timeout
-        first_check = True
-        while first_check or time() < end_time:
-            first_check = False
-            for path in image_paths:
-                try:
-                    box = pg.locateOnScreen(path, confidence=confidence, region=self.to_tuple())
-                    if box is not None:
-                        return self._box_to_region(box)
-                except pg.ImageNotFoundException:
-                    pass
-
-            if timeout == 0:
-                return None
-            sleep(check_interval)
-
-        if error_dialog and not Notify.continue_or_stop(f'Images not found: {", ".join(image_paths)}'):
+        templates = get_template_registry().load(image_paths)
+        changes = TileChangeTracker()
+        poller = poller or Poller(timeout, check_interval)
+        for _ in poller:
+            frame = self._screenshot_array()
+            area = changes.update(frame)
+            if area is not None:
+                match = get_matcher().match_first(frame, templates, confidence, pyramid=pyramid, area=area)
+                if match is not None:
+                    poller.found()
+                    return self._match_to_region(match)
+
+        if error_dialog and not Notify.continue_or_stop(f'Images not found: {", ".join(map(str, image_paths))}'):
             raise pg.ImageNotFoundException
         return None
 
     def wait_images(
             self,
-            paths: str | tuple[str, ...] | list[str],
+            paths: TemplateLike | tuple[TemplateLike, ...] | list[TemplateLike],
             timeout: int | float = 10,
             confidence: float = 0.9,
             error_dialog: bool = False,
             check_interval: int | float = 0.1,
             proximity_threshold_px: int = 2,
-            min_matches: int = 1
-    ) -> list['Region']:
+            min_matches: int = 1,
+            pyramid: bool | int = False,
+            poller: Poller | None = None
+    ) -> 'RegionSet':
         """
         Waits for multiple images to appear in the region.
+
+        :param pyramid: Coarse-to-fine search, see wait_image.
+        :param poller: Custom polling schedule, see wait_image.
         """
         image_paths = self._normalize_paths(paths)
-        end_time = time() + timeout
-        boxes = []
-        first_check = True
-        while first_check or time() < end_time:
-            first_check = False
-            for path in image_paths:
-                try:
-                    boxes = [
-                        self._box_to_region(box)
-                        for box in pg.locateAllOnScreen(path, confidence=confidence, region=self.to_tuple())
-                    ]
-                    boxes = self.remove_proximity(boxes, proximity_threshold_px)
-                    if min_matches and len(boxes) >= min_matches:
-                        return boxes
-                    if boxes:
-                        continue
-                except pg.ImageNotFoundException:
-                    pass
-
-            if timeout == 0:
-                break
-            sleep(check_interval)
+        templates = get_template_registry().load(image_paths)
+        changes = TileChangeTracker()
+        found = [[] for _ in templates]
+        poller = poller or Poller(timeout, check_interval)
+        boxes = RegionSet()
+        for _ in poller:
+            frame = self._screenshot_array()
+            area = changes.update(frame)
+            if area is not None:
+                matcher = get_matcher()
+                fresh = matcher.match(frame, templates, confidence, pyramid=pyramid, area=area)
+                found = [matcher.merge(previous, matches, area) for previous, matches in zip(found, fresh)]
+            for matches in found:
+                boxes = RegionSet(
+                    [(self.x + match.left, self.y + match.top, match.width, match.height) for match in matches]
+                ).remove_proximity(proximity_threshold_px)
+                if min_matches and len(boxes) >= min_matches:
+                    poller.found()
+                    return boxes
 
         if boxes and min_matches == 0:
             return boxes
-        if error_dialog and not Notify.continue_or_stop(f'Images not found: {", ".join(image_paths)}'):
+        if error_dialog and not Notify.continue_or_stop(f'Images not found: {", ".join(map(str, image_paths))}'):
             raise pg.ImageNotFoundException
-        return []
+        return RegionSet()
+
+    def watch_text(self, **watch_kwargs) -> OcrWatcher:
+        """
+        Starts recognizing the region text on a background thread, see OcrWatcher for arguments.
+        """
+        return OcrWatcher(self, **watch_kwargs).start()
+
+    def wait_text(
+            self,
+            text: str,
+            timeout: int | float = 10,
+            lang: str = 'eng+rus',
+            contrast: int | float = 0,
+            resize: int | float = 0,
+            sharpen: bool = True,
+            preprocess: str | Pipeline | None = None,
+            case_sensitive: bool = False,
+            min_confidence: int = 80,
+            max_distance: int = 0,
+            error_dialog: bool = False,
+            check_interval: int | float = 0.1,
+            watcher: OcrWatcher | None = None,
+            poller: Poller | None = None
+    ) -> 'Region | None':
+        """
+        Waits for text to appear in the region and returns the first matching region.
+
+        Text is recognized by an OcrWatcher on a background thread and every poll only searches its latest
+        result, so OCR time does not delay polling or stopping. Without watcher a temporary one is started
+        for this wait with lang and the preprocessing arguments. The last poll waits for a result captured
+        after the wait started, so timeout=0 checks the region once.
+
+        :param watcher: Running watcher to read results from; its own language and preprocessing are used.
+        :param poller: Custom polling schedule, see wait_color.
+        """
+        started = monotonic()
+        own_watcher = watcher is None
+        if own_watcher:
+            watcher = self.watch_text(
+                lang=lang, interval=check_interval, contrast=contrast, resize=resize, sharpen=sharpen,
+                preprocess=preprocess,
+            )
+        poller = poller or Poller(timeout, check_interval)
+        try:
+            checked = None
+            for _ in poller:
+                latest = watcher.latest
+                if (latest is None or latest.timestamp < started) and poller.expired:
+                    latest = watcher.wait_update(after=started)
+                if latest is None or latest is checked:
+                    continue
+                checked = latest
+                boxes = TextIndex(latest.result, min_confidence, case_sensitive).find(text, max_distance)
+                regions = watcher.region._scaled_regions(boxes, latest.scale).remove_proximity()
+                if regions:
+                    poller.found()
+                    return regions[0]
+        finally:
+            if own_watcher:
+                watcher.stop()
+
+        if error_dialog and not Notify.continue_or_stop(f'Text not found: {text}'):
+            raise TimeoutError(f'Text not found: {text}')
+        return None
 
     def wait_color(
             self,
@@ -397,23 +541,28 @@ class Region:
             timeout: int | float = 10,
             confidence: float = 0.9,
             error_dialog: bool = False,
-            check_interval: int | float = 0.1
+            check_interval: int | float = 0.1,
+            poller: Poller | None = None
     ) -> Point | None:
         """
         Waits for a specified color to appear in the region.
+
+        :param poller: Custom polling schedule. When given, timeout and check_interval are taken from it.
         """
         rgb_color = parse_color(color)
-        end_time = time() + timeout
-        first_check = True
-        while first_check or time() < end_time:
-            first_check = False
-            found, point = self.check_color(self._screenshot_array(), rgb_color, confidence)
-            if found:
-                return Point(point.x + self.x, point.y + self.y)
-
-            if timeout == 0:
-                break
-            sleep(check_interval)
+        query = ColorQuery([rgb_color], confidence)
+        changes = TileChangeTracker()
+        poller = poller or Poller(timeout, check_interval)
+        for _ in poller:
+            frame = self._screenshot_array()
+            area = changes.update(frame)
+            if area is not None:
+                x, y, w, h = area
+                with span('color'):
+                    position = query.first(frame[y:y + h, x:x + w])
+                if position is not None:
+                    poller.found()
+                    return Point(position[0] + x + self.x, position[1] + y + self.y)
 
         if error_dialog and not Notify.continue_or_stop(f'Color not found: {rgb_color}'):
             raise TimeoutError(f'Color not found: {rgb_color}')
@@ -431,130 +580,136 @@ class Region:
             error_dialog: bool = False,
             check_interval: int | float = 0.1,
             proximity_threshold_px: int = 2,
-            min_matches: int = 0
-    ) -> list[Point] | None:
+            min_matches: int = 0,
+            poller: Poller | None = None
+    ) -> 'PointSet' | None:
         """
         Waits for colors to appear in the region.
 
         If min_matches is 0, returns all matches from the first screenshot with matches.
+
+        :param poller: Custom polling schedule, see wait_color.
         """
         colors = self._normalize_colors(color)
-        end_time = time() + timeout
-        first_check = True
-        while first_check or time() < end_time:
-            first_check = False
-            matches = self._find_colors(self._screenshot_array(), colors, confidence)
-            matches = [Point(point.x + self.x, point.y + self.y) for point in matches]
-            matches = Point.remove_proximity(matches, proximity_threshold_px)
-            if min_matches and len(matches) >= min_matches:
+        query = ColorQuery(colors, confidence)
+        changes = TileChangeTracker()
+        found = np.empty((0, 2), dtype=np.int64)
+        poller = poller or Poller(timeout, check_interval)
+        for _ in poller:
+            frame = self._screenshot_array()
+            area = changes.update(frame)
+            if area is not None:
+                x, y, w, h = area
+                with span('color'):
+                    points = query.points(frame[y:y + h, x:x + w])
+                found = merge_points(found, points + (x, y), area)
+            matches = PointSet(found + (self.x, self.y)).remove_proximity(proximity_threshold_px)
+            if matches and len(matches) >= min_matches:
+                poller.found()
                 return matches
-            if matches and min_matches == 0:
-                return matches
-
-            if timeout == 0:
-                break
-            sleep(check_interval)
 
         if error_dialog:
             Notify.continue_or_stop(f'Colors not found: {colors}')
         return None
 
-    @staticmethod
-    def _preprocess_image(image, contrast: int | float = 0, resize: int | float = 0, sharpen: bool = True):
-        scale = float(resize) if resize else 1.0
-        if scale <= 0:
-            raise ValueError('resize must be greater than 0')
-        if resize:
-            image = image.resize([int(scale * size) for size in image.size], Image.LANCZOS)
-        if contrast:
-            image = ImageEnhance.Contrast(image).enhance(contrast)
-        if sharpen:
-            image = image.filter(ImageFilter.SHARPEN)
-        return image, scale
-
-    @staticmethod
-    def _read_confidence(value) -> float:
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return -1
+    def wait_blobs(
+            self,
+            color: str
+                   | tuple[int, int, int]
+                   | list[int]
+                   | tuple[str | tuple[int, int, int], ...]
+                   | list[str | tuple[int, int, int]],
+            timeout: int | float = 10,
+            confidence: float = 0.9,
+            error_dialog: bool = False,
+            check_interval: int | float = 0.1,
+            min_area: int = 1,
+            min_matches: int = 1,
+            poller: Poller | None = None
+    ) -> list[Blob]:
+        """
+        Waits for connected areas of the given colors to appear in the region.
 
-    @staticmethod
-    def _normalize_text(value: str, case_sensitive: bool) -> str:
-        value = value.strip()
-        return value if case_sensitive else value.lower()
+        Returns blobs with screen coordinates, bounding box, centroid and pixel area
+        instead of one Point per matching pixel.
 
-    @staticmethod
-    def _data_value(data, name: str, index: int):
-        if name in data:
-            return data[name][index]
-        legacy_name = {'width': 'w', 'height': 'h'}.get(name)
-        if legacy_name in data:
-            return data[legacy_name][index]
-        raise KeyError(name)
+        :param min_area: Blobs with fewer pixels are ignored.
+        :param min_matches: Minimal number of blobs to wait for.
+        :param poller: Custom polling schedule, see wait_color.
+        """
+        colors = self._normalize_colors(color)
+        query = ColorQuery(colors, confidence)
+        changes = TileChangeTracker()
+        poller = poller or Poller(timeout, check_interval)
+        for _ in poller:
+            frame = self._screenshot_array()
+            if changes.update(frame) is not None:
+                with span('color'):
+                    blobs = [blob.offset(self.x, self.y) for blob in query.blobs(frame, min_area)]
+                if blobs and len(blobs) >= min_matches:
+                    poller.found()
+                    return blobs
 
-    @staticmethod
-    def _line_key(data, index: int) -> tuple:
-        def value(name, fallback):
-            values = data.get(name)
-            if values is None:
-                return fallback
-            return values[index]
-
-        return (
-            value('block_num', 0),
-            value('par_num', 0),
-            value('line_num', index),
-        )
+        if error_dialog:
+            Notify.continue_or_stop(f'Colors not found: {colors}')
+        return []
 
     @staticmethod
-    def _bbox_region(region: 'Region', items: list[dict], scale: float) -> 'Region':
-        left = min(item['left'] for item in items) / scale
-        top = min(item['top'] for item in items) / scale
-        right = max(item['left'] + item['width'] for item in items) / scale
-        bottom = max(item['top'] + item['height'] for item in items) / scale
-        return Region(
-            int(round(region.x + left)),
-            int(round(region.y + top)),
-            int(round(right - left)),
-            int(round(bottom - top)),
-        )
+    def _preprocess_image(
+            image: np.ndarray | Image.Image,
+            contrast: int | float = 0,
+            resize: int | float = 0,
+            sharpen: bool = True,
+            preprocess: str | Pipeline | None = None
+    ) -> tuple[Image.Image, float]:
+        if preprocess is not None:
+            pipeline = get_pipeline(preprocess)
+        else:
+            if resize and resize <= 0:
+                raise ValueError('resize must be greater than 0')
+            pipeline = legacy_pipeline(contrast, resize, bool(sharpen))
+        return pipeline(image), pipeline.scale
 
     @staticmethod
-    def _box_to_region(box) -> 'Region':
-        width = getattr(box, 'width', getattr(box, 'w', None))
-        height = getattr(box, 'height', getattr(box, 'h', None))
-        return Region(box.left, box.top, width, height)
+    def _text_areas(frame: np.ndarray, scale: float) -> list[tuple[int, int, int, int]]:
+        return [
+            (int(x * scale), int(y * scale), int(math.ceil(w * scale)), int(math.ceil(h * scale)))
+            for x, y, w, h in detect_text_areas(frame)
+        ]
+
+    def _scaled_regions(self, boxes: np.ndarray, scale: float) -> 'RegionSet':
+        left = boxes[:, 0] / scale
+        top = boxes[:, 1] / scale
+        right = (boxes[:, 0] + boxes[:, 2]) / scale
+        bottom = (boxes[:, 1] + boxes[:, 3]) / scale
+        return RegionSet(np.column_stack((
+            np.round(self.x + left),
+            np.round(self.y + top),
+            np.round(right - left),
+            np.round(bottom - top),
+        )))
 
     @staticmethod
-    def _normalize_paths(paths: str | tuple[str, ...] | list[str]) -> list[str]:
-        image_paths = [paths] if isinstance(paths, str) else list(paths)
+    def _normalize_paths(
+            paths: TemplateLike | tuple[TemplateLike, ...] | list[TemplateLike]
+    ) -> list[TemplateLike]:
+        image_paths = [paths] if isinstance(paths, (str, Path, Template)) else list(paths)
         if not image_paths:
             raise ValueError('At least one image path must be provided.')
         return image_paths
 
-    @staticmethod
-    def _color_bounds(color: tuple[int, int, int], confidence: float) -> tuple[np.ndarray, np.ndarray]:
-        if confidence < 0 or confidence > 1:
-            raise ValueError('confidence must be between 0 and 1')
-        tolerance = int(round(255 * (1 - confidence)))
-        color_array = np.array(color, dtype=np.int16)
-        lower_bound = np.clip(color_array - tolerance, 0, 255).astype(np.uint8)
-        upper_bound = np.clip(color_array + tolerance, 0, 255).astype(np.uint8)
-        return lower_bound, upper_bound
-
     def _screenshot_array(self) -> np.ndarray:
-        screenshot = ImageGrab.grab(bbox=(self.x, self.y, self.x + self.w, self.y + self.h))
-        return np.array(screenshot.convert('RGB'))
+        with span('capture'):
+            return get_frame_source().grab(self.to_tuple())
 
-    @classmethod
-    def check_color(cls, image: np.ndarray, color: tuple[int, int, int], confidence: float):
-        lower_bound, upper_bound = cls._color_bounds(color, confidence)
-        mask = np.all((image >= lower_bound) & (image <= upper_bound), axis=2)
-        points = np.argwhere(mask)
-        if len(points) > 0:
-            y, x = points[0]
-            return True, Point(int(x), int(y))
+    def _match_to_region(self, match: Match) -> 'Region':
+        return Region(self.x + match.left, self.y + match.top, match.width, match.height)
+
+    @staticmethod
+    def check_color(image: np.ndarray, color: tuple[int, int, int], confidence: float):
+        position = ColorQuery([color], confidence).first(image)
+        if position is not None:
+            return True, Point(*position)
         return False, None
 
     @staticmethod
@@ -575,17 +730,181 @@ class Region:
             return [parse_color(color)]
         return [parse_color(item) for item in color]
 
-    @classmethod
+    @staticmethod
     def _find_colors(
-            cls,
             image: np.ndarray,
             colors: list[tuple[int, int, int]],
             confidence: float
     ) -> list[Point]:
-        result = []
-        for color in colors:
-            lower_bound, upper_bound = cls._color_bounds(color, confidence)
-            mask = np.all((image >= lower_bound) & (image <= upper_bound), axis=2)
-            for y, x in np.argwhere(mask):
-                result.append(Point(int(x), int(y)))
-        return result
+        return [Point(x, y) for x, y in ColorQuery(colors, confidence).points(image).tolist()]
+
+
+class PointSet:
+    """
+    Columnar collection of points backed by an (n, 2) array of x, y coordinates.
+
+    Point objects are created only when items are accessed, so large match sets
+    cost one array instead of one Python object per point.
+    """
+
+    __slots__ = ('_xy',)
+
+    def __init__(self, xy: np.ndarray | Iterable[tuple[int, int]] = ()):
+        self._xy = np.asarray(xy, dtype=np.int64).reshape(-1, 2)
+
+    @classmethod
+    def from_points(cls, points: Iterable[Point]) -> 'PointSet':
+        return cls([point.to_tuple() for point in points])
+
+    def __str__(self):
+        return f'PointSet(n={len(self)})'
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __len__(self):
+        return len(self._xy)
+
+    def __bool__(self):
+        return len(self._xy) > 0
+
+    def __iter__(self):
+        for x, y in self._xy.tolist():
+            yield Point(x, y)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            x, y = self._xy[index].tolist()
+            return Point(x, y)
+        return PointSet(self._xy[index])
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._xy[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._xy[:, 1]
+
+    def to_array(self) -> np.ndarray:
+        return self._xy
+
+    def to_list(self) -> list[Point]:
+        return list(self)
+
+    def filter(self, mask: np.ndarray) -> 'PointSet':
+        """
+        Returns points selected by a boolean mask or an index array.
+        """
+        return PointSet(self._xy[mask])
+
+    def offset(self, o_x: int = 0, o_y: int = 0) -> 'PointSet':
+        return PointSet(self._xy + (o_x, o_y))
+
+    def within(self, region: 'Region') -> 'PointSet':
+        x, y = self.x, self.y
+        return self.filter(
+            (x >= region.x) & (x < region.x + region.w) & (y >= region.y) & (y < region.y + region.h)
+        )
+
+    def distances(self, point: Point) -> np.ndarray:
+        return np.hypot(self.x - point.x, self.y - point.y)
+
+    def sort_by_distance(self, point: Point) -> 'PointSet':
+        return PointSet(self._xy[np.argsort(self.distances(point), kind='stable')])
+
+    def nearest(self, point: Point) -> Point | None:
+        if not self:
+            return None
+        return self[int(np.argmin(self.distances(point)))]
+
+    def remove_proximity(self, proximity_threshold_px: int) -> 'PointSet':
+        return PointSet(Point.remove_proximity(self._xy, proximity_threshold_px))
+
+
+class RegionSet:
+    """
+    Columnar collection of regions backed by an (n, 4) array of x, y, w, h rows.
+
+    Region objects are created only when items are accessed.
+    """
+
+    __slots__ = ('_boxes',)
+
+    def __init__(self, boxes: np.ndarray | Iterable[tuple[int, int, int, int]] = ()):
+        self._boxes = np.asarray(boxes, dtype=np.int64).reshape(-1, 4)
+
+    @classmethod
+    def from_regions(cls, regions: Iterable[Region]) -> 'RegionSet':
+        return cls([region.to_tuple() for region in regions])
+
+    def __str__(self):
+        return f'RegionSet(n={len(self)})'
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __bool__(self):
+        return len(self._boxes) > 0
+
+    def __iter__(self):
+        for x, y, w, h in self._boxes.tolist():
+            yield Region(x, y, w, h)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            x, y, w, h = self._boxes[index].tolist()
+            return Region(x, y, w, h)
+        return RegionSet(self._boxes[index])
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._boxes[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._boxes[:, 1]
+
+    @property
+    def w(self) -> np.ndarray:
+        return self._boxes[:, 2]
+
+    @property
+    def h(self) -> np.ndarray:
+        return self._boxes[:, 3]
+
+    @property
+    def centers(self) -> PointSet:
+        return PointSet(np.column_stack((self.x + self.w // 2, self.y + self.h // 2)))
+
+    def to_array(self) -> np.ndarray:
+        return self._boxes
+
+    def to_list(self) -> list[Region]:
+        return list(self)
+
+    def filter(self, mask: np.ndarray) -> 'RegionSet':
+        """
+        Returns regions selected by a boolean mask or an index array.
+        """
+        return RegionSet(self._boxes[mask])
+
+    def offset(self, o_x: int = 0, o_y: int = 0) -> 'RegionSet':
+        return RegionSet(self._boxes + (o_x, o_y, 0, 0))
+
+    def distances(self, point: Point) -> np.ndarray:
+        return self.centers.distances(point)
+
+    def sort_by_distance(self, point: Point) -> 'RegionSet':
+        return RegionSet(self._boxes[np.argsort(self.distances(point), kind='stable')])
+
+    def nearest(self, point: Point) -> Region | None:
+        if not self:
+            return None
+        return self[int(np.argmin(self.distances(point)))]
+
+    def remove_proximity(self, proximity_threshold_px: int = 10) -> 'RegionSet':
+        return RegionSet(Region.remove_proximity(self._boxes, proximity_threshold_px))
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from typing import Iterable, NamedTuple
+
+import cv2
+import numpy as np
+
+
+class Blob(NamedTuple):
+    """
+    Connected group of pixels that match one target color.
+    """
+    x: int
+    y: int
+    w: int
+    h: int
+    cx: float
+    cy: float
+    area: int
+    color: tuple[int, int, int]
+
+    def to_tuple(self) -> tuple[int, int, int, int]:
+        return self.x, self.y, self.w, self.h
+
+    def offset(self, o_x: int, o_y: int) -> 'Blob':
+        return self._replace(x=self.x + o_x, y=self.y + o_y, cx=self.cx + o_x, cy=self.cy + o_y)
+
+
+class ColorQuery:
+    """
+    Compiled classifier that checks every pixel against all target colors in one vectorized pass.
+
+    Tolerance is a per-channel range, so the query is separable: each channel gets a 256-entry
+    lookup table whose bit i is set when the channel value fits color i. A pixel matches color i
+    when bit i survives AND-ing the three table lookups. More than MAX_COLORS colors are split into
+    several queries of at most MAX_COLORS colors whose masks are OR-ed.
+    """
+
+    MAX_COLORS = 64
+
+    def __init__(self, colors: Iterable[tuple[int, int, int]], confidence: float):
+        if confidence < 0 or confidence > 1:
+            raise ValueError('confidence must be between 0 and 1')
+        self.colors = [tuple(int(channel) for channel in color) for color in colors]
+        if not self.colors:
+            raise ValueError('At least one color must be provided.')
+        self.confidence = confidence
+        self._parts: list[ColorQuery] = []
+        if len(self.colors) > self.MAX_COLORS:
+            self._parts = [
+                ColorQuery(self.colors[start:start + self.MAX_COLORS], confidence)
+                for start in range(0, len(self.colors), self.MAX_COLORS)
+            ]
+            return
+
+        dtype = next(dtype for dtype in (np.uint8, np.uint16, np.uint32, np.uint64)
+                     if np.iinfo(dtype).bits >= len(self.colors))
+        tolerance = int(round(255 * (1 - confidence)))
+        self._luts = np.zeros((3, 256), dtype=dtype)
+        for index, color in enumerate(self.colors):
+            bit = dtype(1) << dtype(index)
+            for channel, value in enumerate(color):
+                self._luts[channel, max(value - tolerance, 0):min(value + tolerance, 255) + 1] |= bit
+
+    def classify(self, image: np.ndarray) -> np.ndarray:
+        """
+        Returns per-pixel bit masks of matching colors, bit i standing for colors[i].
+
+        Only queries of at most MAX_COLORS colors fit one mask; use mask, points or blobs for larger ones.
+        """
+        if self._parts:
+            raise ValueError(f'At most {self.MAX_COLORS} colors can be classified at once.')
+        bits = self._luts[0][image[..., 0]]
+        bits &= self._luts[1][image[..., 1]]
+        bits &= self._luts[2][image[..., 2]]
+        return bits
+
+    def mask(self, image: np.ndarray) -> np.ndarray:
+        if not self._parts:
+            return self.classify(image) != 0
+        mask = self._parts[0].mask(image)
+        for part in self._parts[1:]:
+            mask |= part.mask(image)
+        return mask
+
+    def first(self, image: np.ndarray) -> tuple[int, int] | None:
+        """
+        Returns (x, y) of the first matching pixel in row-major order.
+        """
+        mask = self.mask(image).ravel()
+        index = int(np.argmax(mask))
+        if not mask[index]:
+            return None
+        y, x = divmod(index, image.shape[1])
+        return x, y
+
+    def points(self, image: np.ndarray) -> np.ndarray:
+        """
+        Returns (x, y) coordinates of all matching pixels as an (n, 2) array in row-major order.
+        """
+        return np.argwhere(self.mask(image))[:, ::-1]
+
+    def blobs(self, image: np.ndarray, min_area: int = 1) -> list[Blob]:
+        """
+        Groups matching pixels of each color into 8-connected blobs.
+        """
+        if self._parts:
+            result = [blob for part in self._parts for blob in part.blobs(image, min_area)]
+            result.sort(key=lambda blob: (blob.y, blob.x))
+            return result
+
+        bits = self.classify(image)
+        present = int(np.bitwise_or.reduce(bits, axis=None))
+        result = []
+        for index, color in enumerate(self.colors):
+            if not present >> index & 1:
+                continue
+            mask = ((bits >> bits.dtype.type(index)) & 1).astype(np.uint8)
+            count, _, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
+            for label in range(1, count):
+                x, y, w, h, area = (int(value) for value in stats[label])
+                if area >= min_area:
+                    cx, cy = centroids[label]
+                    result.append(Blob(x, y, w, h, float(cx), float(cy), area, color))
+        result.sort(key=lambda blob: (blob.y, blob.x))
+        return result
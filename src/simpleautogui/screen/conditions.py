@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, NamedTuple, Sequence
+
+import numpy as np
+
+from simpleautogui.screen.changes import TileChangeTracker
+from simpleautogui.screen.classes.base import Point, Region
+from simpleautogui.screen.ocr.preprocess import Pipeline
+from simpleautogui.screen.polling import Poller
+from simpleautogui.screen.snapshot import ScreenSnapshot
+from simpleautogui.screen.templates import TemplateLike
+from simpleautogui.screen.utils import parse_color
+
+
+class Condition(ABC):
+    """
+    Something to look for in a region of a ScreenSnapshot.
+
+    A condition remembers its last result and checks again only when pixels of its region changed,
+    so waiting on an unchanged screen costs one comparison per condition.
+    """
+
+    track_changes = True
+
+    def __init__(self, region: Region):
+        self.region = region
+        self._changes = TileChangeTracker()
+        self._result = None
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.region})'
+
+    @abstractmethod
+    def check(self, snapshot: ScreenSnapshot) -> Any:
+        """
+        Returns a truthy result when the condition holds on the snapshot, otherwise a falsy one.
+        """
+
+    def evaluate(self, snapshot: ScreenSnapshot) -> Any:
+        """
+        Returns the result of check, reusing the previous one while the region is unchanged.
+        """
+        if not self.track_changes or self._changes.update(snapshot.view(self.region)) is not None:
+            try:
+                self._result = self.check(snapshot)
+            except Exception:
+                # Forget the baseline the failed check was taken against, so the next call checks again.
+                self._changes.reset()
+                raise
+        return self._result
+
+    def reset(self) -> None:
+        self._changes.reset()
+        self._result = None
+
+
+class ImageCondition(Condition):
+    """
+    Holds when one of the images is found in the region; the result is the found Region.
+    """
+
+    def __init__(
+            self,
+            region: Region,
+            paths: TemplateLike | tuple[TemplateLike, ...] | list[TemplateLike],
+            confidence: float = 0.9,
+            pyramid: bool | int = False
+    ):
+        super().__init__(region)
+        self.paths = paths
+        self.confidence = confidence
+        self.pyramid = pyramid
+
+    def check(self, snapshot: ScreenSnapshot) -> Region | None:
+        return snapshot.find_image(self.region, self.paths, confidence=self.confidence, pyramid=self.pyramid)
+
+
+class ColorCondition(Condition):
+    """
+    Holds when the color is present in the region; the result is the first matching Point.
+    """
+
+    def __init__(self, region: Region, color: str | tuple[int, int, int] | list[int], confidence: float = 0.9):
+        super().__init__(region)
+        self.color = parse_color(color)
+        self.confidence = confidence
+
+    def check(self, snapshot: ScreenSnapshot) -> Point | None:
+        return snapshot.find_color(self.region, self.color, confidence=self.confidence)
+
+
+class TextCondition(Condition):
+    """
+    Holds when the text is recognized in the region; the result is the Region of the first occurrence.
+    """
+
+    def __init__(
+            self,
+            region: Region,
+            text: str,
+            lang: str = 'eng+rus',
+            case_sensitive: bool = False,
+            min_confidence: int = 80,
+            max_distance: int = 0,
+            preprocess: str | Pipeline | None = None,
+            **options
+    ):
+        super().__init__(region)
+        self.text = text
+        self.options = dict(
+            lang=lang, case_sensitive=case_sensitive, min_confidence=min_confidence,
+            max_distance=max_distance, preprocess=preprocess, **options
+        )
+
+    def check(self, snapshot: ScreenSnapshot) -> Region | None:
+        found = snapshot.find_text(self.region, self.text, **self.options)
+        return found[0] if found else None
+
+
+class PixelCondition(Condition):
+    """
+    Holds when every (x, y) screen pixel has its expected color, each channel within tolerance.
+
+    A handful of pixels identifies a known screen state cheaply. The result is the bounding Region of the pixels.
+    """
+
+    track_changes = False
+
+    def __init__(
+            self,
+            pixels: Iterable[tuple[int, int, str | tuple[int, int, int] | list[int]]],
+            tolerance: int = 0
+    ):
+        pixels = list(pixels)
+        if not pixels:
+            raise ValueError('At least one pixel must be provided.')
+        xs = np.array([x for x, _, _ in pixels], dtype=np.int64)
+        ys = np.array([y for _, y, _ in pixels], dtype=np.int64)
+        left, top = int(xs.min()), int(ys.min())
+        super().__init__(Region(left, top, int(xs.max()) - left + 1, int(ys.max()) - top + 1))
+        self.colors = np.array([parse_color(color) for _, _, color in pixels], dtype=np.int16)
+        self.tolerance = tolerance
+        self._rows = ys - top
+        self._cols = xs - left
+
+    def check(self, snapshot: ScreenSnapshot) -> Region | None:
+        actual = snapshot.view(self.region)[self._rows, self._cols].astype(np.int16)
+        if np.all(np.abs(actual - self.colors) <= self.tolerance):
+            return self.region
+        return None
+
+
+class Fired(NamedTuple):
+    """
+    Condition that held in wait_any, its position among the given conditions and its result.
+    """
+    index: int
+    condition: Condition
+    result: Any
+
+
+def check_any(conditions: Sequence[Condition], snapshot: ScreenSnapshot) -> Fired | None:
+    """
+    Returns the first condition, in the given order, that holds on the snapshot.
+    """
+    for index, condition in enumerate(conditions):
+        result = condition.evaluate(snapshot)
+        if result:
+            return Fired(index, condition, result)
+    return None
+
+
+def check_all(conditions: Sequence[Condition], snapshot: ScreenSnapshot) -> list | None:
+    """
+    Returns results of all conditions if every one holds on the snapshot, otherwise None.
+
+    Evaluation stops at the first condition that does not hold, so put cheap conditions first.
+    """
+    results = []
+    for condition in conditions:
+        result = condition.evaluate(snapshot)
+        if not result:
+            return None
+        results.append(result)
+    return results
+
+
+def wait_any(
+        *conditions: Condition,
+        timeout: int | float = 10,
+        check_interval: int | float = 0.1,
+        poller: Poller | None = None
+) -> Fired | None:
+    """
+    Waits until one of the conditions holds and returns which one fired, or None on timeout.
+
+    Every poll grabs one snapshot of the bounding box of all condition regions and checks all conditions on it.
+
+    :param poller: Custom polling schedule. When given, timeout and check_interval are taken from it.
+    """
+    return _wait(check_any, conditions, timeout, check_interval, poller)
+
+
+def wait_all(
+        *conditions: Condition,
+        timeout: int | float = 10,
+        check_interval: int | float = 0.1,
+        poller: Poller | None = None
+) -> list | None:
+    """
+    Waits until all conditions hold on the same snapshot and returns their results, or None on timeout.
+
+    :param poller: Custom polling schedule, see wait_any.
+    """
+    return _wait(check_all, conditions, timeout, check_interval, poller)
+
+
+def _wait(check, conditions: Sequence[Condition], timeout, check_interval, poller: Poller | None):
+    if not conditions:
+        raise ValueError('At least one condition must be provided.')
+    regions = [condition.region for condition in conditions]
+    poller = poller or Poller(timeout, check_interval)
+    for _ in poller:
+        result = check(conditions, ScreenSnapshot(regions))
+        if result is not None:
+            poller.found()
+            return result
+    return None
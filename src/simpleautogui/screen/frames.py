@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from time import monotonic
+from typing import Iterable, Iterator
+
+import numpy as np
+from PIL import Image, ImageGrab
+
+
+class FrameSource(ABC):
+    """
+    Produces RGB frames of screen areas.
+
+    Every Region wait grabs exactly one frame per poll and hands it to all matchers,
+    so a source is called once per tick regardless of the number of templates or colors.
+    """
+
+    @abstractmethod
+    def grab(self, bbox: tuple[int, int, int, int]) -> np.ndarray:
+        """
+        Returns the screen area as an RGB uint8 array with shape (h, w, 3).
+
+        The array must not be modified after it is returned: waits keep the previous frame
+        by reference to detect changes, so sources return new arrays or views of immutable data.
+
+        :param bbox: Screen area as (x, y, w, h).
+        """
+
+
+class ScreenFrameSource(FrameSource):
+    """
+    Grabs frames from the real screen with Pillow ImageGrab.
+    """
+
+    def grab(self, bbox: tuple[int, int, int, int]) -> np.ndarray:
+        x, y, w, h = bbox
+        screenshot = ImageGrab.grab(bbox=(x, y, x + w, y + h))
+        return np.asarray(screenshot.convert('RGB'))
+
+
+class ReplayFrameSource(FrameSource):
+    """
+    Serves prerecorded frames instead of the screen, so waits run without a display.
+
+    Each frame is treated as a full screen image placed at origin. By default every grab
+    moves to the next frame; the last frame is repeated when frames are exhausted unless loop is True.
+    """
+
+    def __init__(
+            self,
+            frames: Iterable[np.ndarray | Image.Image | str | Path],
+            origin: tuple[int, int] = (0, 0),
+            loop: bool = False,
+            advance_on_grab: bool = True
+    ):
+        self._frames = list(frames)
+        if not self._frames:
+            raise ValueError('At least one frame must be provided.')
+        self.origin = origin
+        self.loop = loop
+        self.advance_on_grab = advance_on_grab
+        self.index = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_files(cls, paths: Iterable[str | Path], **kwargs) -> 'ReplayFrameSource':
+        return cls(list(paths), **kwargs)
+
+    @property
+    def frame(self) -> np.ndarray:
+        """
+        The current frame as an RGB array.
+        """
+        frame = self._frames[self.index]
+        if not isinstance(frame, np.ndarray):
+            frame = self._load(frame)
+            self._frames[self.index] = frame
+        return frame
+
+    def advance(self) -> None:
+        """
+        Moves to the next frame.
+        """
+        if self.index + 1 < len(self._frames):
+            self.index += 1
+        elif self.loop:
+            self.index = 0
+
+    def grab(self, bbox: tuple[int, int, int, int]) -> np.ndarray:
+        with self._lock:
+            frame = self.frame
+            if self.advance_on_grab:
+                self.advance()
+        return crop_frame(frame, bbox, self.origin)
+
+    @staticmethod
+    def _load(frame: Image.Image | str | Path) -> np.ndarray:
+        if isinstance(frame, Image.Image):
+            return np.asarray(frame.convert('RGB'))
+        with Image.open(frame) as image:
+            return np.asarray(image.convert('RGB'))
+
+
+class SharedFrameSource(FrameSource):
+    """
+    Shares captures between threads that watch the screen at the same time.
+
+    A grab within max_age seconds of the previous capture is cut out of it when the capture contains the area.
+    Otherwise the bounding box of all areas requested during the last keep seconds is captured, so threads
+    watching different regions converge on one capture per tick. Concurrent misses wait for a single capture.
+    """
+
+    def __init__(self, source: FrameSource | None = None, max_age: int | float = 0.02, keep: int | float = 1.0):
+        if max_age < 0 or keep < 0:
+            raise ValueError('max_age and keep must be greater than or equal to 0.')
+        self.source = source or get_frame_source()
+        self.max_age = float(max_age)
+        self.keep = float(keep)
+        self.grabs = 0
+        self.captures = 0
+        self._frame: np.ndarray | None = None
+        self._bbox: tuple[int, int, int, int] | None = None
+        self._captured = float('-inf')
+        self._areas: dict[tuple[int, int, int, int], float] = {}
+        self._lock = threading.Lock()
+
+    def grab(self, bbox: tuple[int, int, int, int]) -> np.ndarray:
+        bbox = tuple(bbox)
+        with self._lock:
+            now = monotonic()
+            self.grabs += 1
+            self._areas[bbox] = now
+            if self._frame is None or now - self._captured > self.max_age or not self._contains(bbox):
+                self._areas = {area: seen for area, seen in self._areas.items() if now - seen <= self.keep}
+                self._bbox = self._union(self._areas)
+                self._frame = self.source.grab(self._bbox)
+                self._captured = monotonic()
+                self.captures += 1
+            return crop_frame(self._frame, bbox, self._bbox[:2])
+
+    def _contains(self, bbox: tuple[int, int, int, int]) -> bool:
+        x, y, w, h = bbox
+        left, top, width, height = self._bbox
+        return left <= x and top <= y and x + w <= left + width and y + h <= top + height
+
+    @staticmethod
+    def _union(areas: Iterable[tuple[int, int, int, int]]) -> tuple[int, int, int, int]:
+        areas = list(areas)
+        left = min(x for x, _, _, _ in areas)
+        top = min(y for _, y, _, _ in areas)
+        right = max(x + w for x, _, w, _ in areas)
+        bottom = max(y + h for _, y, _, h in areas)
+        return left, top, right - left, bottom - top
+
+
+def crop_frame(frame: np.ndarray, bbox: tuple[int, int, int, int], origin: tuple[int, int] = (0, 0)) -> np.ndarray:
+    """
+    Cuts the (x, y, w, h) screen area out of a frame placed at origin.
+
+    Areas outside the frame are filled with black, like ImageGrab does outside the desktop.
+    """
+    x, y, w, h = bbox
+    left, top = x - origin[0], y - origin[1]
+    frame_h, frame_w = frame.shape[:2]
+    if 0 <= left and 0 <= top and left + w <= frame_w and top + h <= frame_h:
+        return frame[top:top + h, left:left + w]
+
+    result = np.zeros((h, w, 3), dtype=np.uint8)
+    src_left, src_top = max(left, 0), max(top, 0)
+    src_right, src_bottom = min(left + w, frame_w), min(top + h, frame_h)
+    if src_left < src_right and src_top < src_bottom:
+        result[src_top - top:src_bottom - top, src_left - left:src_right - left] = \
+            frame[src_top:src_bottom, src_left:src_right]
+    return result
+
+
+_default_source: FrameSource = ScreenFrameSource()
+_local = threading.local()
+
+
+def get_frame_source() -> FrameSource:
+    """
+    Returns the frame source used by the current thread.
+    """
+    return getattr(_local, 'source', None) or _default_source
+
+
+def set_frame_source(source: FrameSource | None) -> None:
+    """
+    Replaces the process-wide default frame source. None restores the real screen.
+    """
+    global _default_source
+    _default_source = source or ScreenFrameSource()
+
+
+@contextmanager
+def use_frame_source(source: FrameSource) -> Iterator[FrameSource]:
+    """
+    Temporarily uses another frame source in the current thread.
+    """
+    previous = getattr(_local, 'source', None)
+    _local.source = source
+    try:
+        yield source
+    finally:
+        _local.source = previous
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Sequence
+
+import cv2
+import numpy as np
+
+from simpleautogui.screen.cancel import check_cancelled, get_cancel_event
+from simpleautogui.screen.changes import boxes_overlap
+from simpleautogui.screen.metrics import span
+from simpleautogui.screen.templates import Template
+
+
+class Match(NamedTuple):
+    """
+    Template occurrence in frame coordinates.
+    """
+    left: int
+    top: int
+    width: int
+    height: int
+    score: float
+    template: Template
+
+
+class TemplateMatcher:
+    """
+    Matches many templates against one frame in a single call.
+
+    Templates are evaluated concurrently on a thread pool; OpenCV releases the GIL inside
+    matchTemplate, so latency scales with the number of cores instead of the number of templates.
+
+    With pyramid search the frame and templates are first matched downscaled by 2 ** level,
+    and only neighbourhoods of coarse candidates are verified at full resolution with the requested confidence.
+    Downscaled images are smoothed by PYRAMID_SIGMA coarse pixels: a sharp-edged template placed between
+    the pixel blocks of the downscaled frame would otherwise score far below its full resolution score.
+    When more than PYRAMID_MAX_CANDIDATES coarse candidates are found, the template is matched at full resolution.
+
+    Inside cancel_scope tall frames are scored in full-width bands of at least BAND_ROWS frame rows
+    and BAND_TEMPLATE_HEIGHTS template heights of placements. That is the block OpenCV correlates with one DFT,
+    so banding adds no work, and the cancel event is checked between bands to interrupt the match within one band.
+    """
+
+    BAND_ROWS = 256
+    BAND_TEMPLATE_HEIGHTS = 4.5
+    PYRAMID_MARGIN = 0.2
+    PYRAMID_SIGMA = 0.7
+    PYRAMID_MIN_TEMPLATE_SIDE = 8
+    PYRAMID_AUTO_WIDTH = 960
+    PYRAMID_MAX_CANDIDATES = 64
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        if self.max_workers <= 0:
+            raise ValueError('max_workers must be greater than 0.')
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def match(
+            self,
+            frame: np.ndarray,
+            templates: Sequence[Template],
+            confidence: float,
+            limit: int | None = None,
+            pyramid: bool | int = False,
+            area: tuple[int, int, int, int] | None = None
+    ) -> list[list[Match]]:
+        """
+        Returns all matches of every template, one list per template in the given order.
+
+        :param frame: RGB frame to search in.
+        :param templates: Templates to search for.
+        :param confidence: Minimal normalized correlation score of a match.
+        :param limit: Maximal number of matches per template.
+        :param pyramid: Coarse-to-fine search. True picks the level from the frame width, an int sets it explicitly.
+        :param area: Search only placements that overlap this (x, y, w, h) frame area.
+        """
+        if area == (0, 0, frame.shape[1], frame.shape[0]):
+            area = None
+        cancel = get_cancel_event()
+        levels = [self.pyramid_level(frame, template, pyramid) for template in templates]
+
+        def run(template: Template, level: int) -> list[Match]:
+            check_cancelled(cancel)
+            window, left, top = frame, 0, 0
+            if area is not None:
+                window, left, top = self._area_window(frame, template, area)
+            if level:
+                small_frame = frames[level] if area is None else self._downscale(window, level)
+                matches = self._match_pyramid(window, small_frame, template, level, confidence, limit, cancel)
+            else:
+                matches = self.match_template(window, template, confidence, limit, cancel)
+            if left or top:
+                matches = [match._replace(left=match.left + left, top=match.top + top) for match in matches]
+            return matches
+
+        with span('match'):
+            frames = {} if area else {level: self._downscale(frame, level) for level in set(levels) if level}
+            if len(templates) <= 1 or self.max_workers == 1:
+                return [run(template, level) for template, level in zip(templates, levels)]
+            return list(self._pool().map(run, templates, levels))
+
+    def match_first(
+            self,
+            frame: np.ndarray,
+            templates: Sequence[Template],
+            confidence: float,
+            pyramid: bool | int = False,
+            area: tuple[int, int, int, int] | None = None
+    ) -> Match | None:
+        """
+        Returns the first match of the first template, in the given order, that is found in the frame.
+        """
+        for matches in self.match(frame, templates, confidence, limit=1, pyramid=pyramid, area=area):
+            if matches:
+                return matches[0]
+        return None
+
+    @classmethod
+    def match_template(
+            cls,
+            frame: np.ndarray,
+            template: Template,
+            confidence: float,
+            limit: int | None = None,
+            cancel: threading.Event | None = None
+    ) -> list[Match]:
+        """
+        Finds template occurrences in top-to-bottom, left-to-right order.
+
+        :param cancel: Event checked between bands of the frame; raises OperationCancelled once it is set.
+        """
+        if template.height > frame.shape[0] or template.width > frame.shape[1]:
+            return []
+        scores = cls._scores(frame, template.color, cancel)
+        locations = np.argwhere(scores >= confidence)[:limit]
+        return [
+            Match(int(x), int(y), template.width, template.height, float(scores[y, x]), template)
+            for y, x in locations
+        ]
+
+    @staticmethod
+    def merge(previous: list[Match], fresh: list[Match], area: tuple[int, int, int, int]) -> list[Match]:
+        """
+        Combines matches of an unchanged frame part with matches found again in a changed area.
+
+        Previous matches overlapping the area are dropped, fresh ones outside of it are ignored
+        because they were already known, and the result keeps top-to-bottom, left-to-right order.
+        """
+        previous_overlap = boxes_overlap([match[:4] for match in previous], area).tolist() if previous else []
+        fresh_overlap = boxes_overlap([match[:4] for match in fresh], area).tolist() if fresh else []
+        merged = [match for match, overlaps in zip(previous, previous_overlap) if not overlaps]
+        merged += [match for match, overlaps in zip(fresh, fresh_overlap) if overlaps]
+        return sorted(merged, key=lambda match: (match.top, match.left))
+
+    @classmethod
+    def pyramid_level(cls, frame: np.ndarray, template: Template, pyramid: bool | int) -> int:
+        """
+        Returns the downscale level used for a template, lowered until the template stays large enough.
+        """
+        if pyramid is True:
+            level = max(math.ceil(math.log2(frame.shape[1] / cls.PYRAMID_AUTO_WIDTH)), 0)
+        else:
+            level = max(int(pyramid), 0)
+        while level and min(template.width, template.height) >> level < cls.PYRAMID_MIN_TEMPLATE_SIDE:
+            level -= 1
+        return level
+
+    @classmethod
+    def _match_pyramid(
+            cls,
+            frame: np.ndarray,
+            small_frame: np.ndarray,
+            template: Template,
+            level: int,
+            confidence: float,
+            limit: int | None,
+            cancel: threading.Event | None = None
+    ) -> list[Match]:
+        small_template = cls._smooth(template.scaled(level))
+        if small_template.shape[0] > small_frame.shape[0] or small_template.shape[1] > small_frame.shape[1]:
+            return []
+
+        scores = cls._scores(small_frame, small_template, cancel)
+        peaks = (scores >= confidence - cls.PYRAMID_MARGIN) & (scores == cv2.dilate(scores, np.ones((3, 3))))
+        candidates = np.argwhere(peaks)
+        if len(candidates) > cls.PYRAMID_MAX_CANDIDATES:
+            # Too many look-alikes to verify one by one; dropping some could drop real matches.
+            return cls.match_template(frame, template, confidence, limit, cancel)
+
+        factor = 2 ** level
+        found = {}
+        for y, x in candidates:
+            left = max(int(x) * factor - factor, 0)
+            top = max(int(y) * factor - factor, 0)
+            window = frame[top:top + template.height + 2 * factor + 1, left:left + template.width + 2 * factor + 1]
+            check_cancelled(cancel)
+            for match in cls.match_template(window, template, confidence):
+                found[(left + match.left, top + match.top)] = match.score
+
+        ordered = sorted(found.items(), key=lambda item: (item[0][1], item[0][0]))[:limit]
+        return [Match(x, y, template.width, template.height, score, template) for (x, y), score in ordered]
+
+    @classmethod
+    def _scores(cls, frame: np.ndarray, template: np.ndarray, cancel: threading.Event | None) -> np.ndarray:
+        template_h, template_w = template.shape[:2]
+        height, width = frame.shape[0] - template_h + 1, frame.shape[1] - template_w + 1
+        rows = max(round(cls.BAND_TEMPLATE_HEIGHTS * template_h), cls.BAND_ROWS - template_h + 1)
+        if cancel is None or height <= rows:
+            return cv2.matchTemplate(frame, template, cv2.TM_CCOEFF_NORMED)
+
+        scores = np.empty((height, width), dtype=np.float32)
+        for top in range(0, height, rows):
+            check_cancelled(cancel)
+            band = frame[top:top + rows + template_h - 1]
+            cv2.matchTemplate(band, template, cv2.TM_CCOEFF_NORMED, result=scores[top:top + rows])
+        return scores
+
+    @staticmethod
+    def _area_window(
+            frame: np.ndarray,
+            template: Template,
+            area: tuple[int, int, int, int]
+    ) -> tuple[np.ndarray, int, int]:
+        x, y, w, h = area
+        left = max(x - template.width + 1, 0)
+        top = max(y - template.height + 1, 0)
+        right = min(x + w + template.width - 1, frame.shape[1])
+        bottom = min(y + h + template.height - 1, frame.shape[0])
+        return frame[top:bottom, left:right], left, top
+
+    @classmethod
+    def _downscale(cls, frame: np.ndarray, level: int) -> np.ndarray:
+        factor = 2 ** level
+        size = (max(frame.shape[1] // factor, 1), max(frame.shape[0] // factor, 1))
+        return cls._smooth(cv2.resize(frame, size, interpolation=cv2.INTER_AREA))
+
+    @classmethod
+    def _smooth(cls, image: np.ndarray) -> np.ndarray:
+        return cv2.GaussianBlur(image, (0, 0), cls.PYRAMID_SIGMA)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='simpleautogui-match')
+            return self._executor
+
+
+_matcher = TemplateMatcher()
+
+
+def get_matcher() -> TemplateMatcher:
+    return _matcher
+
+
+def set_matcher(matcher: TemplateMatcher) -> None:
+    """
+    Replaces the matcher used by Region image waits.
+    """
+    global _matcher
+    _matcher = matcher
@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+# Upper bounds of histogram buckets in milliseconds; one more bucket counts slower observations.
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """
+    Counts observations in fixed buckets and keeps their count, sum, minimum and maximum.
+    """
+
+    __slots__ = ('bounds', 'buckets', 'count', 'total', 'min', 'max')
+
+    def __init__(self, bounds: Iterable[float] = BUCKETS_MS):
+        self.bounds = tuple(float(bound) for bound in bounds)
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def __repr__(self):
+        return f'Histogram(count={self.count}, mean={self.mean:.3f}, p90={self.quantile(0.9):.3f})'
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates the q quantile as the upper bound of its bucket, clipped to the observed range.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(q * self.count, 1)
+        seen = 0
+        for bound, count in zip(self.bounds, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(max(bound, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'bounds': list(self.bounds),
+            'buckets': list(self.buckets),
+        }
+
+
+class MetricsSink(ABC):
+    """
+    Receives snapshots of Metrics on flush.
+    """
+
+    @abstractmethod
+    def write(self, snapshot: dict) -> None:
+        """
+        Stores a snapshot as returned by Metrics.snapshot.
+        """
+
+
+class MemorySink(MetricsSink):
+    """
+    Keeps the last maxlen snapshots in memory.
+    """
+
+    def __init__(self, maxlen: int | None = 100):
+        self.snapshots: deque[dict] = deque(maxlen=maxlen)
+
+    @property
+    def latest(self) -> dict | None:
+        return self.snapshots[-1] if self.snapshots else None
+
+    def write(self, snapshot: dict) -> None:
+        self.snapshots.append(snapshot)
+
+
+class JsonlSink(MetricsSink):
+    """
+    Appends every snapshot to a file as one JSON line.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def write(self, snapshot: dict) -> None:
+        with self.path.open('a', encoding='utf-8') as file:
+            file.write(json.dumps(snapshot) + '\n')
+
+
+class PrometheusSink(MetricsSink):
+    """
+    Rewrites a file in the Prometheus text format, for example for the node exporter textfile collector.
+
+    Spans become histograms named <prefix>_<span>_seconds and counters become <prefix>_<counter>_total.
+    The file is replaced atomically, so the collector never reads a partial file.
+    """
+
+    def __init__(self, path: str | Path, prefix: str = 'simpleautogui', labels: dict[str, str] | None = None):
+        self.path = Path(path)
+        self.prefix = prefix
+        self.labels = dict(labels or {})
+
+    def write(self, snapshot: dict) -> None:
+        temporary = self.path.with_name(self.path.name + '.tmp')
+        temporary.write_text(self.render(snapshot), encoding='utf-8')
+        os.replace(temporary, self.path)
+
+    def render(self, snapshot: dict) -> str:
+        lines = []
+        for name, value in sorted(snapshot['counters'].items()):
+            metric = self._name(f'{name}_total')
+            lines += [f'# TYPE {metric} counter', f'{metric}{self._labels()} {value}']
+        for name, histogram in sorted(snapshot['histograms'].items()):
+            metric = self._name(f'{name}_seconds')
+            lines.append(f'# TYPE {metric} histogram')
+            seen = 0
+            for bound, count in zip(histogram['bounds'], histogram['buckets']):
+                seen += count
+                lines.append(f'{metric}_bucket{self._labels(le=repr(bound / 1000))} {seen}')
+            lines.append(f'{metric}_bucket{self._labels(le="+Inf")} {histogram["count"]}')
+            lines.append(f'{metric}_sum{self._labels()} {histogram["sum"] / 1000!r}')
+            lines.append(f'{metric}_count{self._labels()} {histogram["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def _name(self, name: str) -> str:
+        return re.sub(r'[^a-zA-Z0-9_]', '_', f'{self.prefix}_{name}')
+
+    def _labels(self, **extra: str) -> str:
+        labels = {**self.labels, **extra}
+        if not labels:
+            return ''
+        escaped = (str(value).replace('\\', r'\\').replace('"', r'\"') for value in labels.values())
+        return '{' + ','.join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + '}'
+
+
+class Span:
+    """
+    Measures the time of a with block and records it in milliseconds.
+    """
+
+    __slots__ = ('metrics', 'name', '_start')
+
+    def __init__(self, metrics: Metrics, name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self) -> Span:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.metrics.observe(self.name, (time.perf_counter() - self._start) * 1000)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Metrics:
+    """
+    Timing histograms and counters of screen operations.
+
+    Region and macro operations record spans in milliseconds: capture, match, color, ocr, wait and sleep,
+    and count polls, hits and misses of waits. They are recorded only while the Metrics is active, see
+    use_metrics and set_metrics; otherwise instrumentation costs one thread-local lookup.
+    Sinks receive a snapshot on flush, and with flush_interval also every flush_interval seconds while recording.
+    """
+
+    def __init__(
+            self,
+            sinks: Iterable[MetricsSink] = (),
+            flush_interval: int | float | None = None,
+            bounds: Iterable[float] = BUCKETS_MS
+    ):
+        if flush_interval is not None and flush_interval <= 0:
+            raise ValueError('flush_interval must be greater than 0.')
+        self.sinks = list(sinks)
+        self.flush_interval = flush_interval
+        self.bounds = tuple(bounds)
+        self._histograms: dict[str, Histogram] = {}
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._next_flush = None if flush_interval is None else time.monotonic() + flush_interval
+
+    def __repr__(self):
+        return f'Metrics({", ".join(self.histograms)})'
+
+    def __getitem__(self, name: str) -> Histogram:
+        return self._histograms[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._histograms
+
+    @property
+    def histograms(self) -> dict[str, Histogram]:
+        with self._lock:
+            return dict(self._histograms)
+
+    @property
+    def counters(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def span(self, name: str) -> Span:
+        return Span(self, name)
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(self.bounds)
+            histogram.observe(value)
+        self._maybe_flush()
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+        self._maybe_flush()
+
+    def snapshot(self) -> dict:
+        """
+        Returns all counters and histograms as plain data that can be serialized to JSON.
+        """
+        with self._lock:
+            return {
+                'timestamp': time.time(),
+                'counters': dict(self._counters),
+                'histograms': {name: histogram.to_dict() for name, histogram in self._histograms.items()},
+            }
+
+    def flush(self) -> dict:
+        """
+        Writes a snapshot to every sink and returns it.
+        """
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            sink.write(snapshot)
+        return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def summary(self) -> str:
+        """
+        Returns a table with count, mean, p50, p90, p99 and max of every span in milliseconds, and the counters.
+        """
+        rows = [f'{"span":<12} {"count":>7} {"mean":>9} {"p50":>9} {"p90":>9} {"p99":>9} {"max":>9}']
+        for name, histogram in sorted(self.histograms.items()):
+            rows.append(
+                f'{name:<12} {histogram.count:>7} {histogram.mean:9.2f} {histogram.quantile(0.5):9.2f} '
+                f'{histogram.quantile(0.9):9.2f} {histogram.quantile(0.99):9.2f} {histogram.max:9.2f}'
+            )
+        rows += [f'{name:<12} {value:>7}' for name, value in sorted(self.counters.items())]
+        return '\n'.join(rows)
+
+    def _maybe_flush(self) -> None:
+        if self._next_flush is None or time.monotonic() < self._next_flush:
+            return
+        with self._lock:
+            if time.monotonic() < self._next_flush:
+                return
+            self._next_flush = time.monotonic() + self.flush_interval
+        self.flush()
+
+
+class _ThreadMetrics(threading.local):
+    # A class default keeps the lookup cheap; a missing thread-local attribute costs an exception internally.
+    metrics: Metrics | None = None
+
+
+_default_metrics: Metrics | None = None
+_local = _ThreadMetrics()
+
+
+def get_metrics() -> Metrics | None:
+    """
+    Returns the metrics recorded by the current thread, or None when instrumentation is disabled.
+    """
+    return _local.metrics or _default_metrics
+
+
+def set_metrics(metrics: Metrics | None) -> None:
+    """
+    Sets process-wide metrics for threads without use_metrics. None disables instrumentation.
+    """
+    global _default_metrics
+    _default_metrics = metrics
+
+
+@contextmanager
+def use_metrics(metrics: Metrics | None) -> Iterator[Metrics | None]:
+    """
+    Temporarily records operations of the current thread into metrics. None falls back to set_metrics.
+    """
+    previous = _local.metrics
+    _local.metrics = metrics
+    try:
+        yield metrics
+    finally:
+        _local.metrics = previous
+
+
+def span(name: str) -> Span | _NullSpan:
+    """
+    Returns a context manager that records the time of its block under name in the active metrics.
+    """
+    metrics = _local.metrics or _default_metrics
+    if metrics is None:
+        return _NULL_SPAN
+    return Span(metrics, name)
+
+
+def count(name: str, value: int = 1) -> None:
+    """
+    Adds value to the counter in the active metrics.
+    """
+    metrics = _local.metrics or _default_metrics
+    if metrics is not None:
+        metrics.count(name, value)
@@ -0,0 +1,14 @@
+from simpleautogui.screen.ocr.cache import OcrCache, OcrCacheStats
+from simpleautogui.screen.ocr.engines import (
+    OcrEngine, OcrEnginePool, PytesseractEngine, TesserocrEngine,
+    default_engine_factory, get_ocr_pool, set_ocr_pool
+)
+from simpleautogui.screen.ocr.incremental import IncrementalOcr
+from simpleautogui.screen.ocr.result import OcrResult
+from simpleautogui.screen.ocr.preprocess import (
+    PRESETS, Contrast, Denoise, Grayscale, Pipeline, Scale, Sharpen, Stage, Threshold, get_pipeline
+)
+from simpleautogui.screen.ocr.index import TextIndex, edit_distance
+from simpleautogui.screen.ocr.areas import detect_text_areas, recognize_areas, recognize_areas_text
+from simpleautogui.screen.ocr.tiles import TiledOcr, get_tiled_ocr, set_tiled_ocr
+from simpleautogui.screen.ocr.watcher import OcrWatcher, WatchedText
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from simpleautogui.screen.ocr.engines import OcrEnginePool, get_ocr_pool
+from simpleautogui.screen.ocr.result import OcrResult
+
+
+def detect_text_areas(
+        image: np.ndarray,
+        min_height: int = 6,
+        join: int = 9,
+        margin: int = 4
+) -> list[tuple[int, int, int, int]]:
+    """
+    Finds boxes likely to contain text with a morphological gradient, without OCR.
+
+    Strong edges are binarized with Otsu's threshold and closed horizontally by join pixels, so letters of
+    a line grow into one component. Components lower than min_height are dropped, the rest are padded by
+    margin and overlapping boxes are merged. Returns (x, y, w, h) boxes sorted top to bottom, left to right.
+    """
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    _, mask = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (join, 1)))
+    _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+
+    height, width = gray.shape
+    boxes = []
+    for x, y, w, h, _ in stats[1:].tolist():
+        if h < min_height or w < min_height // 2:
+            continue
+        left, top = max(x - margin, 0), max(y - margin, 0)
+        boxes.append([left, top, min(x + w + margin, width) - left, min(y + h + margin, height) - top])
+    return [tuple(box) for box in sorted(_merge_boxes(boxes), key=lambda box: (box[1], box[0]))]
+
+
+def _merge_boxes(boxes: list[list[int]]) -> list[list[int]]:
+    merged = True
+    while merged:
+        merged = False
+        result = []
+        for box in boxes:
+            for other in result:
+                if (
+                        box[0] < other[0] + other[2] and other[0] < box[0] + box[2]
+                        and box[1] < other[1] + other[3] and other[1] < box[1] + box[3]
+                ):
+                    right = max(box[0] + box[2], other[0] + other[2])
+                    bottom = max(box[1] + box[3], other[1] + other[3])
+                    other[0], other[1] = min(box[0], other[0]), min(box[1], other[1])
+                    other[2], other[3] = right - other[0], bottom - other[1]
+                    merged = True
+                    break
+            else:
+                result.append(box)
+        boxes = result
+    return boxes
+
+
+def _crops(image: Image.Image, areas: list[tuple[int, int, int, int]]) -> list[Image.Image]:
+    return [image.crop((x, y, x + w, y + h)) for x, y, w, h in areas]
+
+
+def recognize_areas(
+        image: Image.Image,
+        areas: list[tuple[int, int, int, int]],
+        lang: str = 'eng+rus',
+        pool: OcrEnginePool | None = None,
+        **options
+) -> OcrResult:
+    """
+    Recognizes the (x, y, w, h) areas of an image in parallel and returns their words in image coordinates.
+
+    Block numbers are renumbered, so lines of different areas never share a (block_num, par_num, line_num) key.
+    """
+    results = (pool or get_ocr_pool()).result_many(_crops(image, areas), lang=lang, **options)
+    return OcrResult.concat(results, [(x, y) for x, y, _, _ in areas])
+
+
+def recognize_areas_text(
+        image: Image.Image,
+        areas: list[tuple[int, int, int, int]],
+        lang: str = 'eng+rus',
+        pool: OcrEnginePool | None = None,
+        **options
+) -> str:
+    """
+    Recognizes the areas of an image in parallel and joins their texts in area order.
+    """
+    texts = (pool or get_ocr_pool()).string_many(_crops(image, areas), lang=lang, **options)
+    return '\n'.join(text.strip() for text in texts if text.strip())
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, NamedTuple, TypeVar
+
+from PIL import Image
+
+T = TypeVar('T')
+
+
+class OcrCacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+
+
+class OcrCache:
+    """
+    LRU cache of OCR results keyed by the preprocessed image content.
+
+    The key is a blake2b digest of the image pixels, size and mode together with the recognition kind,
+    language and engine options, so an unchanged screen area costs one hash instead of one recognition.
+    The least recently used results are evicted when there are more than max_entries of them or their
+    estimated size exceeds max_bytes. Cached results are shared and must not be modified.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 16 * 1024 * 1024):
+        if max_entries <= 0 or max_bytes <= 0:
+            raise ValueError('max_entries and max_bytes must be greater than 0.')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._results: OrderedDict[bytes, tuple[object, int]] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._results)
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    @property
+    def stats(self) -> OcrCacheStats:
+        return OcrCacheStats(self.hits, self.misses, self.evictions, len(self._results), self._nbytes)
+
+    @staticmethod
+    def key(image: Image.Image, kind: str, lang: str, options: dict) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f'{kind}\0{lang}\0{sorted(options.items())!r}\0{image.mode}\0{image.size}\0'.encode())
+        digest.update(image.tobytes())
+        return digest.digest()
+
+    def get_or_compute(self, key: bytes, compute: Callable[[], T]) -> T:
+        """
+        Returns the cached result for key, computing and storing it on a miss.
+        """
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+
+        result = compute()
+        size = self._estimate_size(result)
+        with self._lock:
+            previous = self._results.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous[1]
+            self._results[key] = (result, size)
+            self._nbytes += size
+            self._evict()
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def _evict(self) -> None:
+        while len(self._results) > 1 and (len(self._results) > self.max_entries or self._nbytes > self.max_bytes):
+            _, (_, size) = self._results.popitem(last=False)
+            self._nbytes -= size
+            self.evictions += 1
+
+    @staticmethod
+    def _estimate_size(result: object) -> int:
+        if isinstance(result, str):
+            return 64 + len(result.encode())
+        return 256 + getattr(result, 'nbytes', 0)
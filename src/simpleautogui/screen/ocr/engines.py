@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import os
+import shlex
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterator, Sequence
+
+import pytesseract
+from PIL import Image
+
+from simpleautogui.screen.cancel import OperationCancelled, check_cancelled, get_cancel_event, wait_future
+from simpleautogui.screen.ocr.cache import OcrCache
+from simpleautogui.screen.ocr.result import DATA_COLUMNS, OcrResult
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+
+class UnsupportedConfig(ValueError):
+    """
+    Raised by TesserocrEngine.parse_config for tesseract options the engine cannot apply in process.
+    """
+
+
+class OcrEngine(ABC):
+    """
+    Recognizes text with models of one language set.
+
+    An engine is used by one thread at a time; OcrEnginePool hands engines out and keeps them warm.
+    """
+
+    def __init__(self, lang: str = 'eng+rus'):
+        self.lang = lang
+
+    @abstractmethod
+    def data(self, image: Image.Image, **kwargs) -> dict[str, list]:
+        """
+        Returns word boxes in the pytesseract.image_to_data Output.DICT layout.
+        """
+
+    @abstractmethod
+    def string(self, image: Image.Image, **kwargs) -> str:
+        """
+        Returns the recognized text like pytesseract.image_to_string.
+        """
+
+    def close(self) -> None:
+        pass
+
+
+class PytesseractEngine(OcrEngine):
+    """
+    Runs the tesseract executable through pytesseract, one process per call.
+
+    Used when tesserocr is not installed. Keyword arguments are passed to pytesseract as is.
+    """
+
+    def data(self, image: Image.Image, **kwargs) -> dict[str, list]:
+        return pytesseract.image_to_data(image, lang=self.lang, output_type=pytesseract.Output.DICT, **kwargs)
+
+    def string(self, image: Image.Image, **kwargs) -> str:
+        return pytesseract.image_to_string(image, lang=self.lang, **kwargs)
+
+
+class TesserocrEngine(OcrEngine):
+    """
+    Keeps a tesseract API with loaded language models in memory through tesserocr.
+
+    The config string understands --psm, --oem and -c name=value like the tesseract executable. Variables
+    set by -c apply to one call only and are restored afterwards, because the engine is reused by later
+    calls. An --oem other than the default starts a second API for that mode on first use and keeps it.
+    Configs with other options are passed to PytesseractEngine together with the keyword arguments,
+    otherwise pytesseract-only keyword arguments such as timeout or nice are ignored.
+    """
+
+    def __init__(self, lang: str = 'eng+rus'):
+        if tesserocr is None:
+            raise ModuleNotFoundError('TesserocrEngine requires tesserocr: pip install simpleautogui[ocr]')
+        super().__init__(lang)
+        self._api = tesserocr.PyTessBaseAPI(lang=lang)
+        self._oem_apis = {}
+        self._fallback = None
+
+    def data(self, image: Image.Image, config: str = '', **kwargs) -> dict[str, list]:
+        try:
+            api, previous = self._prepare(image, config)
+        except UnsupportedConfig:
+            return self._pytesseract().data(image, config=config, **kwargs)
+        try:
+            tsv = api.GetTSVText(0) or ''
+        finally:
+            self._restore(api, previous)
+        data = {column: [] for column in DATA_COLUMNS}
+        for row in tsv.splitlines():
+            values = row.split('\t', len(DATA_COLUMNS) - 1)
+            if len(values) < len(DATA_COLUMNS) - 1:
+                continue
+            values += [''] * (len(DATA_COLUMNS) - len(values))
+            for column, value in zip(DATA_COLUMNS, values):
+                if column == 'text':
+                    data[column].append(value)
+                elif column == 'conf':
+                    data[column].append(float(value))
+                else:
+                    data[column].append(int(value))
+        return data
+
+    def string(self, image: Image.Image, config: str = '', **kwargs) -> str:
+        try:
+            api, previous = self._prepare(image, config)
+        except UnsupportedConfig:
+            return self._pytesseract().string(image, config=config, **kwargs)
+        try:
+            return api.GetUTF8Text()
+        finally:
+            self._restore(api, previous)
+
+    def close(self) -> None:
+        self._api.End()
+        for api in self._oem_apis.values():
+            api.End()
+        self._oem_apis.clear()
+
+    def _prepare(self, image: Image.Image, config: str) -> tuple[object, dict[str, str]]:
+        """
+        Applies config and the image to the API for the requested --oem.
+
+        Returns the API and previous values of the changed variables for _restore.
+        """
+        psm, oem, variables = self.parse_config(config)
+        api = self._api_for(oem)
+        previous = {}
+        try:
+            for name, value in variables.items():
+                if name not in previous:
+                    previous[name] = api.GetVariableAsString(name)
+                if not api.SetVariable(name, value):
+                    raise ValueError(f'Unknown tesseract variable: {name}')
+        except Exception:
+            self._restore(api, previous)
+            raise
+        api.Clear()
+        api.SetPageSegMode(tesserocr.PSM.AUTO if psm is None else psm)
+        api.SetImage(image)
+        return api, previous
+
+    @staticmethod
+    def _restore(api, previous: dict[str, str]) -> None:
+        for name, value in previous.items():
+            if value is not None:
+                api.SetVariable(name, value)
+
+    def _api_for(self, oem: int | None):
+        if oem is None:
+            return self._api
+        api = self._oem_apis.get(oem)
+        if api is None:
+            api = self._oem_apis[oem] = tesserocr.PyTessBaseAPI(lang=self.lang, oem=oem)
+        return api
+
+    def _pytesseract(self) -> PytesseractEngine:
+        if self._fallback is None:
+            self._fallback = PytesseractEngine(self.lang)
+        return self._fallback
+
+    @staticmethod
+    def parse_config(config: str) -> tuple[int | None, int | None, dict[str, str]]:
+        """
+        Splits a tesseract config string into the page segmentation mode, the engine mode and -c variables.
+
+        Raises UnsupportedConfig for options TesserocrEngine cannot apply and ValueError for malformed ones.
+        """
+        psm = oem = None
+        variables = {}
+        arguments = shlex.split(config)
+        index = 0
+        while index < len(arguments):
+            argument = arguments[index]
+            if argument in ('--psm', '--oem', '-c') and index + 1 < len(arguments):
+                value = arguments[index + 1]
+                index += 2
+            elif argument.startswith(('--psm=', '--oem=')):
+                argument, _, value = argument.partition('=')
+                index += 1
+            else:
+                raise UnsupportedConfig(f'Unsupported tesseract config option for TesserocrEngine: {argument}')
+            if argument == '--psm':
+                psm = int(value)
+            elif argument == '--oem':
+                oem = int(value)
+            else:
+                name, separator, variable = value.partition('=')
+                if not separator:
+                    raise ValueError(f'Expected -c name=value, got: -c {value}')
+                variables[name] = variable
+        return psm, oem, variables
+
+
+def default_engine_factory() -> Callable[[str], OcrEngine]:
+    """
+    Returns TesserocrEngine when tesserocr is installed, otherwise PytesseractEngine.
+    """
+    return TesserocrEngine if tesserocr is not None else PytesseractEngine
+
+
+class OcrEnginePool:
+    """
+    Lends warm OCR engines per language set.
+
+    At most max_workers recognitions run at once; further calls wait in line for a free slot.
+    Released engines stay loaded, so only the first calls for a language pay for starting an engine.
+    Results of result and string are kept in an OcrCache shared by both; pass cache=False to disable it.
+
+    Inside cancel_scope recognitions run on pool threads and calls raise OperationCancelled as soon as
+    the event is set. An abandoned recognition finishes in the background and still fills the cache.
+    """
+
+    def __init__(
+            self,
+            factory: Callable[[str], OcrEngine] | None = None,
+            max_workers: int | None = None,
+            cache: OcrCache | bool = True
+    ):
+        self.factory = factory or default_engine_factory()
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        if self.max_workers <= 0:
+            raise ValueError('max_workers must be greater than 0.')
+        self.cache = OcrCache() if cache is True else cache or None
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._idle: dict[str, list[OcrEngine]] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def engine(self, lang: str = 'eng+rus') -> Iterator[OcrEngine]:
+        """
+        Borrows an engine for lang, waiting while all slots are busy.
+        """
+        with self._slots:
+            with self._lock:
+                idle = self._idle.setdefault(lang, [])
+                engine = idle.pop() if idle else None
+            if engine is None:
+                engine = self.factory(lang)
+            try:
+                yield engine
+            finally:
+                with self._lock:
+                    self._idle.setdefault(lang, []).append(engine)
+
+    def warm(self, lang: str = 'eng+rus', count: int = 1) -> None:
+        """
+        Starts count engines for lang ahead of the first recognition.
+        """
+        engines = [self.factory(lang) for _ in range(min(count, self.max_workers))]
+        with self._lock:
+            self._idle.setdefault(lang, []).extend(engines)
+
+    def result(self, image: Image.Image, lang: str = 'eng+rus', **kwargs) -> OcrResult:
+        """
+        Recognizes words of the image with an engine for lang; keyword arguments are passed to engine.data.
+        """
+        return self._recognize('result', image, lang, kwargs)
+
+    def string(self, image: Image.Image, lang: str = 'eng+rus', **kwargs) -> str:
+        return self._recognize('string', image, lang, kwargs)
+
+    def result_many(self, images: Sequence[Image.Image], lang: str = 'eng+rus', **kwargs) -> list[OcrResult]:
+        """
+        Recognizes several images concurrently, up to max_workers at once, and returns results in order.
+        """
+        return self._recognize_many('result', images, lang, kwargs)
+
+    def string_many(self, images: Sequence[Image.Image], lang: str = 'eng+rus', **kwargs) -> list[str]:
+        return self._recognize_many('string', images, lang, kwargs)
+
+    def close(self) -> None:
+        """
+        Stops idle engines. Engines in use are kept and stopped by the next close.
+        """
+        with self._lock:
+            engines = [engine for idle in self._idle.values() for engine in idle]
+            self._idle.clear()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        for engine in engines:
+            engine.close()
+
+    def _recognize(self, kind: str, image: Image.Image, lang: str, options: dict):
+        def compute():
+            with self.engine(lang) as engine:
+                if kind == 'result':
+                    return OcrResult.from_data(engine.data(image, **options))
+                return engine.string(image, **options)
+
+        def run():
+            if self.cache is None:
+                return compute()
+            return self.cache.get_or_compute(OcrCache.key(image, kind, lang, options), compute)
+
+        cancel = get_cancel_event()
+        if cancel is None:
+            return run()
+        check_cancelled(cancel)
+        return wait_future(self._pool().submit(run), cancel)
+
+    def _recognize_many(self, kind: str, images: Sequence[Image.Image], lang: str, options: dict) -> list:
+        if len(images) <= 1:
+            return [self._recognize(kind, image, lang, options) for image in images]
+        cancel = get_cancel_event()
+        check_cancelled(cancel)
+        executor = self._pool()
+        futures = [executor.submit(self._recognize, kind, image, lang, options) for image in images]
+        try:
+            return [wait_future(future, cancel) for future in futures]
+        except OperationCancelled:
+            for future in futures:
+                future.cancel()
+            raise
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='simpleautogui-ocr')
+            return self._executor
+
+
+_pool: OcrEnginePool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_ocr_pool() -> OcrEnginePool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = OcrEnginePool()
+    return _pool
+
+
+def set_ocr_pool(pool: OcrEnginePool | None) -> None:
+    """
+    Replaces the engine pool used by Region OCR methods. None restores the default pool.
+    """
+    global _pool
+    with _pool_lock:
+        previous, _pool = _pool, pool
+    if previous is not None and previous is not pool:
+        previous.close()
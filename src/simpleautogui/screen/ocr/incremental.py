@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import numpy as np
+from PIL import Image
+
+from simpleautogui.screen.ocr.engines import OcrEnginePool, get_ocr_pool
+from simpleautogui.screen.ocr.result import OcrResult
+
+
+class IncrementalOcr:
+    """
+    Maintains the recognized words of one screen area across frames.
+
+    The first frame is recognized whole. On later frames pixel rows are compared with the previous
+    frame, changed rows are widened to the text lines they touch, and only those horizontal bands
+    are recognized again and merged into the model, so a large text panel updates in time
+    proportional to what changed. Words are kept in image coordinates of the frames passed in.
+    """
+
+    def __init__(self, lang: str = 'eng+rus', pool: OcrEnginePool | None = None, margin: int = 4, **options):
+        if margin < 0:
+            raise ValueError('margin must be greater than or equal to 0.')
+        self.lang = lang
+        self.pool = pool
+        self.margin = margin
+        self.options = options
+        self.last_bands: list[tuple[int, int]] = []
+        self._previous: np.ndarray | None = None
+        self._lines: dict[int, list[dict]] = {}
+        self._next_line = 1
+
+    def reset(self) -> None:
+        self.last_bands = []
+        self._previous = None
+        self._lines = {}
+
+    @property
+    def text(self) -> str:
+        """
+        Text of the model, one line per recognized text line.
+        """
+        return '\n'.join(' '.join(word['text'] for word in words) for _, words in self._sorted_lines())
+
+    def update(self, image: Image.Image) -> OcrResult:
+        """
+        Brings the model up to date with the frame and returns its words.
+
+        Every text line is reported as its own block, so (block_num, par_num, line_num) groups words by line.
+        """
+        frame = np.asarray(image)
+        height = frame.shape[0]
+        if self._previous is None or self._previous.shape != frame.shape:
+            lines = {}
+            bands = [(0, height)]
+        else:
+            lines = dict(self._lines)
+            changed = np.not_equal(frame, self._previous).reshape(height, -1).any(axis=1)
+            bands = self._changed_bands(np.flatnonzero(changed), height)
+
+        # The model is replaced only after every band is recognized, so a failed update leaves it untouched.
+        next_line = self._next_line
+        for top, bottom in bands:
+            for line_id in [line_id for line_id, words in lines.items() if self._overlaps(words, top, bottom)]:
+                del lines[line_id]
+            for words in self._recognize(image, top, bottom):
+                lines[next_line] = words
+                next_line += 1
+        self._lines, self._previous, self._next_line = lines, frame, next_line
+        self.last_bands = bands
+        return self.result()
+
+    def result(self) -> OcrResult:
+        """
+        Returns words of the model ordered by lines from top to bottom.
+        """
+        words = [(line_id, word) for line_id, line in self._sorted_lines() for word in line]
+        if not words:
+            return OcrResult.empty()
+        return OcrResult(
+            [word['text'] for _, word in words],
+            [word['conf'] for _, word in words],
+            [(word['left'], word['top'], word['width'], word['height']) for _, word in words],
+            [(line_id, 1, 1) for line_id, _ in words],
+        )
+
+    def _changed_bands(self, rows: np.ndarray, height: int) -> list[tuple[int, int]]:
+        if not rows.size:
+            return []
+        bands = []
+        breaks = np.flatnonzero(np.diff(rows) > 2 * self.margin + 1)
+        starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+        ends = np.concatenate((rows[breaks], [rows[-1]])) + 1
+        for top, bottom in zip(starts.tolist(), ends.tolist()):
+            top, bottom = self._widen(max(top - self.margin, 0), min(bottom + self.margin, height))
+            if bands and top <= bands[-1][1]:
+                bands[-1] = (bands[-1][0], max(bottom, bands[-1][1]))
+            else:
+                bands.append((top, bottom))
+        return bands
+
+    def _widen(self, top: int, bottom: int) -> tuple[int, int]:
+        while True:
+            lines = [words for words in self._lines.values() if self._overlaps(words, top, bottom)]
+            new_top = min([top] + [self._line_top(words) for words in lines])
+            new_bottom = max([bottom] + [self._line_bottom(words) for words in lines])
+            if (new_top, new_bottom) == (top, bottom):
+                return top, bottom
+            top, bottom = new_top, new_bottom
+
+    def _recognize(self, image: Image.Image, top: int, bottom: int) -> list[list[dict]]:
+        crop = image.crop((0, top, image.width, bottom))
+        result = (self.pool or get_ocr_pool()).result(crop, lang=self.lang, **self.options).words()
+        texts, confs, boxes = result.text.tolist(), result.conf.tolist(), result.boxes.tolist()
+        lines = []
+        for group in result.line_groups():
+            words = [
+                {'text': texts[index], 'conf': confs[index], 'left': boxes[index][0], 'top': boxes[index][1] + top,
+                 'width': boxes[index][2], 'height': boxes[index][3]}
+                for index in group
+            ]
+            lines.append(sorted(words, key=lambda word: word['left']))
+        return lines
+
+    def _sorted_lines(self) -> list[tuple[int, list[dict]]]:
+        return sorted(self._lines.items(), key=lambda item: (self._line_top(item[1]), item[1][0]['left']))
+
+    @staticmethod
+    def _line_top(words: list[dict]) -> int:
+        return min(word['top'] for word in words)
+
+    @staticmethod
+    def _line_bottom(words: list[dict]) -> int:
+        return max(word['top'] + word['height'] for word in words)
+
+    @classmethod
+    def _overlaps(cls, words: list[dict], top: int, bottom: int) -> bool:
+        return cls._line_top(words) < bottom and cls._line_bottom(words) > top
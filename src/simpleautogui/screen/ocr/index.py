@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import numpy as np
+
+from simpleautogui.screen.ocr.result import OcrResult
+
+
+def edit_distance(first: str, second: str, limit: int | None = None) -> int:
+    """
+    Returns the Levenshtein distance between two strings.
+
+    With limit the computation stops as soon as the distance is known to exceed it, and limit + 1 is returned.
+    """
+    if limit is not None and abs(len(first) - len(second)) > limit:
+        return limit + 1
+    if len(first) < len(second):
+        first, second = second, first
+    previous = list(range(len(second) + 1))
+    for row, first_char in enumerate(first, start=1):
+        current = [row]
+        for column, second_char in enumerate(second, start=1):
+            current.append(min(
+                previous[column] + 1,
+                current[column - 1] + 1,
+                previous[column - 1] + (first_char != second_char),
+            ))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class TextIndex:
+    """
+    Word and line index of one OCR result that answers many text queries.
+
+    A query without spaces matches single words, a query with spaces matches text lines containing it.
+    With max_distance words and runs of line words are also matched when they are at most that many edits away.
+    Matches are returned as (n, 4) arrays of left, top, width, height boxes in image coordinates.
+    """
+
+    def __init__(
+            self,
+            result: OcrResult | dict[str, list],
+            min_confidence: int | float = 80,
+            case_sensitive: bool = False
+    ):
+        self.case_sensitive = case_sensitive
+        self.words = OcrResult.from_data(result).words(min_confidence)
+        self.tokens = self.words.text if case_sensitive else np.char.lower(self.words.text)
+        self.line_boxes = self.words.line_boxes()
+        tokens = self.tokens.tolist()
+        self._line_tokens = [[tokens[index] for index in group] for group in self.words.line_groups()]
+        self._line_texts = [' '.join(line) for line in self._line_tokens]
+
+    def normalize(self, value: str) -> str:
+        value = value.strip()
+        return value if self.case_sensitive else value.lower()
+
+    def find(self, query: str, max_distance: int = 0) -> np.ndarray:
+        query = self.normalize(query)
+        if not query or not len(self.words):
+            return np.empty((0, 4), dtype=np.int64)
+
+        if max_distance:
+            unique = np.unique(self.tokens)
+            near = [token for token in unique.tolist() if edit_distance(token, query, max_distance) <= max_distance]
+            words = np.isin(self.tokens, near)
+        else:
+            words = self.tokens == query
+        boxes = self.words.boxes[words]
+
+        if ' ' in query:
+            lines = [
+                query in line_text or bool(max_distance) and self._line_near(line, query, max_distance)
+                for line, line_text in zip(self._line_tokens, self._line_texts)
+            ]
+            boxes = np.concatenate((boxes, self.line_boxes[np.asarray(lines, dtype=bool)]))
+        return boxes
+
+    @staticmethod
+    def _line_near(line: list[str], query: str, max_distance: int) -> bool:
+        size = len(query.split())
+        for start in range(max(len(line) - size + 1, 1)):
+            if edit_distance(' '.join(line[start:start + size]), query, max_distance) <= max_distance:
+                return True
+        return False
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# Kernel of PIL ImageFilter.SHARPEN.
+SHARPEN_KERNEL = np.array([[-2, -2, -2], [-2, 32, -2], [-2, -2, -2]], dtype=np.float32) / 16
+
+
+class Stage(ABC):
+    """
+    One preprocessing step working on uint8 numpy images.
+    """
+
+    @abstractmethod
+    def apply(self, image: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Processes the image into out, or into a new array when out is None, and returns the result.
+
+        out has the shape returned by output_shape and never shares memory with image.
+        """
+
+    def output_shape(self, shape: tuple[int, ...]) -> tuple[int, ...]:
+        return shape
+
+    @property
+    def scale(self) -> float:
+        """
+        Factor by which the stage changes image size.
+        """
+        return 1.0
+
+    def __repr__(self):
+        options = ', '.join(f'{name}={value!r}' for name, value in vars(self).items())
+        return f'{type(self).__name__}({options})'
+
+
+class Grayscale(Stage):
+    def apply(self, image: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        if image.ndim == 2:
+            if out is None:
+                return image.copy()
+            np.copyto(out, image)
+            return out
+        return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY, dst=out)
+
+    def output_shape(self, shape: tuple[int, ...]) -> tuple[int, ...]:
+        return shape[:2]
+
+
+class Scale(Stage):
+    """
+    Resizes by factor, with bicubic interpolation for upscaling and pixel area averaging for downscaling.
+    """
+
+    def __init__(self, factor: int | float, interpolation: int | None = None):
+        if factor <= 0:
+            raise ValueError('factor must be greater than 0.')
+        self.factor = float(factor)
+        self.interpolation = interpolation
+
+    @property
+    def scale(self) -> float:
+        return self.factor
+
+    def output_shape(self, shape: tuple[int, ...]) -> tuple[int, ...]:
+        return (int(shape[0] * self.factor), int(shape[1] * self.factor)) + shape[2:]
+
+    def apply(self, image: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        height, width = self.output_shape(image.shape)[:2]
+        interpolation = self.interpolation
+        if interpolation is None:
+            interpolation = cv2.INTER_CUBIC if self.factor > 1 else cv2.INTER_AREA
+        return cv2.resize(image, (width, height), dst=out, interpolation=interpolation)
+
+
+class Contrast(Stage):
+    """
+    Stretches colors away from the mean gray level like PIL ImageEnhance.Contrast.
+    """
+
+    def __init__(self, factor: int | float):
+        self.factor = float(factor)
+
+    def apply(self, image: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        mean = int(cv2.mean(gray)[0] + 0.5)
+        return cv2.addWeighted(image, self.factor, image, 0, mean * (1 - self.factor), dst=out)
+
+
+class Sharpen(Stage):
+    """
+    Applies the PIL ImageFilter.SHARPEN kernel.
+    """
+
+    def apply(self, image: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        return cv2.filter2D(image, -1, SHARPEN_KERNEL, dst=out, borderType=cv2.BORDER_REPLICATE)
+
+
+class Threshold(Stage):
+    """
+    Binarizes a grayscale image, with Otsu's threshold when value is None.
+    """
+
+    def __init__(self, value: int | None = None, invert: bool = False):
+        self.value = value
+        self.invert = invert
+
+    def output_shape(self, shape: tuple[int, ...]) -> tuple[int, ...]:
+        return shape[:2]
+
+    def apply(self, image: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        mode = cv2.THRESH_BINARY_INV if self.invert else cv2.THRESH_BINARY
+        if self.value is None:
+            mode |= cv2.THRESH_OTSU
+        _, result = cv2.threshold(image, self.value or 0, 255, mode, dst=out)
+        return result
+
+
+class Denoise(Stage):
+    """
+    Removes speckles with a median filter of kernel x kernel pixels.
+    """
+
+    def __init__(self, kernel: int = 3):
+        if kernel < 3 or kernel % 2 == 0:
+            raise ValueError('kernel must be an odd number greater than or equal to 3.')
+        self.kernel = kernel
+
+    def apply(self, image: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        return cv2.medianBlur(image, self.kernel, dst=out)
+
+
+class Pipeline:
+    """
+    Runs stages one after another on numpy buffers.
+
+    Intermediate results are written into scratch buffers kept per thread and reused while the input
+    size stays the same; only the final image is allocated anew, so it can be cached or kept safely.
+    """
+
+    def __init__(self, *stages: Stage):
+        self.stages = stages
+        self._local = threading.local()
+
+    def __repr__(self):
+        return f'Pipeline({", ".join(map(repr, self.stages))})'
+
+    @property
+    def scale(self) -> float:
+        """
+        Factor by which the pipeline changes image size, used to map OCR boxes back to the screen.
+        """
+        scale = 1.0
+        for stage in self.stages:
+            scale *= stage.scale
+        return scale
+
+    def run(self, image: np.ndarray | Image.Image) -> np.ndarray:
+        image = np.asarray(image.convert('RGB') if isinstance(image, Image.Image) else image)
+        if not self.stages:
+            return image.copy()
+        buffers = self._buffers(image.shape)
+        for stage, out in zip(self.stages, buffers):
+            image = stage.apply(image, out)
+        return image
+
+    def __call__(self, image: np.ndarray | Image.Image) -> Image.Image:
+        return Image.fromarray(self.run(image))
+
+    def _buffers(self, input_shape: tuple[int, ...]) -> list[np.ndarray | None]:
+        cached = getattr(self._local, 'buffers', None)
+        if cached is not None and cached[0] == input_shape:
+            return cached[1]
+
+        buffers = []
+        shape = input_shape
+        for stage in self.stages[:-1]:
+            shape = stage.output_shape(shape)
+            # Stage i reads buffer i - 1, so buffer i - 2 is free to be written again.
+            if len(buffers) >= 2 and buffers[-2].shape == shape:
+                buffers.append(buffers[-2])
+            else:
+                buffers.append(np.empty(shape, dtype=np.uint8))
+        buffers.append(None)
+        self._local.buffers = (input_shape, buffers)
+        return buffers
+
+
+PRESETS: dict[str, Pipeline] = {
+    'default': Pipeline(Sharpen()),
+    'ui': Pipeline(Grayscale(), Scale(2), Sharpen()),
+    'small_text': Pipeline(Grayscale(), Scale(3), Contrast(1.5), Sharpen()),
+    'binary': Pipeline(Grayscale(), Scale(2), Denoise(3), Threshold()),
+}
+
+
+def get_pipeline(preprocess: str | Pipeline) -> Pipeline:
+    """
+    Returns the pipeline itself or the preset with the given name.
+    """
+    if isinstance(preprocess, Pipeline):
+        return preprocess
+    try:
+        return PRESETS[preprocess]
+    except KeyError:
+        names = ', '.join(PRESETS)
+        raise ValueError(f'Unknown preprocessing preset {preprocess!r}, expected one of: {names}') from None
+
+
+@lru_cache(maxsize=32)
+def legacy_pipeline(contrast: int | float = 0, resize: int | float = 0, sharpen: bool = True) -> Pipeline:
+    """
+    Builds the pipeline matching the contrast, resize and sharpen arguments of Region OCR methods.
+    """
+    stages = []
+    if resize:
+        stages.append(Scale(resize))
+    if contrast:
+        stages.append(Contrast(contrast))
+    if sharpen:
+        stages.append(Sharpen())
+    return Pipeline(*stages)
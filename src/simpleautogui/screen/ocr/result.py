@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+DATA_COLUMNS = (
+    'level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+    'left', 'top', 'width', 'height', 'conf', 'text',
+)
+
+
+class OcrResult:
+    """
+    Recognized words of one image stored column by column in numpy arrays.
+
+    text holds word strings, conf their confidences, boxes (n, 4) rows of left, top, width, height,
+    and lines (n, 3) rows of block_num, par_num, line_num identifying the text line of every word.
+    Filtering, line grouping and box aggregation run on whole arrays.
+    """
+
+    __slots__ = ('text', 'conf', 'boxes', 'lines')
+
+    def __init__(self, text: np.ndarray, conf: np.ndarray, boxes: np.ndarray, lines: np.ndarray):
+        self.text = np.asarray(text, dtype=str)
+        self.conf = np.asarray(conf, dtype=np.float64)
+        self.boxes = np.asarray(boxes, dtype=np.int64).reshape(-1, 4)
+        self.lines = np.asarray(lines, dtype=np.int64).reshape(-1, 3)
+
+    @classmethod
+    def empty(cls) -> 'OcrResult':
+        return cls(np.empty(0, dtype=str), np.empty(0), np.empty((0, 4)), np.empty((0, 3)))
+
+    @classmethod
+    def from_data(cls, data: dict[str, list] | 'OcrResult') -> 'OcrResult':
+        """
+        Converts a pytesseract.image_to_data Output.DICT result.
+
+        Missing block_num and par_num are treated as 0 and a missing line_num puts every word on its own line.
+        """
+        if isinstance(data, OcrResult):
+            return data
+        count = len(data['text'])
+        if not count:
+            return cls.empty()
+
+        def column(*names, fallback=None):
+            for name in names:
+                if name in data:
+                    return np.asarray(data[name], dtype=np.int64)
+            return fallback
+
+        try:
+            conf = np.asarray(data['conf'], dtype=np.float64)
+        except (TypeError, ValueError):
+            conf = np.array([cls._read_confidence(value) for value in data['conf']], dtype=np.float64)
+        zeros = np.zeros(count, dtype=np.int64)
+        return cls(
+            np.char.strip(np.asarray([str(value) for value in data['text']], dtype=str)),
+            conf,
+            np.column_stack((column('left'), column('top'), column('width', 'w'), column('height', 'h'))),
+            np.column_stack((
+                column('block_num', fallback=zeros),
+                column('par_num', fallback=zeros),
+                column('line_num', fallback=np.arange(count, dtype=np.int64)),
+            )),
+        )
+
+    @classmethod
+    def concat(cls, results: Sequence['OcrResult'], offsets: Sequence[tuple[int, int]] | None = None) -> 'OcrResult':
+        """
+        Joins results of several crops, moving boxes by their (x, y) offsets.
+
+        Block numbers are renumbered, so lines of different results never share a (block, par, line) key.
+        """
+        results = [result for result in results]
+        if offsets is None:
+            offsets = [(0, 0)] * len(results)
+        parts = [(result, offset) for result, offset in zip(results, offsets) if len(result)]
+        if not parts:
+            return cls.empty()
+
+        boxes, lines = [], []
+        next_block = 1
+        for result, (x, y) in parts:
+            boxes.append(result.boxes + np.array([x, y, 0, 0], dtype=np.int64))
+            blocks, inverse = np.unique(result.lines[:, 0], return_inverse=True)
+            part_lines = result.lines.copy()
+            part_lines[:, 0] = inverse.reshape(-1) + next_block
+            next_block += len(blocks)
+            lines.append(part_lines)
+        return cls(
+            np.concatenate([result.text for result, _ in parts]),
+            np.concatenate([result.conf for result, _ in parts]),
+            np.concatenate(boxes),
+            np.concatenate(lines),
+        )
+
+    def __len__(self):
+        return len(self.text)
+
+    def __str__(self):
+        return f'OcrResult(words={len(self)}, lines={self.line_ids()[1]})'
+
+    def __repr__(self):
+        return self.__str__()
+
+    @property
+    def nbytes(self) -> int:
+        return self.text.nbytes + self.conf.nbytes + self.boxes.nbytes + self.lines.nbytes
+
+    @property
+    def string(self) -> str:
+        """
+        Text of the result, one line per text line.
+        """
+        return '\n'.join(text for text in self.line_texts() if text)
+
+    def filter(self, mask: np.ndarray) -> 'OcrResult':
+        return OcrResult(self.text[mask], self.conf[mask], self.boxes[mask], self.lines[mask])
+
+    def words(self, min_confidence: int | float = -np.inf) -> 'OcrResult':
+        """
+        Returns non-empty words with at least min_confidence.
+        """
+        return self.filter((np.char.str_len(self.text) > 0) & (self.conf >= min_confidence))
+
+    def offset(self, x: int = 0, y: int = 0) -> 'OcrResult':
+        return OcrResult(self.text, self.conf, self.boxes + np.array([x, y, 0, 0], dtype=np.int64), self.lines)
+
+    def line_ids(self) -> tuple[np.ndarray, int]:
+        """
+        Returns the line number of every word, counted in order of first appearance, and the number of lines.
+        """
+        if not len(self):
+            return np.empty(0, dtype=np.intp), 0
+        _, first, inverse = np.unique(self.lines, axis=0, return_index=True, return_inverse=True)
+        rank = np.empty(len(first), dtype=np.intp)
+        rank[np.argsort(first, kind='stable')] = np.arange(len(first))
+        return rank[inverse.reshape(-1)], len(first)
+
+    def line_groups(self) -> list[np.ndarray]:
+        """
+        Returns word indices of every line, lines in order of first appearance.
+        """
+        ids, count = self.line_ids()
+        order = np.argsort(ids, kind='stable')
+        return np.split(order, np.flatnonzero(np.diff(ids[order])) + 1) if count else []
+
+    def line_boxes(self) -> np.ndarray:
+        """
+        Returns (lines, 4) bounding boxes of lines, lines in order of first appearance.
+        """
+        ids, count = self.line_ids()
+        if not count:
+            return np.empty((0, 4), dtype=np.int64)
+        order = np.argsort(ids, kind='stable')
+        starts = np.flatnonzero(np.r_[True, np.diff(ids[order]) != 0])
+        boxes = self.boxes[order]
+        left = np.minimum.reduceat(boxes[:, 0], starts)
+        top = np.minimum.reduceat(boxes[:, 1], starts)
+        right = np.maximum.reduceat(boxes[:, 0] + boxes[:, 2], starts)
+        bottom = np.maximum.reduceat(boxes[:, 1] + boxes[:, 3], starts)
+        return np.column_stack((left, top, right - left, bottom - top))
+
+    def line_texts(self) -> list[str]:
+        words = self.text.tolist()
+        return [' '.join(words[index] for index in group if words[index]) for group in self.line_groups()]
+
+    def to_data(self) -> dict[str, list]:
+        """
+        Converts the result back to the pytesseract.image_to_data Output.DICT layout.
+        """
+        columns = {
+            'level': [5] * len(self),
+            'page_num': [1] * len(self),
+            'block_num': self.lines[:, 0].tolist(),
+            'par_num': self.lines[:, 1].tolist(),
+            'line_num': self.lines[:, 2].tolist(),
+            'word_num': list(range(1, len(self) + 1)),
+            'left': self.boxes[:, 0].tolist(),
+            'top': self.boxes[:, 1].tolist(),
+            'width': self.boxes[:, 2].tolist(),
+            'height': self.boxes[:, 3].tolist(),
+            'conf': self.conf.tolist(),
+            'text': self.text.tolist(),
+        }
+        return {column: columns[column] for column in DATA_COLUMNS}
+
+    @staticmethod
+    def _read_confidence(value) -> float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return -1
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+from PIL import Image
+
+from simpleautogui.screen.cancel import OperationCancelled, check_cancelled, get_cancel_event, wait_future
+from simpleautogui.screen.ocr.engines import OcrEngine, OcrEnginePool, default_engine_factory
+from simpleautogui.screen.ocr.result import OcrResult
+
+_worker_pool: OcrEnginePool | None = None
+
+
+def _init_worker(factory: Callable[[str], OcrEngine]) -> None:
+    global _worker_pool
+    _worker_pool = OcrEnginePool(factory, max_workers=1, cache=False)
+
+
+def _recognize_tile(image: Image.Image, lang: str, options: dict) -> OcrResult:
+    return _worker_pool.result(image, lang=lang, **options)
+
+
+def split_bands(height: int, count: int, overlap: int) -> list[tuple[int, int, int, int]]:
+    """
+    Splits image rows into count overlapping bands.
+
+    Returns (top, bottom, core_top, core_bottom) per band. Cores do not overlap and cover all rows,
+    every core lies overlap // 2 rows away from the inner edges of its band.
+    """
+    count = max(1, min(count, height))
+    bounds = [round(height * index / count) for index in range(count + 1)]
+    bands = []
+    for index in range(count):
+        core_top, core_bottom = bounds[index], bounds[index + 1]
+        top = max(core_top - overlap // 2, 0)
+        bottom = min(core_bottom + overlap // 2, height)
+        bands.append((top, bottom, core_top, core_bottom))
+    return bands
+
+
+class TiledOcr:
+    """
+    Recognizes large images as overlapping horizontal bands in a process pool.
+
+    Every worker process keeps its own warm engine. Bands span the full width, so text lines are never cut
+    horizontally, and a word is kept only by the band whose core contains its vertical center, which removes
+    duplicates from the overlaps. overlap should be at least twice the height of the tallest text line.
+
+    Inside cancel_scope a set event cancels bands that have not started and abandons running ones:
+    the call raises OperationCancelled at once, and the busy worker processes are shut down after they finish.
+    """
+
+    def __init__(
+            self,
+            max_workers: int | None = None,
+            overlap: int = 96,
+            min_band_height: int = 256,
+            factory: Callable[[str], OcrEngine] | None = None
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        if self.max_workers <= 0:
+            raise ValueError('max_workers must be greater than 0.')
+        if overlap < 0:
+            raise ValueError('overlap must be greater than or equal to 0.')
+        self.overlap = overlap
+        self.min_band_height = min_band_height
+        self.factory = factory or default_engine_factory()
+        self._local_pool = OcrEnginePool(self.factory, max_workers=1, cache=False)
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def result(self, image: Image.Image, lang: str = 'eng+rus', **options) -> OcrResult:
+        """
+        Returns words of the whole image in image coordinates.
+
+        Block numbers are renumbered across bands, so (block_num, par_num, line_num) stays unique per line.
+        """
+        count = min(self.max_workers, max(image.height // self.min_band_height, 1))
+        bands = split_bands(image.height, count, self.overlap)
+        crops = [image.crop((0, top, image.width, bottom)) for top, bottom, _, _ in bands]
+        if len(crops) == 1:
+            results = [self._local_pool.result(crops[0], lang=lang, **options)]
+        else:
+            results = self._recognize_bands(crops, lang, options)
+
+        owned = []
+        for (top, _, core_top, core_bottom), result in zip(bands, results):
+            centers = top + result.boxes[:, 1] + result.boxes[:, 3] / 2
+            owned.append(result.filter((centers >= core_top) & (centers < core_bottom)))
+        return OcrResult.concat(owned, [(0, top) for top, _, _, _ in bands])
+
+    def string(self, image: Image.Image, lang: str = 'eng+rus', **options) -> str:
+        """
+        Returns the text of the whole image, one line per recognized text line.
+        """
+        return self.result(image, lang=lang, **options).string
+
+    def _recognize_bands(self, crops: list[Image.Image], lang: str, options: dict) -> list[OcrResult]:
+        cancel = get_cancel_event()
+        check_cancelled(cancel)
+        executor = self._pool()
+        futures = [executor.submit(_recognize_tile, crop, lang, options) for crop in crops]
+        try:
+            return [wait_future(future, cancel) for future in futures]
+        except OperationCancelled:
+            self._abandon(executor)
+            raise
+
+    def _abandon(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        self._local_pool.close()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    self.max_workers, initializer=_init_worker, initargs=(self.factory,)
+                )
+            return self._executor
+
+
+_tiled: TiledOcr | None = None
+_tiled_lock = threading.Lock()
+
+
+def get_tiled_ocr() -> TiledOcr:
+    global _tiled
+    if _tiled is None:
+        with _tiled_lock:
+            if _tiled is None:
+                _tiled = TiledOcr()
+    return _tiled
+
+
+def set_tiled_ocr(tiled: TiledOcr | None) -> None:
+    """
+    Replaces the tiled recognizer used by Region OCR methods with tiled=True. None restores the default.
+    """
+    global _tiled
+    with _tiled_lock:
+        previous, _tiled = _tiled, tiled
+    if previous is not None and previous is not tiled:
+        previous.close()
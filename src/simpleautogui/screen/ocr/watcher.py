@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import threading
+from time import monotonic
+from typing import TYPE_CHECKING, NamedTuple
+
+from simpleautogui.screen.cancel import (
+    CANCEL_POLL_INTERVAL, OperationCancelled, cancel_scope, check_cancelled, get_cancel_event
+)
+from simpleautogui.screen.changes import TileChangeTracker
+from simpleautogui.screen.frames import get_frame_source
+from simpleautogui.screen.metrics import get_metrics, span, use_metrics
+from simpleautogui.screen.ocr.engines import OcrEnginePool, get_ocr_pool
+from simpleautogui.screen.ocr.incremental import IncrementalOcr
+from simpleautogui.screen.ocr.preprocess import Pipeline, get_pipeline, legacy_pipeline
+from simpleautogui.screen.ocr.result import OcrResult
+
+if TYPE_CHECKING:
+    from simpleautogui.screen.classes.base import Region
+
+
+class WatchedText(NamedTuple):
+    """
+    OCR result published by OcrWatcher.
+
+    timestamp is the monotonic time of the capture the result describes, and scale maps
+    result boxes back to the region like in Region OCR methods.
+    """
+    result: OcrResult
+    timestamp: float
+    scale: float
+
+
+class OcrWatcher:
+    """
+    Recognizes text of a region on a background thread and publishes the latest result.
+
+    The region is captured every interval seconds from the frame source active when the watcher was created.
+    Unchanged captures only refresh the timestamp of the previous result, and with incremental=True changed
+    captures recognize only changed text lines. Waits read latest instead of running OCR themselves.
+    stop abandons a recognition in progress instead of waiting for it.
+    """
+
+    def __init__(
+            self,
+            region: 'Region',
+            lang: str = 'eng+rus',
+            interval: int | float = 0.1,
+            contrast: int | float = 0,
+            resize: int | float = 0,
+            sharpen: bool = True,
+            preprocess: str | Pipeline | None = None,
+            incremental: bool = True,
+            pool: OcrEnginePool | None = None,
+            **options
+    ):
+        if interval < 0:
+            raise ValueError('interval must be greater than or equal to 0.')
+        self.region = region
+        self.lang = lang
+        self.interval = float(interval)
+        self.pipeline = get_pipeline(preprocess) if preprocess is not None else legacy_pipeline(
+            contrast, resize, bool(sharpen)
+        )
+        self.pool = pool
+        self.options = options
+        self.updates = 0
+        self.error: Exception | None = None
+        self._incremental = IncrementalOcr(lang, pool=pool, **options) if incremental else None
+        self._source = get_frame_source()
+        self._metrics = get_metrics()
+        self._changes = TileChangeTracker()
+        self._latest: WatchedText | None = None
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> 'OcrWatcher':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def latest(self) -> WatchedText | None:
+        """
+        The most recent result, or None before the first recognition. Raises the error that stopped the watcher.
+        """
+        if self.error is not None:
+            raise self.error
+        return self._latest
+
+    def start(self) -> 'OcrWatcher':
+        if not self.is_running:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='simpleautogui-ocr-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: int | float | None = None) -> None:
+        """
+        Stops the thread, abandoning the current recognition; waits for it up to timeout seconds.
+        """
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def wait_update(self, after: float | None = None, timeout: int | float | None = None) -> WatchedText | None:
+        """
+        Blocks until a result captured later than after is published and returns it, or None on timeout.
+
+        Inside cancel_scope it raises OperationCancelled once the cancel event is set.
+        """
+        cancel = get_cancel_event()
+        deadline = None if timeout is None else monotonic() + timeout
+        with self._condition:
+            while True:
+                latest = self.latest
+                if latest is not None and (after is None or latest.timestamp > after):
+                    return latest
+                check_cancelled(cancel)
+                remaining = None if deadline is None else deadline - monotonic()
+                if remaining is not None and remaining <= 0 or not self.is_running:
+                    return None
+                if cancel is not None:
+                    remaining = CANCEL_POLL_INTERVAL if remaining is None else min(remaining, CANCEL_POLL_INTERVAL)
+                self._condition.wait(remaining)
+
+    def _run(self) -> None:
+        try:
+            with cancel_scope(self._stop_event), use_metrics(self._metrics):
+                while not self._stop_event.is_set():
+                    started = monotonic()
+                    self._poll(started)
+                    self._stop_event.wait(max(self.interval - (monotonic() - started), 0))
+        except OperationCancelled:
+            pass
+        except Exception as error:
+            self.error = error
+        finally:
+            with self._condition:
+                self._condition.notify_all()
+
+    def _poll(self, captured: float) -> None:
+        with span('capture'):
+            frame = self._source.grab(self.region.to_tuple())
+        previous = self._latest
+        if self._changes.update(frame) is None and previous is not None:
+            result, scale = previous.result, previous.scale
+        else:
+            image = self.pipeline(frame)
+            scale = self.pipeline.scale
+            with span('ocr'):
+                if self._incremental is not None:
+                    result = self._incremental.update(image)
+                else:
+                    result = (self.pool or get_ocr_pool()).result(image, lang=self.lang, **self.options)
+        with self._condition:
+            self._latest = WatchedText(result, captured, scale)
+            self.updates += 1
+            self._condition.notify_all()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import AsyncIterator, Callable, Iterator
+
+from simpleautogui.screen.metrics import get_metrics
+
+
+class PollStrategy(ABC):
+    """
+    Decides how long a wait sleeps between polls.
+    """
+
+    @abstractmethod
+    def interval(self, poll: int, elapsed: float) -> float:
+        """
+        Returns seconds between the start of the given poll and the next one.
+
+        :param poll: Number of polls done so far, starting from 1.
+        :param elapsed: Seconds since the wait started.
+        """
+
+    def record(self, latency: float | None) -> None:
+        """
+        Receives the time after which the awaited object appeared, or None on timeout.
+        """
+
+
+class FixedInterval(PollStrategy):
+    def __init__(self, interval: int | float = 0.1):
+        if interval < 0:
+            raise ValueError('interval must be greater than or equal to 0.')
+        self._interval = float(interval)
+
+    def interval(self, poll: int, elapsed: float) -> float:
+        return self._interval
+
+
+class ExponentialBackoff(PollStrategy):
+    """
+    Polls quickly at first and multiplies the interval by factor after every poll up to max_interval.
+    """
+
+    def __init__(self, initial: int | float = 0.02, factor: int | float = 2, max_interval: int | float = 1):
+        if initial <= 0 or factor < 1 or max_interval < initial:
+            raise ValueError('Expected 0 < initial <= max_interval and factor >= 1.')
+        self.initial = float(initial)
+        self.factor = float(factor)
+        self.max_interval = float(max_interval)
+
+    def interval(self, poll: int, elapsed: float) -> float:
+        return min(self.initial * self.factor ** (poll - 1), self.max_interval)
+
+
+class LearnedInterval(PollStrategy):
+    """
+    Learns when the awaited object usually appears and polls rarely before that moment.
+
+    Until the earliest recently seen appearance time the interval is max_interval, after it
+    the wait polls every min_interval. Reuse one instance for the same wait to accumulate history.
+    """
+
+    def __init__(self, min_interval: int | float = 0.02, max_interval: int | float = 0.5, history: int = 32):
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError('Expected 0 < min_interval <= max_interval.')
+        self.min_interval = float(min_interval)
+        self.max_interval = float(max_interval)
+        self.latencies = deque(maxlen=history)
+
+    def interval(self, poll: int, elapsed: float) -> float:
+        if not self.latencies:
+            return self.min_interval
+        expected = min(self.latencies)
+        if elapsed >= expected:
+            return self.min_interval
+        return min(max(expected - elapsed, self.min_interval), self.max_interval)
+
+    def record(self, latency: float | None) -> None:
+        if latency is not None:
+            self.latencies.append(latency)
+
+
+class Poller:
+    """
+    Iterates over the polls of one wait on a monotonic clock.
+
+    The first poll happens immediately. Later polls are scheduled from the start of the previous
+    poll, so matching time is not added to the interval, and sleeping never goes past the deadline:
+    the last poll happens at the deadline at the latest. A poll that overran its interval is followed
+    by sleep(0), so a sleep that watches for a stop request is consulted after every poll.
+
+    ``async for`` runs the same schedule when sleep is a coroutine function such as asyncio.sleep.
+    With active metrics a finished wait records its duration as the wait span and counts polls, hits and misses.
+    """
+
+    def __init__(
+            self,
+            timeout: int | float,
+            interval: int | float = 0.1,
+            strategy: PollStrategy | None = None,
+            sleep: Callable[[float], object] = time.sleep,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        if timeout < 0:
+            raise ValueError('timeout must be greater than or equal to 0.')
+        self.timeout = float(timeout)
+        self.strategy = strategy or FixedInterval(interval)
+        self.polls = 0
+        self.elapsed = 0.0
+        self._sleep = sleep
+        self._clock = clock
+        self._start: float | None = None
+        self._metrics = None
+
+    def __iter__(self) -> Iterator[int]:
+        deadline = self._begin()
+        while True:
+            poll_start = self._clock()
+            self.polls += 1
+            yield self.polls
+
+            pause = self._pause(poll_start, deadline)
+            if pause is None:
+                return
+            self._sleep(pause)
+
+    async def __aiter__(self) -> AsyncIterator[int]:
+        deadline = self._begin()
+        while True:
+            poll_start = self._clock()
+            self.polls += 1
+            yield self.polls
+
+            pause = self._pause(poll_start, deadline)
+            if pause is None:
+                return
+            await self._sleep(pause)
+
+    @property
+    def expired(self) -> bool:
+        """
+        Whether the deadline has passed, so the current poll is the last one.
+        """
+        return self._start is not None and self._clock() >= self._start + self.timeout
+
+    def found(self) -> None:
+        """
+        Tells the strategy that the awaited object appeared on the current poll.
+        """
+        self.elapsed = self._clock() - self._start
+        self.strategy.record(self.elapsed)
+        self._record('hits')
+
+    def _begin(self) -> float:
+        self._metrics = get_metrics()
+        self._start = self._clock()
+        return self._start + self.timeout
+
+    def _pause(self, poll_start: float, deadline: float) -> float | None:
+        """
+        Returns seconds to sleep before the next poll, or None when the deadline is reached.
+        """
+        now = self._clock()
+        self.elapsed = now - self._start
+        if now >= deadline:
+            self.strategy.record(None)
+            self._record('misses')
+            return None
+        wake = min(poll_start + self.strategy.interval(self.polls, self.elapsed), deadline)
+        return max(wake - now, 0)
+
+    def _record(self, outcome: str) -> None:
+        if self._metrics is not None:
+            self._metrics.observe('wait', self.elapsed * 1000)
+            self._metrics.count('polls', self.polls)
+            self._metrics.count(outcome)
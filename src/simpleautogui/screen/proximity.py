@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import numpy as np
+
+_ROW = 1 << 32
+
+
+def proximity_filter(coordinates, proximity_threshold_px: int) -> np.ndarray:
+    """
+    Returns indices of coordinates kept by greedy proximity filtering.
+
+    Coordinates are visited in order, and one is kept when no already kept coordinate lies within
+    proximity_threshold_px on both axes. Kept coordinates are stored in a grid hash with cells of
+    proximity_threshold_px + 1 pixels, so each cell holds at most one of them and every check looks at
+    nine cells only, which makes the filter linear in the number of coordinates.
+
+    :param coordinates: Sequence or array of (x, y) pairs.
+    :param proximity_threshold_px: Maximal distance on each axis treated as a duplicate.
+    """
+    if proximity_threshold_px < 0:
+        raise ValueError('proximity_threshold_px must be greater than or equal to 0.')
+    coordinates = np.asarray(coordinates, dtype=np.int64).reshape(-1, 2)
+    cells = np.floor_divide(coordinates, proximity_threshold_px + 1)
+    keys = (cells[:, 0] * _ROW + cells[:, 1]).tolist()
+
+    kept_cells: dict[int, tuple[int, int]] = {}
+    kept = []
+    neighbours = [dx * _ROW + dy for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+    for index, (key, (x, y)) in enumerate(zip(keys, coordinates.tolist())):
+        if key in kept_cells:
+            continue
+        for offset in neighbours:
+            saved = kept_cells.get(key + offset)
+            if (
+                    saved is not None
+                    and abs(x - saved[0]) <= proximity_threshold_px
+                    and abs(y - saved[1]) <= proximity_threshold_px
+            ):
+                break
+        else:
+            kept_cells[key] = (x, y)
+            kept.append(index)
+    return np.asarray(kept, dtype=np.intp)
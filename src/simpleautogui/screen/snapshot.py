@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from time import monotonic
+from typing import Iterable
+
+import numpy as np
+
+from simpleautogui.screen.classes.base import Point, PointSet, Region, RegionSet
+from simpleautogui.screen.colors import Blob
+from simpleautogui.screen.frames import FrameSource, crop_frame, get_frame_source, use_frame_source
+from simpleautogui.screen.metrics import span
+from simpleautogui.screen.templates import TemplateLike
+
+
+class ScreenSnapshot(FrameSource):
+    """
+    One capture of the bounding box of several regions.
+
+    Every region is served as a zero-copy numpy view of that capture, and checks on the
+    snapshot run the usual Region methods against it, so checking many small regions costs
+    one grab. The snapshot is also a FrameSource: inside ``with use_frame_source(snapshot)``
+    any Region capture is served from it.
+    """
+
+    def __init__(
+            self,
+            regions: Iterable[Region | tuple[int, int, int, int]],
+            source: FrameSource | None = None
+    ):
+        boxes = [region.to_tuple() if isinstance(region, Region) else tuple(region) for region in regions]
+        if not boxes:
+            raise ValueError('At least one region must be provided.')
+        left = min(x for x, _, _, _ in boxes)
+        top = min(y for _, y, _, _ in boxes)
+        right = max(x + w for x, _, w, _ in boxes)
+        bottom = max(y + h for _, y, _, h in boxes)
+        self.bbox = (left, top, right - left, bottom - top)
+        with span('capture'):
+            self.frame = (source or get_frame_source()).grab(self.bbox)
+        self.timestamp = monotonic()
+
+    def __str__(self):
+        x, y, w, h = self.bbox
+        return f'ScreenSnapshot(x={x}, y={y}, w={w}, h={h})'
+
+    def __repr__(self):
+        return self.__str__()
+
+    def grab(self, bbox: tuple[int, int, int, int]) -> np.ndarray:
+        return crop_frame(self.frame, bbox, self.bbox[:2])
+
+    def view(self, region: Region) -> np.ndarray:
+        """
+        Returns the region pixels as a view of the snapshot, without copying.
+        """
+        return self.grab(region.to_tuple())
+
+    def find_color(self, region: Region, color, confidence: float = 0.9) -> Point | None:
+        with use_frame_source(self):
+            return region.wait_color(color, timeout=0, confidence=confidence)
+
+    def find_colors(self, region: Region, color, confidence: float = 0.9, **kwargs) -> PointSet | None:
+        with use_frame_source(self):
+            return region.wait_colors(color, timeout=0, confidence=confidence, **kwargs)
+
+    def find_blobs(self, region: Region, color, confidence: float = 0.9, **kwargs) -> list[Blob]:
+        with use_frame_source(self):
+            return region.wait_blobs(color, timeout=0, confidence=confidence, **kwargs)
+
+    def find_image(
+            self,
+            region: Region,
+            paths: TemplateLike | tuple[TemplateLike, ...] | list[TemplateLike],
+            confidence: float = 0.9,
+            **kwargs
+    ) -> Region | None:
+        with use_frame_source(self):
+            return region.wait_image(paths, timeout=0, confidence=confidence, **kwargs)
+
+    def find_images(
+            self,
+            region: Region,
+            paths: TemplateLike | tuple[TemplateLike, ...] | list[TemplateLike],
+            confidence: float = 0.9,
+            **kwargs
+    ) -> RegionSet:
+        with use_frame_source(self):
+            return region.wait_images(paths, timeout=0, confidence=confidence, **kwargs)
+
+    def text(self, region: Region, **kwargs) -> str:
+        with use_frame_source(self):
+            return region.text(**kwargs)
+
+    def find_text(self, region: Region, text: str, **kwargs) -> RegionSet:
+        with use_frame_source(self):
+            return region.find_text(text, **kwargs)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable
+
+import cv2
+import numpy as np
+from PIL import Image
+
+
+class Template:
+    """
+    Template image decoded once and kept in memory as RGB and grayscale arrays.
+    """
+
+    def __init__(self, image: np.ndarray, name: str = '<array>', path: str | None = None, mtime: int | None = None):
+        if image.ndim != 3 or image.shape[2] != 3:
+            raise ValueError(f'Template must be an RGB array with shape (h, w, 3): {image.shape}')
+        self.color = np.ascontiguousarray(image, dtype=np.uint8)
+        self.name = name
+        self.path = path
+        self.mtime = mtime
+        self._gray = None
+        self._scaled: dict[int, np.ndarray] = {}
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return f'Template(name={self.name!r}, w={self.width}, h={self.height})'
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> 'Template':
+        path = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+        with Image.open(path) as image:
+            return cls(np.asarray(image.convert('RGB')), name=path, path=path, mtime=mtime)
+
+    @classmethod
+    def from_array(cls, image: np.ndarray | Image.Image, name: str = '<array>') -> 'Template':
+        if isinstance(image, Image.Image):
+            image = np.asarray(image.convert('RGB'))
+        return cls(np.array(image, dtype=np.uint8), name=name)
+
+    @property
+    def gray(self) -> np.ndarray:
+        if self._gray is None:
+            self._gray = cv2.cvtColor(self.color, cv2.COLOR_RGB2GRAY)
+        return self._gray
+
+    def scaled(self, level: int) -> np.ndarray:
+        """
+        Returns the RGB template downscaled by 2 ** level, cached per level.
+        """
+        if level <= 0:
+            return self.color
+        if level not in self._scaled:
+            factor = 2 ** level
+            size = (max(self.width // factor, 1), max(self.height // factor, 1))
+            self._scaled[level] = cv2.resize(self.color, size, interpolation=cv2.INTER_AREA)
+        return self._scaled[level]
+
+    @property
+    def width(self) -> int:
+        return self.color.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.color.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        scaled = sum(image.nbytes for image in self._scaled.values())
+        return self.color.nbytes + (self._gray.nbytes if self._gray is not None else 0) + scaled
+
+
+TemplateLike = str | Path | Template
+
+
+class TemplateRegistry:
+    """
+    LRU cache of decoded templates keyed by absolute path.
+
+    Cached templates are reloaded when the file modification time changes, and the least
+    recently used ones are evicted when the decoded size exceeds max_bytes.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        if max_bytes <= 0:
+            raise ValueError('max_bytes must be greater than 0.')
+        self.max_bytes = max_bytes
+        self._templates: OrderedDict[str, Template] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._templates)
+
+    def __contains__(self, path: str | Path) -> bool:
+        return os.path.abspath(path) in self._templates
+
+    @property
+    def nbytes(self) -> int:
+        return sum(template.nbytes for template in self._templates.values())
+
+    def get(self, template: TemplateLike) -> Template:
+        """
+        Returns a decoded template for a path, loading it only if it is not cached or changed on disk.
+        """
+        if isinstance(template, Template):
+            return template
+
+        path = os.path.abspath(template)
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            cached = self._templates.get(path)
+            if cached is not None and cached.mtime == mtime:
+                self._templates.move_to_end(path)
+                return cached
+
+        loaded = Template.from_file(path)
+        with self._lock:
+            self._templates[path] = loaded
+            self._templates.move_to_end(path)
+            self._evict()
+        return loaded
+
+    def load(self, templates: Iterable[TemplateLike]) -> list[Template]:
+        return [self.get(template) for template in templates]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+
+    def _evict(self) -> None:
+        total = self.nbytes
+        while total > self.max_bytes and len(self._templates) > 1:
+            _, template = self._templates.popitem(last=False)
+            total -= template.nbytes
+
+
+_registry = TemplateRegistry()
+
+
+def get_template_registry() -> TemplateRegistry:
+    return _registry
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from time import monotonic, time
+from typing import Any, Iterator, TypeVar
+
+import numpy as np
+
+from simpleautogui.screen.changes import TileChangeTracker
+from simpleautogui.screen.frames import FrameSource, crop_frame, get_frame_source
+
+T = TypeVar('T')
+
+TRACE_VERSION = 1
+FRAMES_FILE = 'frames.bin'
+EVENTS_FILE = 'events.jsonl'
+
+
+class TraceRecorder(FrameSource):
+    """
+    Records frames grabbed through it, input actions and wait results into a trace directory.
+
+    Frames are stored per grabbed area: every keyframe_interval-th frame of an area is stored whole,
+    the others only as the changed tiles against the previous frame of that area, and unchanged
+    frames take no space. Pixels go raw into frames.bin, so Trace reads them through a memory map;
+    events.jsonl lists frames, actions and waits in recording order. An existing trace at path is replaced.
+    """
+
+    def __init__(
+            self,
+            path: str | Path,
+            source: FrameSource | None = None,
+            keyframe_interval: int = 100,
+            tile_size: int = 32
+    ):
+        if keyframe_interval <= 0:
+            raise ValueError('keyframe_interval must be greater than 0.')
+        self.path = Path(path)
+        self.source = source or get_frame_source()
+        self.keyframe_interval = keyframe_interval
+        self.tile_size = tile_size
+        self.frames = 0
+        self.bytes = 0
+        self._trackers: dict[tuple[int, int, int, int], TileChangeTracker] = {}
+        self._counts: dict[tuple[int, int, int, int], int] = defaultdict(int)
+        self._last: dict[tuple[int, int, int, int], int] = {}
+        self._lock = threading.Lock()
+        self._start = monotonic()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._pixels = (self.path / FRAMES_FILE).open('wb')
+        self._events = (self.path / EVENTS_FILE).open('w', encoding='utf-8')
+        self._write({'type': 'trace', 'version': TRACE_VERSION, 'started': time()})
+
+    def __enter__(self) -> 'TraceRecorder':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._events.closed
+
+    def grab(self, bbox: tuple[int, int, int, int]) -> np.ndarray:
+        frame = self.source.grab(bbox)
+        self.record_frame(bbox, frame)
+        return frame
+
+    def record_frame(self, bbox: tuple[int, int, int, int], frame: np.ndarray) -> None:
+        bbox = tuple(int(value) for value in bbox)
+        with self._lock:
+            if self.closed:
+                return
+            count = self._counts[bbox]
+            tracker = self._trackers.setdefault(bbox, TileChangeTracker(self.tile_size))
+            key = count % self.keyframe_interval == 0
+            if key:
+                tracker.reset()
+            patch = tracker.update(frame)
+            event = {
+                'type': 'frame',
+                'time': self._elapsed(),
+                'bbox': list(bbox),
+                'shape': list(frame.shape),
+                'previous': None if key else self._last[bbox],
+                'offset': self.bytes,
+                'patch': None if patch is None else list(patch),
+            }
+            if patch is not None:
+                x, y, w, h = patch
+                data = np.ascontiguousarray(frame[y:y + h, x:x + w], dtype=np.uint8)
+                self._pixels.write(data.tobytes())
+                self.bytes += data.nbytes
+            self._write(event)
+            self._counts[bbox] = count + 1
+            self._last[bbox] = self.frames
+            self.frames += 1
+
+    def record(self, kind: str, **data: Any) -> None:
+        """
+        Records an event such as an input action or a wait result; values are stored as plain JSON data.
+        """
+        with self._lock:
+            if not self.closed:
+                event = {key: plain(value) for key, value in data.items()}
+                self._write({'type': kind, 'time': self._elapsed(), **event})
+
+    def close(self) -> None:
+        with self._lock:
+            if not self.closed:
+                self._pixels.close()
+                self._events.close()
+
+    def _elapsed(self) -> float:
+        return monotonic() - self._start
+
+    def _write(self, event: dict) -> None:
+        self._events.write(json.dumps(event) + '\n')
+
+
+class Trace:
+    """
+    Reads a trace directory written by TraceRecorder.
+
+    Pixels are memory-mapped, so keyframes are served without copying and opening a long trace is cheap.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with (self.path / EVENTS_FILE).open(encoding='utf-8') as file:
+            self.events = [json.loads(line) for line in file if line.strip()]
+        if not self.events or self.events[0].get('type') != 'trace':
+            raise ValueError(f'{self.path} is not a simpleautogui trace.')
+        if self.events[0]['version'] != TRACE_VERSION:
+            raise ValueError(f'Unsupported trace version: {self.events[0]["version"]}.')
+        self.frames = [event for event in self.events if event['type'] == 'frame']
+        pixels = self.path / FRAMES_FILE
+        self._pixels = np.memmap(pixels, dtype=np.uint8, mode='r') if pixels.stat().st_size else np.empty(0, np.uint8)
+        self._decoded: dict[tuple[int, int, int, int], tuple[int, np.ndarray]] = {}
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def actions(self) -> list[dict]:
+        """
+        Recorded events other than frames and waits, such as clicks and mouse moves.
+        """
+        return [event for event in self.events[1:] if event['type'] not in ('frame', 'wait')]
+
+    @property
+    def waits(self) -> list[dict]:
+        return [event for event in self.events if event['type'] == 'wait']
+
+    def frame(self, index: int) -> np.ndarray:
+        """
+        Returns the recorded frame with the given index as a read-only RGB array.
+        """
+        event = self.frames[index]
+        bbox = tuple(event['bbox'])
+        cached = self._decoded.get(bbox)
+        chain = []
+        position = index
+        while position is not None and (cached is None or cached[0] != position):
+            chain.append(position)
+            position = self.frames[position]['previous']
+        frame = cached[1] if position is not None else None
+        for position in reversed(chain):
+            frame = self._apply(self.frames[position], frame)
+        self._decoded[bbox] = (index, frame)
+        return frame
+
+    def frame_source(self) -> 'TraceFrameSource':
+        return TraceFrameSource(self)
+
+    def _apply(self, event: dict, previous: np.ndarray | None) -> np.ndarray:
+        patch = event['patch']
+        if patch is None:
+            return previous
+        x, y, w, h = patch
+        data = np.asarray(self._pixels[event['offset']:event['offset'] + w * h * 3]).reshape(h, w, 3)
+        if previous is None:
+            return data
+        frame = previous.copy()
+        frame[y:y + h, x:x + w] = data
+        frame.flags.writeable = False
+        return frame
+
+
+class TraceFrameSource(FrameSource):
+    """
+    Replays the frames of a trace, so waits of a recorded session run again without a display.
+
+    Every grab of an area returns the next frame recorded for that area, and the last one once they run out,
+    so a macro that grabs the same areas in the same order sees exactly the recorded screen.
+    Areas that were not recorded are cut out of the next frame of the smallest recorded area containing them.
+    """
+
+    def __init__(self, trace: Trace | str | Path):
+        self.trace = trace if isinstance(trace, Trace) else Trace(trace)
+        self._streams: dict[tuple[int, int, int, int], list[int]] = defaultdict(list)
+        for index, event in enumerate(self.trace.frames):
+            self._streams[tuple(event['bbox'])].append(index)
+        self._positions: dict[tuple[int, int, int, int], int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def grab(self, bbox: tuple[int, int, int, int]) -> np.ndarray:
+        bbox = tuple(int(value) for value in bbox)
+        with self._lock:
+            recorded = bbox if bbox in self._streams else self._container(bbox)
+            stream = self._streams[recorded]
+            position = self._positions[recorded]
+            self._positions[recorded] = min(position + 1, len(stream) - 1)
+            frame = self.trace.frame(stream[position])
+        if recorded == bbox:
+            return frame
+        return crop_frame(frame, bbox, recorded[:2])
+
+    def _container(self, bbox: tuple[int, int, int, int]) -> tuple[int, int, int, int]:
+        x, y, w, h = bbox
+        containing = [
+            (left, top, width, height) for left, top, width, height in self._streams
+            if left <= x and top <= y and x + w <= left + width and y + h <= top + height
+        ]
+        if not containing:
+            raise ValueError(f'Area {bbox} was not recorded in the trace.')
+        return min(containing, key=lambda area: area[2] * area[3])
+
+
+def plain(value: Any) -> Any:
+    """
+    Converts regions, points, their sets and named tuples of them to JSON data; other objects become their repr.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, 'to_array'):
+        return value.to_array().tolist()
+    if hasattr(value, 'to_tuple'):
+        return [plain(item) for item in value.to_tuple()]
+    if isinstance(value, tuple) and hasattr(value, '_asdict'):
+        return {key: plain(item) for key, item in value._asdict().items()}
+    if isinstance(value, (list, tuple)):
+        return [plain(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): plain(item) for key, item in value.items()}
+    return repr(value)
+
+
+class _ThreadTrace(threading.local):
+    recorder: TraceRecorder | None = None
+
+
+_local = _ThreadTrace()
+
+
+def get_trace_recorder() -> TraceRecorder | None:
+    """
+    Returns the recorder of the current thread, or None when nothing is recorded.
+    """
+    return _local.recorder
+
+
+@contextmanager
+def use_trace_recorder(recorder: TraceRecorder | None) -> Iterator[TraceRecorder | None]:
+    """
+    Temporarily records input actions and wait results of the current thread into recorder.
+    """
+    previous = _local.recorder
+    _local.recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _local.recorder = previous
+
+
+def record_event(kind: str, **data: Any) -> None:
+    """
+    Records an event in the recorder of the current thread, if any.
+    """
+    recorder = _local.recorder
+    if recorder is not None:
+        recorder.record(kind, **data)
+
+
+def record_wait(name: str, region: Any, result: T) -> T:
+    """
+    Records the result of a wait in the recorder of the current thread and returns the result.
+    """
+    recorder = _local.recorder
+    if recorder is not None:
+        recorder.record('wait', wait=name, region=region, result=result)
+    return result
@@ -1,16 +1,67 @@
+import asyncio
 import sys
+import tempfile
 import unittest
 from pathlib import Path
-from threading import Event
+from threading import Event, Thread, Timer
+from time import monotonic, sleep
+from types import SimpleNamespace
+from unittest.mock import patch
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
 
 try:
-    from simpleautogui.macro import AbstractMacro, MacroContext, MacroRunner, MacroState, MacroStopped
+    import cv2
+    import numpy as np
+
+    from simpleautogui.async_macro import AbstractAsyncMacro, AsyncMacroContext, AsyncMacroRunner, CaptureHub
+    from simpleautogui.macro import AbstractMacro, MacroContext, MacroRunner, MacroState, MacroStopped, PriorityLock
+    from simpleautogui.macro_pool import MacroPool
+    from simpleautogui.screen.classes import base
+    from simpleautogui.screen.classes.base import Point, Region
+    from simpleautogui.screen.conditions import ColorCondition
+    from simpleautogui.screen.frames import ReplayFrameSource, get_frame_source, set_frame_source, use_frame_source
+    from simpleautogui.screen.metrics import MemorySink, Metrics
+    from simpleautogui.screen.ocr import OcrEngine, OcrEnginePool
+    from simpleautogui.screen.templates import Template
+    from simpleautogui.screen.trace import Trace, TraceFrameSource, TraceRecorder, use_trace_recorder
 except ModuleNotFoundError as exc:
     raise unittest.SkipTest(f'Missing optional test dependency: {exc.name}')
 
 
+class BlankEngine(OcrEngine):
+    def data(self, image, **kwargs):
+        return {'text': [], 'conf': [], 'left': [], 'top': [], 'width': [], 'height': []}
+
+    def string(self, image, **kwargs):
+        return ''
+
+
+class WaitImageMacro(AbstractMacro):
+    def __init__(self, region: Region, template: Template):
+        self.region = region
+        self.template = template
+        self.waiting = Event()
+
+    def run(self, context: MacroContext) -> None:
+        self.waiting.set()
+        context.wait_image(self.region, self.template, timeout=30, check_interval=0.01)
+
+
+class WaitColorAsyncMacro(AbstractAsyncMacro):
+    def __init__(self, region: Region):
+        self.region = region
+        self.waiting = Event()
+        self.stopped = False
+
+    async def run(self, context: AsyncMacroContext) -> None:
+        self.waiting.set()
+        await asyncio.gather(context.wait_color(self.region, 'red', timeout=30), context.sleep(30))
+
+    async def on_stop(self, context: AsyncMacroContext) -> None:
+        self.stopped = True
+
+
 class CountingMacro(AbstractMacro):
     def __init__(self):
         self.started = False
@@ -29,6 +80,30 @@ class CountingMacro(AbstractMacro):
         self.stopped = True
 
 
+class InputMacro(AbstractMacro):
+    def __init__(self):
+        self.sources = []
+        self.clicks = 0
+
+    def run(self, context: MacroContext) -> None:
+        self.sources.append(get_frame_source())
+        while context.is_running:
+            with context.input():
+                self.clicks += 1
+            context.sleep(0.01)
+
+
+class ClickColorMacro(AbstractMacro):
+    def __init__(self, region: Region):
+        self.region = region
+        self.found = None
+
+    def run(self, context: MacroContext) -> None:
+        self.found = context.wait_color(self.region, 'red', timeout=1, check_interval=0.01)
+        if self.found:
+            self.found.click()
+
+
 class ErrorMacro(AbstractMacro):
     def run(self, context: MacroContext) -> None:
         raise ValueError('broken')
@@ -52,6 +127,81 @@ class MacroTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             context.sleep(1, check_interval=0)
 
+    def test_context_wait_color_reports_polls(self):
+        empty = np.zeros((4, 4, 3), dtype=np.uint8)
+        red = empty.copy()
+        red[2, 1] = [255, 0, 0]
+        context = MacroContext(Event())
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=4, height=4)):
+            region = Region(10, 10, 4, 4)
+
+        with use_frame_source(ReplayFrameSource([empty, empty, red], origin=(10, 10))):
+            point = context.wait_color(region, 'red', timeout=1, check_interval=0.01)
+
+        self.assertEqual(point.to_tuple(), (11, 12))
+        self.assertEqual(context.last_poller.polls, 3)
+
+    def test_context_wait_stops_during_poll_sleep(self):
+        stop_event = Event()
+        context = MacroContext(stop_event)
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=4, height=4)):
+            region = Region(0, 0, 4, 4)
+        Timer(0.05, stop_event.set).start()
+        started = monotonic()
+
+        with use_frame_source(ReplayFrameSource([np.zeros((4, 4, 3), dtype=np.uint8)])):
+            with self.assertRaises(MacroStopped):
+                context.wait_color(region, 'red', timeout=5, check_interval=1)
+
+        self.assertLess(monotonic() - started, 0.5)
+
+    def test_context_wait_text_stops_while_watching(self):
+        stop_event = Event()
+        context = MacroContext(stop_event)
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=4, height=4)):
+            region = Region(0, 0, 4, 4)
+        with use_frame_source(ReplayFrameSource([np.zeros((4, 4, 3), dtype=np.uint8)])):
+            watcher = region.watch_text(interval=0.01, pool=OcrEnginePool(BlankEngine, cache=False))
+        Timer(0.05, stop_event.set).start()
+        started = monotonic()
+
+        try:
+            with self.assertRaises(MacroStopped):
+                context.wait_text(region, 'Play', timeout=5, check_interval=1, watcher=watcher)
+        finally:
+            watcher.stop()
+
+        self.assertLess(monotonic() - started, 0.5)
+        self.assertGreater(watcher.updates, 0)
+
+    def test_runner_stop_interrupts_large_template_match(self):
+        rng = np.random.default_rng(0)
+        set_frame_source(ReplayFrameSource([rng.integers(0, 256, size=(1080, 1920, 3), dtype=np.uint8)]))
+        self.addCleanup(set_frame_source, None)
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=1920, height=1080)):
+            region = Region(0, 0, 1920, 1080)
+        template = Template.from_array(rng.integers(0, 256, size=(64, 64, 3), dtype=np.uint8), name='missing')
+        macro = WaitImageMacro(region, template)
+        runner = MacroRunner(macro)
+        match_template = cv2.matchTemplate
+        bands = []
+
+        def score_band(*args, **kwargs):
+            bands.append(args[0].shape[0])
+            if len(bands) == 2:
+                # Request the stop while the frame is half scored.
+                runner.stop()
+            return match_template(*args, **kwargs)
+
+        with patch('simpleautogui.screen.matching.cv2.matchTemplate', side_effect=score_band):
+            runner.start()
+            runner.wait(timeout=5)
+
+        self.assertEqual(runner.state, MacroState.IDLE)
+        self.assertIsNone(runner.last_error)
+        self.assertEqual(len(bands), 2)
+        self.assertLess(bands[0], 1080 // 2)
+
     def test_runner_starts_and_stops_macro(self):
         macro = CountingMacro()
         runner = MacroRunner(macro)
@@ -66,6 +216,46 @@ class MacroTests(unittest.TestCase):
         self.assertTrue(macro.stopped)
         self.assertGreater(macro.iterations, 0)
 
+    def test_runner_collects_stats_and_flushes_sinks(self):
+        sink = MemorySink()
+        runner = MacroRunner(CountingMacro(), stats=Metrics([sink]))
+
+        runner.start()
+        sleep(0.05)
+        runner.stop(wait=True, timeout=1)
+
+        self.assertGreater(runner.stats['sleep'].count, 0)
+        self.assertEqual(sink.latest['histograms']['sleep']['count'], runner.stats['sleep'].count)
+        self.assertIsNone(MacroRunner(CountingMacro()).stats)
+        self.assertIsNone(AsyncMacroRunner(WaitColorAsyncMacro).stats)
+        self.assertIsInstance(MacroRunner(CountingMacro(), stats=True).stats, Metrics)
+
+    def test_runner_records_trace_that_replays_the_run(self):
+        frames = [np.zeros((20, 20, 3), dtype=np.uint8) for _ in range(3)]
+        frames[2][4, 6] = (255, 0, 0)
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=20, height=20)):
+            region = Region(0, 0, 20, 20)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+
+        with patch.object(base.pg, 'click') as click:
+            recorded = ClickColorMacro(region)
+            runner = MacroRunner(recorded, frame_source=ReplayFrameSource(frames), trace=tmp.name)
+            runner.start()
+            runner.wait(timeout=1)
+            replayed = ClickColorMacro(region)
+            replay = MacroRunner(replayed, frame_source=TraceFrameSource(tmp.name))
+            replay.start()
+            replay.wait(timeout=1)
+
+        trace = Trace(tmp.name)
+        self.assertIsNone(runner.last_error)
+        self.assertEqual(len(trace), 3)
+        self.assertEqual(trace.waits[0]['result'], [6, 4])
+        self.assertEqual([(event['type'], event['x'], event['y']) for event in trace.actions], [('click', 6, 4)])
+        self.assertEqual(replayed.found.to_tuple(), recorded.found.to_tuple())
+        self.assertEqual(click.call_count, 2)
+
     def test_runner_stores_last_error(self):
         runner = MacroRunner(ErrorMacro())
 
@@ -85,6 +275,126 @@ class MacroTests(unittest.TestCase):
 
         self.assertEqual(runner.state, MacroState.IDLE)
 
+    def test_priority_lock_grants_higher_priority_waiter_first(self):
+        lock = PriorityLock()
+        order = []
+        lock.acquire('holder')
+
+        def take(owner, priority):
+            lock.acquire(owner, priority)
+            order.append(owner)
+            lock.release(owner)
+
+        threads = [Thread(target=take, args=('low', 0)), Thread(target=take, args=('high', 5))]
+        for thread in threads:
+            thread.start()
+            sleep(0.02)
+        lock.release('holder')
+        for thread in threads:
+            thread.join(1)
+
+        self.assertEqual(order, ['high', 'low'])
+        self.assertIsNone(lock.owner)
+
+    def test_pool_runs_macros_on_shared_source(self):
+        pool = MacroPool(ReplayFrameSource([np.zeros((10, 10, 3), dtype=np.uint8)]))
+        macros = {'first': InputMacro(), 'second': InputMacro()}
+        for priority, (name, macro) in enumerate(macros.items()):
+            pool.add(name, macro, priority=priority)
+
+        self.assertEqual(pool.start(), ['first', 'second'])
+        sleep(0.05)
+        self.assertEqual(set(pool.states.values()), {MacroState.RUNNING})
+        pool.stop(wait=True, timeout=1)
+
+        self.assertEqual(set(pool.states.values()), {MacroState.IDLE})
+        self.assertEqual(pool.errors, {})
+        for macro in macros.values():
+            self.assertEqual(macro.sources, [pool.frame_source])
+            self.assertGreater(macro.clicks, 0)
+        self.assertIsNone(pool.input_lock.owner)
+
+
+class AsyncMacroTests(unittest.TestCase):
+    def setUp(self):
+        self.frames = [np.zeros((40, 80, 3), dtype=np.uint8) for _ in range(3)]
+        self.frames[1][5:10, 5:10] = (255, 0, 0)
+        self.frames[2][5:10, 5:10] = (255, 0, 0)
+        self.frames[2][25:30, 50:55] = (0, 255, 0)
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=80, height=40)):
+            self.left = Region(0, 0, 40, 40)
+            self.right = Region(40, 0, 40, 40)
+
+    def test_concurrent_waits_share_one_capture_per_tick(self):
+        source = ReplayFrameSource(self.frames)
+
+        async def scenario():
+            context = AsyncMacroContext(Event(), CaptureHub(interval=0.01, source=source))
+            red, green = await asyncio.gather(
+                context.wait_color(self.left, 'red', timeout=1, check_interval=0.01),
+                context.wait_color(self.right, (0, 255, 0), timeout=1, check_interval=0.01),
+            )
+            return context, red, green
+
+        context, red, green = asyncio.run(scenario())
+
+        self.assertEqual(red.to_tuple(), (5, 5))
+        self.assertEqual(green.to_tuple(), (50, 25))
+        self.assertEqual(context.hub.captures, 3)
+
+    def test_async_wait_any_reports_fired_condition(self):
+        source = ReplayFrameSource(self.frames)
+        red = ColorCondition(self.left, 'red')
+        green = ColorCondition(self.right, (0, 255, 0))
+
+        async def scenario():
+            context = AsyncMacroContext(Event(), CaptureHub(interval=0.01, source=source))
+            return context, await context.wait_any(green, red, timeout=1, check_interval=0.01)
+
+        context, fired = asyncio.run(scenario())
+
+        self.assertEqual((fired.index, fired.condition), (1, red))
+        self.assertEqual(context.hub.captures, 2)
+
+    def test_executor_calls_record_into_trace_of_context(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+
+        async def scenario():
+            context = AsyncMacroContext(Event(), CaptureHub(interval=0.01, source=ReplayFrameSource(self.frames)))
+            await context.run_in_executor(Point(3, 4).drag_rel, 5, 6)
+
+        with (
+            patch.object(base.pg, 'moveTo'),
+            patch.object(base.pg, 'dragRel') as drag_rel,
+            TraceRecorder(tmp.name, ReplayFrameSource(self.frames)) as recorder,
+            use_trace_recorder(recorder),
+        ):
+            asyncio.run(scenario())
+
+        drag_rel.assert_called_once_with(5, 6)
+        self.assertEqual(
+            [(event['type'], event.get('dx'), event.get('dy')) for event in Trace(tmp.name).actions],
+            [('move', None, None), ('drag_rel', 5, 6)],
+        )
+
+    def test_async_runner_stops_concurrent_waits(self):
+        set_frame_source(ReplayFrameSource(self.frames[:1]))
+        self.addCleanup(set_frame_source, None)
+        macro = WaitColorAsyncMacro(self.left)
+        runner = AsyncMacroRunner(macro)
+
+        self.assertTrue(runner.start())
+        macro.waiting.wait(1)
+        sleep(0.05)
+        started = monotonic()
+        runner.stop(wait=True, timeout=1)
+
+        self.assertLess(monotonic() - started, 0.1)
+        self.assertEqual(runner.state, MacroState.IDLE)
+        self.assertIsNone(runner.last_error)
+        self.assertTrue(macro.stopped)
+
 
 if __name__ == '__main__':
     unittest.main()
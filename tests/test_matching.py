@@ -0,0 +1,182 @@
+import sys
+import threading
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+try:
+    import cv2
+    import numpy as np
+
+    from simpleautogui.screen.cancel import OperationCancelled, cancel_scope
+    from simpleautogui.screen.classes import base
+    from simpleautogui.screen.changes import TileChangeTracker
+    from simpleautogui.screen.classes.base import Region
+    from simpleautogui.screen.frames import ReplayFrameSource, use_frame_source
+    from simpleautogui.screen.matching import TemplateMatcher, get_matcher
+    from simpleautogui.screen.templates import Template
+except ModuleNotFoundError as exc:
+    raise unittest.SkipTest(f'Missing optional test dependency: {exc.name}')
+
+
+class MatchingTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.frame = rng.integers(0, 256, size=(120, 160, 3), dtype=np.uint8)
+        self.frame[80:96, 10:30] = self.frame[10:26, 100:120]
+        self.first = Template.from_array(self.frame[10:26, 100:120], name='first')
+        self.second = Template.from_array(self.frame[50:70, 40:70], name='second')
+        self.missing = Template.from_array(rng.integers(0, 256, size=(12, 12, 3), dtype=np.uint8), name='missing')
+
+    def test_match_returns_all_hits_per_template_with_scores(self):
+        matcher = TemplateMatcher(max_workers=4)
+        self.addCleanup(matcher.close)
+
+        result = matcher.match(self.frame, [self.missing, self.first, self.second], confidence=0.99)
+
+        self.assertEqual(result[0], [])
+        self.assertEqual([(m.left, m.top) for m in result[1]], [(100, 10), (10, 80)])
+        self.assertEqual([(m.left, m.top, m.width, m.height) for m in result[2]], [(40, 50, 30, 20)])
+        self.assertTrue(all(m.score >= 0.99 for m in result[1] + result[2]))
+
+    def test_parallel_and_sequential_results_are_equal(self):
+        parallel = TemplateMatcher(max_workers=4)
+        self.addCleanup(parallel.close)
+        templates = [self.first, self.second, self.missing] * 3
+
+        self.assertEqual(
+            parallel.match(self.frame, templates, confidence=0.95),
+            TemplateMatcher(max_workers=1).match(self.frame, templates, confidence=0.95),
+        )
+
+    def test_wait_images_returns_matches_of_first_template_with_enough_hits(self):
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=160, height=120)):
+            region = Region(0, 0, 160, 120)
+
+        with use_frame_source(ReplayFrameSource([self.frame])):
+            result = region.wait_images([self.second, self.first], timeout=0, min_matches=2)
+
+        self.assertEqual([match.to_tuple() for match in result], [(100, 10, 20, 16), (10, 80, 20, 16)])
+
+    def test_pyramid_search_finds_same_matches_as_full_search(self):
+        rng = np.random.default_rng(3)
+        frame = cv2.GaussianBlur(rng.integers(0, 256, size=(540, 960, 3), dtype=np.uint8), (0, 0), 3)
+        template = Template.from_array(frame[301:365, 203:283])
+        matcher = TemplateMatcher(max_workers=1)
+
+        full = matcher.match(frame, [template], confidence=0.9)
+        coarse = matcher.match(frame, [template], confidence=0.9, pyramid=2)
+
+        self.assertEqual(matcher.pyramid_level(frame, template, 2), 2)
+        self.assertEqual([match[:4] for match in full[0]], [match[:4] for match in coarse[0]])
+        self.assertIn((203, 301), [(match.left, match.top) for match in coarse[0]])
+
+    def test_pyramid_search_finds_sharp_template_at_odd_offset(self):
+        matcher = TemplateMatcher(max_workers=1)
+        for left, top in ((301, 103), (302, 103), (301, 104)):
+            with self.subTest(left=left, top=top):
+                frame = np.full((270, 480, 3), 240, dtype=np.uint8)
+                cv2.putText(frame, 'Cancel', (40, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (20, 20, 20), 1)
+                cv2.putText(frame, 'Submit', (left + 2, top + 18), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (20, 20, 20), 1)
+                template = Template.from_array(frame[top:top + 24, left:left + 64])
+
+                found = matcher.match_first(frame, [template], confidence=0.9, pyramid=1)
+
+                self.assertEqual(matcher.pyramid_level(frame, template, 1), 1)
+                self.assertEqual(found[:2], (left, top))
+
+    def test_pyramid_search_with_too_many_candidates_matches_at_full_resolution(self):
+        matcher = TemplateMatcher(max_workers=1)
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        frame[20:40, 30:50] = 255
+        frame[70:90, 101:121] = 255
+        template = Template.from_array(frame[15:45, 25:55])
+
+        with patch.object(TemplateMatcher, 'PYRAMID_MAX_CANDIDATES', 0):
+            found = matcher.match(frame, [template], confidence=0.99, pyramid=1)
+
+        self.assertEqual([match[:2] for match in found[0]], [(25, 15), (96, 65)])
+
+    def test_cancellable_match_scores_frame_in_bands(self):
+        matcher = TemplateMatcher(max_workers=1)
+        expected = matcher.match(self.frame, [self.first, self.second], confidence=0.99)
+        event = threading.Event()
+
+        with (
+            patch.object(TemplateMatcher, 'BAND_ROWS', 16),
+            patch.object(TemplateMatcher, 'BAND_TEMPLATE_HEIGHTS', 1),
+            patch('simpleautogui.screen.matching.cv2.matchTemplate', wraps=cv2.matchTemplate) as match_template,
+            cancel_scope(event),
+        ):
+            banded = matcher.match(self.frame, [self.first, self.second], confidence=0.99)
+            event.set()
+            with self.assertRaises(OperationCancelled):
+                matcher.match(self.frame, [self.first], confidence=0.99)
+
+        self.assertEqual(
+            [[match[:4] for match in matches] for matches in banded],
+            [[match[:4] for match in matches] for matches in expected],
+        )
+        self.assertGreater(match_template.call_count, 2)
+
+    def test_pyramid_level_keeps_small_templates_at_full_resolution(self):
+        frame = np.zeros((2160, 3840, 3), dtype=np.uint8)
+
+        self.assertEqual(TemplateMatcher.pyramid_level(frame, Template.from_array(frame[:64, :64]), True), 2)
+        self.assertEqual(TemplateMatcher.pyramid_level(frame, Template.from_array(frame[:20, :40]), True), 1)
+        self.assertEqual(TemplateMatcher.pyramid_level(frame, Template.from_array(frame[:10, :10]), True), 0)
+
+
+class ChangeTrackingTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.frame = rng.integers(0, 256, size=(96, 128, 3), dtype=np.uint8)
+        self.template = Template.from_array(self.frame[8:20, 8:24])
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=128, height=96)):
+            self.region = Region(0, 0, 128, 96)
+
+    def test_tracker_returns_bounding_box_of_changed_tiles(self):
+        tracker = TileChangeTracker(tile_size=32)
+        changed = self.frame.copy()
+        changed[40, 70] = 255 - changed[40, 70]
+
+        self.assertEqual(tracker.update(self.frame), (0, 0, 128, 96))
+        self.assertIsNone(tracker.update(self.frame.copy()))
+        self.assertEqual(tracker.update(changed), (64, 32, 32, 32))
+        self.assertEqual(int(tracker.dirty_tiles.sum()), 1)
+
+    def test_tracker_compares_cropped_views_and_partial_tiles(self):
+        tracker = TileChangeTracker(tile_size=32)
+        changed = self.frame.copy()
+        changed[90, 120, 2] ^= 1
+
+        self.assertEqual(tracker.update(self.frame[5:95, 3:125]), (0, 0, 122, 90))
+        self.assertIsNone(tracker.update(self.frame.copy()[5:95, 3:125]))
+        self.assertEqual(tracker.update(changed[5:95, 3:125]), (96, 64, 26, 26))
+        self.assertEqual(np.argwhere(tracker.dirty_tiles).tolist(), [[2, 3]])
+
+    def test_wait_image_skips_matching_while_screen_is_unchanged(self):
+        source = ReplayFrameSource([self.frame], loop=True)
+        missing = Template.from_array(np.eye(12, dtype=np.uint8)[:, :, None].repeat(3, axis=2) * 255)
+
+        with use_frame_source(source), patch.object(get_matcher(), 'match_first', return_value=None) as match:
+            self.region.wait_image(missing, timeout=0.1, check_interval=0.01)
+
+        self.assertEqual(match.call_count, 1)
+
+    def test_wait_images_merges_fresh_matches_from_changed_tiles(self):
+        moved = self.frame.copy()
+        moved[60:72, 90:106] = self.frame[8:20, 8:24]
+        source = ReplayFrameSource([self.frame, moved])
+
+        with use_frame_source(source):
+            result = self.region.wait_images(self.template, timeout=1, check_interval=0.01, min_matches=2)
+
+        self.assertEqual(result.to_array().tolist(), [[8, 8, 16, 12], [90, 60, 16, 12]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,552 @@
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+try:
+    import cv2
+    import numpy as np
+    from PIL import Image, ImageEnhance, ImageFilter
+
+    from simpleautogui.screen.cancel import OperationCancelled, cancel_scope
+    from simpleautogui.screen.classes.base import Region
+    from simpleautogui.screen.frames import ReplayFrameSource, use_frame_source
+    from simpleautogui.screen.ocr import (
+        Contrast, Grayscale, IncrementalOcr, OcrCache, OcrEngine, OcrEnginePool, OcrResult, OcrWatcher, Pipeline,
+        Scale, Sharpen, TextIndex, Threshold, TiledOcr, detect_text_areas, edit_distance, get_ocr_pool, get_pipeline,
+        recognize_areas, set_ocr_pool
+    )
+    from simpleautogui.screen.ocr import engines
+    from simpleautogui.screen.ocr.engines import TesserocrEngine
+    from simpleautogui.screen.ocr.tiles import split_bands
+except ModuleNotFoundError as exc:
+    raise unittest.SkipTest(f'Missing optional test dependency: {exc.name}')
+
+
+class FakeEngine(OcrEngine):
+    started = 0
+
+    def __init__(self, lang: str = 'eng+rus', delay: float = 0):
+        super().__init__(lang)
+        FakeEngine.started += 1
+        self.delay = delay
+        self.closed = False
+
+    def data(self, image, **kwargs):
+        time.sleep(self.delay)
+        return {'text': [self.lang], 'conf': [99], 'left': [0], 'top': [0], 'width': [10], 'height': [10]}
+
+    def string(self, image, **kwargs):
+        time.sleep(self.delay)
+        return self.lang
+
+    def close(self):
+        self.closed = True
+
+
+class OcrEnginePoolTests(unittest.TestCase):
+    def setUp(self):
+        FakeEngine.started = 0
+        self.image = Image.new('RGB', (10, 10))
+
+    def test_pool_reuses_warm_engine_per_language(self):
+        pool = OcrEnginePool(FakeEngine, max_workers=2, cache=False)
+
+        results = [pool.string(self.image, lang='eng') for _ in range(3)] + [pool.string(self.image, lang='rus')]
+
+        self.assertEqual(results, ['eng', 'eng', 'eng', 'rus'])
+        self.assertEqual(FakeEngine.started, 2)
+
+    def test_pool_bounds_concurrent_recognitions(self):
+        pool = OcrEnginePool(lambda lang: FakeEngine(lang, delay=0.02), max_workers=2, cache=False)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def recognize():
+            with pool.engine('eng') as engine:
+                with lock:
+                    active.append(engine)
+                    peak.append(len(active))
+                engine.string(self.image)
+                with lock:
+                    active.remove(engine)
+
+        threads = [threading.Thread(target=recognize) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(max(peak), 2)
+        self.assertLessEqual(FakeEngine.started, 2)
+
+    def test_close_stops_idle_engines(self):
+        pool = OcrEnginePool(FakeEngine)
+        pool.warm('eng', count=1)
+        with pool.engine('eng') as engine:
+            pass
+
+        pool.close()
+
+        self.assertEqual(FakeEngine.started, 1)
+        self.assertTrue(engine.closed)
+
+    def test_cancel_abandons_running_recognitions(self):
+        pool = OcrEnginePool(lambda lang: FakeEngine(lang, delay=1), max_workers=2, cache=False)
+        self.addCleanup(pool.close)
+        event = threading.Event()
+        threading.Timer(0.05, event.set).start()
+        started = time.monotonic()
+
+        with cancel_scope(event):
+            with self.assertRaises(OperationCancelled):
+                pool.string(self.image, lang='eng')
+            with self.assertRaises(OperationCancelled):
+                pool.string_many([self.image, self.image], lang='eng')
+
+        self.assertLess(time.monotonic() - started, 0.5)
+
+
+class OcrCacheTests(unittest.TestCase):
+    def setUp(self):
+        FakeEngine.started = 0
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return f'result {self.calls}'
+
+    def test_same_image_and_options_hit_the_cache(self):
+        cache = OcrCache()
+        image = Image.new('RGB', (20, 10), 'white')
+        key = OcrCache.key(image, 'string', 'eng', {'config': '--psm 7'})
+
+        first = cache.get_or_compute(key, self.compute)
+        second = cache.get_or_compute(OcrCache.key(image.copy(), 'string', 'eng', {'config': '--psm 7'}), self.compute)
+
+        self.assertEqual((first, second, self.calls), ('result 1', 'result 1', 1))
+        self.assertEqual(cache.stats[:2], (1, 1))
+
+    def test_key_depends_on_pixels_language_and_options(self):
+        image = Image.new('RGB', (20, 10), 'white')
+        changed = image.copy()
+        changed.putpixel((3, 3), (0, 0, 0))
+        keys = {
+            OcrCache.key(image, 'data', 'eng', {}),
+            OcrCache.key(changed, 'data', 'eng', {}),
+            OcrCache.key(image, 'data', 'rus', {}),
+            OcrCache.key(image, 'data', 'eng', {'config': '--psm 6'}),
+            OcrCache.key(image, 'string', 'eng', {}),
+        }
+
+        self.assertEqual(len(keys), 5)
+
+    def test_cache_evicts_least_recently_used_entries(self):
+        cache = OcrCache(max_entries=2)
+        for key in (b'a', b'b', b'a', b'c'):
+            cache.get_or_compute(key, self.compute)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats.evictions, 1)
+        cache.get_or_compute(b'a', self.compute)
+        self.assertEqual(self.calls, 3)
+
+    def test_pool_shares_cache_between_calls(self):
+        pool = OcrEnginePool(FakeEngine)
+        image = Image.new('RGB', (10, 10))
+
+        pool.string(image, lang='eng')
+        pool.string(image, lang='eng')
+        pool.result(image, lang='eng')
+
+        self.assertEqual(pool.cache.stats[:2], (1, 2))
+        self.assertEqual(FakeEngine.started, 1)
+
+
+class FakeTessApi:
+    def __init__(self, lang='eng', oem=None):
+        self.lang = lang
+        self.oem = oem
+        self.variables = {'tessedit_char_whitelist': ''}
+        self.seen = None
+        self.ended = False
+
+    def GetVariableAsString(self, name):
+        return self.variables.get(name)
+
+    def SetVariable(self, name, value):
+        if name not in self.variables:
+            return False
+        self.variables[name] = value
+        return True
+
+    def Clear(self):
+        pass
+
+    def SetPageSegMode(self, mode):
+        self.mode = mode
+
+    def SetImage(self, image):
+        pass
+
+    def GetUTF8Text(self):
+        self.seen = dict(self.variables)
+        return '42'
+
+    def End(self):
+        self.ended = True
+
+
+class TesserocrEngineTests(unittest.TestCase):
+    def setUp(self):
+        fake = SimpleNamespace(PSM=SimpleNamespace(AUTO=3), PyTessBaseAPI=FakeTessApi)
+        patcher = patch.object(engines, 'tesserocr', fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.engine = TesserocrEngine('eng')
+        self.image = Image.new('RGB', (4, 4))
+
+    def test_config_variables_apply_to_one_call_only(self):
+        text = self.engine.string(self.image, config='--psm 7 -c tessedit_char_whitelist=0123456789')
+
+        self.assertEqual(text, '42')
+        self.assertEqual(self.engine._api.mode, 7)
+        self.assertEqual(self.engine._api.seen['tessedit_char_whitelist'], '0123456789')
+        self.assertEqual(self.engine._api.variables['tessedit_char_whitelist'], '')
+
+    def test_oem_uses_a_kept_api_for_that_mode(self):
+        for config in ('--oem 1 --psm 6', '--oem=1 -c tessedit_char_whitelist=0'):
+            with self.subTest(config=config):
+                self.assertEqual(self.engine.string(self.image, config=config), '42')
+
+        api = self.engine._oem_apis[1]
+        self.assertEqual((api.lang, api.oem, api.mode), ('eng', 1, 3))
+        self.assertEqual(api.variables['tessedit_char_whitelist'], '')
+        self.assertIsNone(self.engine._api.seen)
+        self.assertEqual(list(self.engine._oem_apis), [1])
+
+        self.engine.close()
+        self.assertTrue(api.ended and self.engine._api.ended)
+
+    def test_options_tesserocr_cannot_apply_fall_back_to_pytesseract(self):
+        with patch.object(engines.pytesseract, 'image_to_string', return_value='7') as image_to_string:
+            text = self.engine.string(self.image, config='--tessdata-dir /data --psm 7', timeout=2)
+
+        self.assertEqual(text, '7')
+        image_to_string.assert_called_once_with(
+            self.image, lang='eng', config='--tessdata-dir /data --psm 7', timeout=2
+        )
+        self.assertIsNone(self.engine._api.seen)
+
+    def test_malformed_config_raises(self):
+        for config in ('--oem x', '-c missing_variable=1', '-c novalue'):
+            with self.subTest(config=config), self.assertRaises(ValueError):
+                self.engine.string(self.image, config=config)
+        self.assertEqual(self.engine._api.variables, {'tessedit_char_whitelist': ''})
+
+
+class StripeEngine(OcrEngine):
+    """
+    Reads every horizontal stripe of non-white rows as one line whose text is its gray level.
+    """
+
+    crops = []
+
+    def data(self, image, **kwargs):
+        StripeEngine.crops.append(image.size)
+        pixels = np.asarray(image.convert('L'))
+        rows = np.flatnonzero((pixels < 255).any(axis=1))
+        names = ('text', 'conf', 'left', 'top', 'width', 'height', 'block_num', 'par_num', 'line_num')
+        data = {name: [] for name in names}
+        if not rows.size:
+            return data
+        breaks = np.flatnonzero(np.diff(rows) > 1)
+        for line, (top, bottom) in enumerate(zip(
+                np.concatenate(([rows[0]], rows[breaks + 1])), np.concatenate((rows[breaks], [rows[-1]]))
+        ), start=1):
+            for name, value in (
+                    ('text', f'gray{pixels[top, 0]}'), ('conf', 96), ('left', 0), ('top', int(top)),
+                    ('width', image.width), ('height', int(bottom - top + 1)),
+                    ('block_num', 1), ('par_num', 1), ('line_num', line),
+            ):
+                data[name].append(value)
+        return data
+
+    def string(self, image, **kwargs):
+        return ' '.join(self.data(image)['text'])
+
+
+class SlowEngine(StripeEngine):
+    def data(self, image, **kwargs):
+        time.sleep(1)
+        return super().data(image, **kwargs)
+
+
+class IncrementalOcrTests(unittest.TestCase):
+    def setUp(self):
+        StripeEngine.crops = []
+        self.pixels = np.full((100, 40), 255, dtype=np.uint8)
+        for index, top in enumerate(range(10, 90, 20)):
+            self.pixels[top:top + 8] = 10 + index
+        self.ocr = IncrementalOcr(pool=OcrEnginePool(StripeEngine, cache=False), margin=2)
+
+    def test_only_changed_line_is_recognized_again(self):
+        self.ocr.update(Image.fromarray(self.pixels))
+        self.pixels[50:58] = 99
+
+        result = self.ocr.update(Image.fromarray(self.pixels))
+
+        self.assertEqual(StripeEngine.crops, [(40, 100), (40, 12)])
+        self.assertEqual(self.ocr.last_bands, [(48, 60)])
+        self.assertEqual(result.text.tolist(), ['gray10', 'gray11', 'gray99', 'gray13'])
+        self.assertEqual(result.boxes[:, 1].tolist(), [10, 30, 50, 70])
+        self.assertEqual(self.ocr.text, 'gray10\ngray11\ngray99\ngray13')
+
+    def test_unchanged_frame_recognizes_nothing(self):
+        self.ocr.update(Image.fromarray(self.pixels))
+
+        result = self.ocr.update(Image.fromarray(self.pixels.copy()))
+
+        self.assertEqual(len(StripeEngine.crops), 1)
+        self.assertEqual(self.ocr.last_bands, [])
+        self.assertEqual(len(result), 4)
+
+    def test_failed_update_keeps_model(self):
+        self.ocr.update(Image.fromarray(self.pixels))
+        self.pixels[50:58] = 99
+
+        with patch.object(StripeEngine, 'data', side_effect=RuntimeError('engine failed')):
+            with self.assertRaises(RuntimeError):
+                self.ocr.update(Image.fromarray(self.pixels))
+        self.assertEqual(self.ocr.text, 'gray10\ngray11\ngray12\ngray13')
+
+        self.ocr.update(Image.fromarray(self.pixels))
+
+        self.assertEqual(self.ocr.last_bands, [(48, 60)])
+        self.assertEqual(self.ocr.text, 'gray10\ngray11\ngray99\ngray13')
+
+    def test_new_line_in_blank_area_is_added(self):
+        self.ocr.update(Image.fromarray(self.pixels))
+        self.pixels[92:96] = 50
+
+        result = self.ocr.update(Image.fromarray(self.pixels))
+
+        self.assertEqual(result.text[-1], 'gray50')
+        self.assertEqual(result.boxes[-1, 1], 92)
+
+
+class PipelineTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.image = rng.integers(0, 256, size=(40, 60, 3), dtype=np.uint8)
+
+    def assert_close(self, actual, expected, tolerance=1):
+        difference = np.abs(np.asarray(actual, dtype=np.int16) - np.asarray(expected, dtype=np.int16))
+        self.assertLessEqual(int(difference.max()), tolerance)
+
+    def test_contrast_and_sharpen_match_pil(self):
+        image = Image.fromarray(self.image)
+
+        contrast = Pipeline(Contrast(1.5))(self.image)
+        sharpen = Pipeline(Sharpen())(self.image)
+
+        self.assert_close(contrast, ImageEnhance.Contrast(image).enhance(1.5))
+        self.assert_close(np.asarray(sharpen)[1:-1, 1:-1], np.asarray(image.filter(ImageFilter.SHARPEN))[1:-1, 1:-1])
+
+    def test_pipeline_reuses_scratch_buffers_and_returns_fresh_result(self):
+        pipeline = Pipeline(Grayscale(), Scale(2), Sharpen(), Threshold())
+
+        first = pipeline.run(self.image)
+        buffers = [id(buffer) for buffer in pipeline._local.buffers[1][:-1]]
+        second = pipeline.run(self.image)
+
+        self.assertEqual(first.shape, (80, 120))
+        self.assertTrue(set(np.unique(first).tolist()) <= {0, 255})
+        self.assertEqual([id(buffer) for buffer in pipeline._local.buffers[1][:-1]], buffers)
+        self.assertFalse(np.shares_memory(first, second))
+        np.testing.assert_array_equal(first, second)
+        self.assertEqual(pipeline.scale, 2)
+
+    def test_presets_are_resolved_by_name(self):
+        self.assertIs(get_pipeline('ui'), get_pipeline('ui'))
+        with self.assertRaises(ValueError):
+            get_pipeline('missing')
+
+
+class TextIndexTests(unittest.TestCase):
+    def test_edit_distance_stops_past_the_limit(self):
+        self.assertEqual(edit_distance('kitten', 'sitting'), 3)
+        self.assertEqual(edit_distance('kitten', 'sitting', limit=1), 2)
+        self.assertEqual(edit_distance('abc', 'abcdef', limit=2), 3)
+
+    def test_low_confidence_words_are_not_indexed(self):
+        index = TextIndex({'text': ['Ok', 'Cancel'], 'conf': [90, 40], 'left': [0, 20], 'top': [0, 0],
+                           'width': [10, 30], 'height': [10, 10]})
+
+        self.assertEqual(index.words.text.tolist(), ['Ok'])
+        self.assertEqual(len(index.find('cancel')), 0)
+        self.assertEqual(index.find('OK').tolist(), [[0, 0, 10, 10]])
+
+
+class AreaEngine(OcrEngine):
+    def data(self, image, **kwargs):
+        return {
+            'text': ['word', ''], 'conf': [95, -1], 'left': [2, 0], 'top': [3, 0], 'width': [5, 0],
+            'height': [4, 0], 'block_num': [1, 1], 'par_num': [1, 1], 'line_num': [1, 1],
+        }
+
+    def string(self, image, **kwargs):
+        return 'word'
+
+
+class TextAreaTests(unittest.TestCase):
+    def test_detects_separate_text_lines_and_skips_empty_space(self):
+        image = np.full((200, 300, 3), 255, dtype=np.uint8)
+        cv2.putText(image, 'Settings', (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 1)
+        cv2.putText(image, 'Exit', (180, 160), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 1)
+
+        areas = detect_text_areas(image)
+
+        self.assertEqual(len(areas), 2)
+        (x1, y1, w1, h1), (x2, y2, w2, h2) = areas
+        self.assertTrue(x1 <= 20 and y1 < 40 <= y1 + h1 and w1 < 150)
+        self.assertTrue(x2 <= 180 and y2 < 160 <= y2 + h2)
+        self.assertEqual(detect_text_areas(np.full((50, 50, 3), 200, dtype=np.uint8)), [])
+
+    def test_recognize_areas_offsets_boxes_and_renumbers_blocks(self):
+        pool = OcrEnginePool(AreaEngine, cache=False)
+        image = Image.new('RGB', (100, 100), 'white')
+
+        result = recognize_areas(image, [(10, 20, 30, 10), (50, 60, 30, 10)], pool=pool)
+
+        self.assertEqual(result.text.tolist(), ['word', '', 'word', ''])
+        self.assertEqual(result.boxes[::2, :2].tolist(), [[12, 23], [52, 63]])
+        self.assertEqual(result.lines[:, 0].tolist(), [1, 1, 2, 2])
+
+
+class TiledOcrTests(unittest.TestCase):
+    def test_bands_cover_all_rows_once(self):
+        bands = split_bands(100, 3, 10)
+
+        self.assertEqual([band[2:] for band in bands], [(0, 33), (33, 67), (67, 100)])
+        self.assertEqual([band[:2] for band in bands], [(0, 38), (28, 72), (62, 100)])
+
+    def test_words_from_band_overlaps_are_kept_once(self):
+        pixels = np.full((600, 40), 255, dtype=np.uint8)
+        for index, top in enumerate(range(5, 600, 20)):
+            pixels[top:top + 8] = index
+        tiled = TiledOcr(max_workers=3, overlap=40, min_band_height=100, factory=StripeEngine)
+        self.addCleanup(tiled.close)
+
+        result = tiled.result(Image.fromarray(pixels))
+
+        self.assertEqual(result.text.tolist(), [f'gray{index}' for index in range(30)])
+        self.assertEqual(result.boxes[:, 1].tolist(), list(range(5, 600, 20)))
+        self.assertEqual(len(set(result.lines[:, 0].tolist())), 3)
+        self.assertEqual(tiled.string(Image.fromarray(pixels)).splitlines()[-1], 'gray29')
+
+
+class OcrResultTests(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            'text': ['', 'Hello', 'World', 'Next', ' '],
+            'conf': ['-1', '95.5', 93, 40, -1],
+            'left': [0, 20, 34, 5, 0],
+            'top': [0, 20, 22, 40, 0],
+            'width': [100, 10, 12, 20, 0],
+            'height': [60, 10, 9, 8, 0],
+            'block_num': [1, 1, 1, 2, 2],
+            'par_num': [0, 1, 1, 1, 1],
+            'line_num': [0, 1, 1, 1, 1],
+        }
+
+    def test_from_data_keeps_columns_and_round_trips(self):
+        result = OcrResult.from_data(self.data)
+
+        self.assertEqual(result.text.tolist(), ['', 'Hello', 'World', 'Next', ''])
+        self.assertEqual(result.conf.tolist(), [-1, 95.5, 93, 40, -1])
+        self.assertEqual(OcrResult.from_data(result.to_data()).boxes.tolist(), result.boxes.tolist())
+
+    def test_lines_are_grouped_with_boxes_and_texts(self):
+        words = OcrResult.from_data(self.data).words(min_confidence=50)
+
+        self.assertEqual(words.line_boxes().tolist(), [[20, 20, 26, 11]])
+        self.assertEqual(OcrResult.from_data(self.data).string, 'Hello World\nNext')
+
+
+class OcrWatcherTests(unittest.TestCase):
+    def setUp(self):
+        StripeEngine.crops = []
+        self.blank = np.full((40, 30, 3), 255, dtype=np.uint8)
+        self.label = self.blank.copy()
+        self.label[10:18] = 7
+        self.pool = OcrEnginePool(StripeEngine, cache=False)
+
+    def test_watcher_publishes_results_and_skips_unchanged_frames(self):
+        source = ReplayFrameSource([self.blank, self.label, self.label, self.label], advance_on_grab=True)
+        with use_frame_source(source):
+            watcher = OcrWatcher(Region(0, 0, 30, 40), interval=0.005, sharpen=False, pool=self.pool)
+        with watcher:
+            first = watcher.wait_update(timeout=1)
+            latest = first
+            while watcher.updates < 4:
+                latest = watcher.wait_update(after=latest.timestamp, timeout=1)
+
+        self.assertEqual(len(first.result.words()), 0)
+        self.assertEqual(latest.result.text.tolist(), ['gray7'])
+        self.assertEqual(len(StripeEngine.crops), 2)
+        self.assertFalse(watcher.is_running)
+
+    def test_wait_text_reads_watcher_results(self):
+        source = ReplayFrameSource([self.blank, self.blank, self.label], origin=(5, 5))
+        region = Region(5, 5, 30, 40)
+
+        previous = get_ocr_pool()
+        set_ocr_pool(self.pool)
+        try:
+            with use_frame_source(ReplayFrameSource([self.blank], origin=(5, 5))):
+                self.assertIsNone(region.wait_text('gray7', timeout=0.05, check_interval=0.01, sharpen=False))
+        finally:
+            set_ocr_pool(previous)
+        with use_frame_source(source):
+            watcher = region.watch_text(interval=0.01, sharpen=False, pool=self.pool)
+        try:
+            found = region.wait_text('GRAY7', timeout=1, check_interval=0.01, watcher=watcher)
+        finally:
+            watcher.stop()
+
+        self.assertEqual(found.to_tuple(), (5, 15, 30, 8))
+
+    def test_wait_text_with_zero_timeout_checks_once(self):
+        region = Region(5, 5, 30, 40)
+
+        previous = get_ocr_pool()
+        set_ocr_pool(self.pool)
+        try:
+            with use_frame_source(ReplayFrameSource([self.label], origin=(5, 5))):
+                found = region.wait_text('gray7', timeout=0, sharpen=False)
+                missing = region.wait_text('gray8', timeout=0, sharpen=False)
+        finally:
+            set_ocr_pool(previous)
+
+        self.assertEqual(found.to_tuple(), (5, 15, 30, 8))
+        self.assertIsNone(missing)
+
+    def test_wait_update_stops_on_cancel(self):
+        with use_frame_source(ReplayFrameSource([self.label])):
+            watcher = OcrWatcher(Region(0, 0, 30, 40), interval=10, pool=OcrEnginePool(SlowEngine, cache=False))
+        event = threading.Event()
+        threading.Timer(0.05, event.set).start()
+
+        with watcher, cancel_scope(event), self.assertRaises(OperationCancelled):
+            watcher.wait_update(timeout=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
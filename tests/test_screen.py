@@ -1,4 +1,6 @@
+import os
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 from types import SimpleNamespace
@@ -11,7 +13,18 @@ try:
     from PIL import Image
 
     from simpleautogui.screen.classes import base
-    from simpleautogui.screen.classes.base import Point, Region
+    from simpleautogui.screen.classes.base import Point, PointSet, Region, RegionSet
+    from simpleautogui.screen.colors import ColorQuery
+    from simpleautogui.screen.conditions import ColorCondition, ImageCondition, PixelCondition, wait_all, wait_any
+    from simpleautogui.screen.frames import ReplayFrameSource, SharedFrameSource, use_frame_source
+    from simpleautogui.screen.metrics import (
+        Histogram, JsonlSink, MemorySink, Metrics, PrometheusSink, get_metrics, use_metrics
+    )
+    from simpleautogui.screen.ocr import OcrEnginePool, PytesseractEngine, engines
+    from simpleautogui.screen.polling import ExponentialBackoff, LearnedInterval, Poller
+    from simpleautogui.screen.snapshot import ScreenSnapshot
+    from simpleautogui.screen.templates import Template, TemplateRegistry
+    from simpleautogui.screen.trace import Trace, TraceFrameSource, TraceRecorder
     from simpleautogui.screen.utils import parse_color
 except ModuleNotFoundError as exc:
     raise unittest.SkipTest(f'Missing optional test dependency: {exc.name}')
@@ -24,12 +37,55 @@ class ScreenTests(unittest.TestCase):
 
         self.assertEqual(point.to_tuple(), (0, 43))
 
+    def test_remove_proximity_matches_pairwise_filter(self):
+        coordinates = np.random.default_rng(4).integers(-50, 50, size=(500, 2)).tolist()
+        expected = []
+        for x, y in coordinates:
+            if not any(abs(x - kept_x) <= 3 and abs(y - kept_y) <= 3 for kept_x, kept_y in expected):
+                expected.append((x, y))
+
+        points = Point.remove_proximity([Point(x, y) for x, y in coordinates], 3)
+
+        self.assertEqual([point.to_tuple() for point in points], expected)
+
+    def test_remove_proximity_accepts_and_returns_arrays(self):
+        points = np.array([[0, 0], [1, 1], [5, 5], [0, 2]])
+        regions = np.array([[10, 10, 5, 5], [11, 12, 5, 5], [30, 10, 5, 5]])
+
+        np.testing.assert_array_equal(Point.remove_proximity(points, 2), [[0, 0], [5, 5]])
+        np.testing.assert_array_equal(Region.remove_proximity(regions, 2), [[10, 10, 5, 5], [30, 10, 5, 5]])
+
     def test_region_default_size_is_read_at_initialization(self):
         with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=1920, height=1080)):
             region = Region()
 
         self.assertEqual(region.to_tuple(), (0, 0, 1920, 1080))
 
+    def test_region_with_explicit_size_does_not_read_screen_size(self):
+        with patch.object(base.pg, 'size', side_effect=AssertionError('screen size requested')):
+            region = Region(1, 2, 3, 4)
+
+        self.assertEqual(region.to_tuple(), (1, 2, 3, 4))
+
+    def test_point_set_filters_sorts_and_offsets_without_point_objects(self):
+        points = PointSet([(10, 10), (0, 0), (5, 5), (100, 0)])
+
+        nearest = points.sort_by_distance(Point(4, 4))
+        inside = points.offset(1, 1).within(Region(0, 0, 20, 20))
+
+        self.assertIsInstance(points[1:], PointSet)
+        self.assertEqual(nearest[0].to_tuple(), (5, 5))
+        self.assertEqual(nearest.to_array().tolist(), [[5, 5], [0, 0], [10, 10], [100, 0]])
+        self.assertEqual([point.to_tuple() for point in inside], [(11, 11), (1, 1), (6, 6)])
+        self.assertEqual(len(points.filter(points.x > 4)), 3)
+
+    def test_region_set_materializes_regions_lazily(self):
+        regions = RegionSet([(0, 0, 10, 10), (50, 50, 4, 6)])
+
+        self.assertEqual(regions.centers.to_array().tolist(), [[5, 5], [52, 53]])
+        self.assertEqual(regions.nearest(Point(60, 60)).to_tuple(), (50, 50, 4, 6))
+        self.assertEqual(regions.offset(1, 2)[0].to_tuple(), (1, 2, 10, 10))
+
     def test_parse_color_formats(self):
         self.assertEqual(parse_color('#0f0'), (0, 255, 0))
         self.assertEqual(parse_color('rgb(255, 0, 10)'), (255, 0, 10))
@@ -55,8 +111,54 @@ class ScreenTests(unittest.TestCase):
         with patch.object(region, '_screenshot_array', return_value=image):
             points = region.wait_colors((10, 20, 30), timeout=0, confidence=1)
 
+        self.assertIsInstance(points, PointSet)
         self.assertEqual([point.to_tuple() for point in points], [(102, 201)])
 
+    def test_color_query_classifies_all_colors_in_one_pass(self):
+        image = np.zeros((4, 5, 3), dtype=np.uint8)
+        image[0, 1] = [255, 0, 0]
+        image[2, 3] = [0, 0, 250]
+        image[3, 0] = [0, 255, 0]
+
+        query = ColorQuery([(255, 0, 0), (0, 0, 255)], confidence=0.95)
+        bits = query.classify(image)
+
+        self.assertEqual(bits[0, 1], 1)
+        self.assertEqual(bits[2, 3], 2)
+        self.assertEqual(int(bits.sum()), 3)
+        self.assertEqual(query.points(image).tolist(), [[1, 0], [3, 2]])
+        self.assertEqual(query.first(image), (1, 0))
+
+    def test_color_query_splits_large_palettes(self):
+        image = np.zeros((4, 5, 3), dtype=np.uint8)
+        image[0, 0] = [255, 255, 255]
+        image[3, 4] = [199, 0, 0]
+        colors = [(value, 0, 0) for value in range(100, 200)]
+
+        query = ColorQuery(colors, confidence=1)
+
+        self.assertEqual(query.points(image).tolist(), [[4, 3]])
+        self.assertEqual(query.first(image), (4, 3))
+        self.assertEqual([(blob.to_tuple(), blob.color) for blob in query.blobs(image)], [((4, 3, 1, 1), (199, 0, 0))])
+        with self.assertRaises(ValueError):
+            query.classify(image)
+
+    def test_wait_blobs_returns_connected_areas(self):
+        image = np.zeros((20, 30, 3), dtype=np.uint8)
+        image[2:6, 3:13] = [255, 0, 0]
+        image[10:15, 20:22] = [0, 0, 255]
+
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=1920, height=1080)):
+            region = Region(100, 200, 30, 20)
+
+        with patch.object(region, '_screenshot_array', return_value=image):
+            blobs = region.wait_blobs(('red', 'blue'), timeout=0, confidence=1)
+
+        self.assertEqual([blob.to_tuple() for blob in blobs], [(103, 202, 10, 4), (120, 210, 2, 5)])
+        self.assertEqual([blob.area for blob in blobs], [40, 10])
+        self.assertEqual((blobs[0].cx, blobs[0].cy), (107.5, 203.5))
+        self.assertEqual(blobs[1].color, (0, 0, 255))
+
     def test_find_text_scales_ocr_coordinates_back(self):
         data = {
             'text': ['Hello', 'World'],
@@ -73,13 +175,376 @@ class ScreenTests(unittest.TestCase):
         with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=1920, height=1080)):
             region = Region(10, 20, 100, 50)
 
-        with patch.object(region, 'screenshot', return_value=Image.new('RGB', (100, 50))):
-            with patch.object(base.pytesseract, 'image_to_data', return_value=data):
+        pool = OcrEnginePool(PytesseractEngine)
+        with patch.object(region, '_screenshot_array', return_value=np.zeros((50, 100, 3), dtype=np.uint8)):
+            with patch.object(base, 'get_ocr_pool', return_value=pool), \
+                    patch.object(engines.pytesseract, 'image_to_data', return_value=data):
                 regions = region.find_text('Hello World', resize=2, sharpen=False)
 
         self.assertEqual(len(regions), 1)
         self.assertEqual(regions[0].to_tuple(), (20, 30, 12, 5))
 
+    def test_find_texts_answers_all_queries_from_one_ocr_pass(self):
+        data = {
+            'text': ['File', 'Edit', 'View', 'Save', 'as'],
+            'conf': [96, 96, 96, 95, 95],
+            'left': [0, 30, 60, 0, 30],
+            'top': [0, 0, 0, 20, 20],
+            'width': [20, 20, 20, 25, 10],
+            'height': [10, 10, 10, 10, 10],
+            'block_num': [1, 1, 1, 2, 2],
+            'par_num': [1, 1, 1, 1, 1],
+            'line_num': [1, 1, 1, 1, 1],
+        }
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=1920, height=1080)):
+            region = Region(100, 100, 100, 40)
+        pool = OcrEnginePool(PytesseractEngine, cache=False)
+
+        with patch.object(region, '_screenshot_array', return_value=np.zeros((40, 100, 3), dtype=np.uint8)):
+            with patch.object(base, 'get_ocr_pool', return_value=pool), \
+                    patch.object(engines.pytesseract, 'image_to_data', return_value=data) as image_to_data:
+                found = region.find_texts(['edit', 'Vlew', 'save as', 'Help'], sharpen=False, max_distance=1)
+
+        self.assertEqual(image_to_data.call_count, 1)
+        self.assertEqual(found['edit'][0].to_tuple(), (130, 100, 20, 10))
+        self.assertEqual(found['Vlew'][0].to_tuple(), (160, 100, 20, 10))
+        self.assertEqual(found['save as'][0].to_tuple(), (100, 120, 40, 10))
+        self.assertEqual(len(found['Help']), 0)
+
+
+class FrameSourceTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.frame = rng.integers(0, 256, size=(60, 80, 3), dtype=np.uint8)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=80, height=60)):
+            self.region = Region(0, 0, 80, 60)
+
+    def save_template(self, name: str, image: np.ndarray) -> str:
+        path = str(Path(self.tmp.name) / name)
+        Image.fromarray(image).save(path)
+        return path
+
+    def test_wait_image_grabs_one_frame_per_poll_for_all_templates(self):
+        missing = self.save_template('missing.png', np.eye(8, dtype=np.uint8)[:, :, None].repeat(3, axis=2) * 255)
+        button = self.save_template('button.png', self.frame[20:32, 30:46])
+        source = ReplayFrameSource([self.frame])
+
+        with use_frame_source(source), patch.object(source, 'grab', wraps=source.grab) as grab:
+            result = self.region.wait_image((missing, button), timeout=0, confidence=0.99)
+
+        self.assertEqual(grab.call_count, 1)
+        self.assertEqual(result.to_tuple(), (30, 20, 16, 12))
+
+    def test_replay_source_advances_per_grab_and_repeats_last_frame(self):
+        empty = np.zeros_like(self.frame)
+        source = ReplayFrameSource([empty, self.frame])
+        path = self.save_template('button.png', self.frame[5:15, 5:15])
+
+        with use_frame_source(source):
+            result = self.region.wait_image(path, timeout=1, check_interval=0.01)
+
+        self.assertEqual(result.to_tuple(), (5, 5, 10, 10))
+        self.assertEqual(source.index, 1)
+
+    def test_replay_source_pads_areas_outside_the_frame(self):
+        source = ReplayFrameSource([self.frame], origin=(10, 10))
+
+        crop = source.grab((0, 0, 20, 20))
+
+        self.assertEqual(crop.shape, (20, 20, 3))
+        self.assertFalse(crop[:10].any())
+        np.testing.assert_array_equal(crop[10:, 10:], self.frame[:10, :10])
+
+    def test_snapshot_grabs_union_once_and_serves_views(self):
+        source = ReplayFrameSource([self.frame])
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=80, height=60)):
+            regions = [Region(10, 10, 5, 5), Region(40, 30, 10, 8)]
+        path = self.save_template('button.png', self.frame[32:37, 42:48])
+
+        with patch.object(source, 'grab', wraps=source.grab) as grab:
+            snapshot = ScreenSnapshot(regions, source=source)
+            view = snapshot.view(regions[1])
+            found = snapshot.find_image(regions[1], path, confidence=0.99)
+            color = snapshot.find_color(regions[0], tuple(int(c) for c in self.frame[12, 13]), confidence=1)
+
+        grab.assert_called_once_with((10, 10, 40, 28))
+        self.assertTrue(np.shares_memory(view, snapshot.frame))
+        np.testing.assert_array_equal(view, self.frame[30:38, 40:50])
+        self.assertEqual(found.to_tuple(), (42, 32, 6, 5))
+        self.assertIsNotNone(color)
+        self.assertTrue(10 <= color.x < 15 and 10 <= color.y < 15)
+
+    def test_shared_source_captures_union_of_recent_areas(self):
+        source = ReplayFrameSource([self.frame])
+        shared = SharedFrameSource(source, max_age=60)
+
+        with patch.object(source, 'grab', wraps=source.grab) as grab:
+            shared.grab((10, 10, 5, 5))
+            shared.grab((40, 30, 10, 8))
+            crop = shared.grab((12, 12, 3, 3))
+
+        self.assertEqual(grab.call_args_list[-1].args, ((10, 10, 40, 28),))
+        self.assertEqual((shared.grabs, shared.captures), (3, 2))
+        np.testing.assert_array_equal(crop, self.frame[12:15, 12:15])
+
+
+class ConditionTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        patch_pixels = rng.integers(0, 256, size=(12, 12, 3), dtype=np.uint8)
+        self.frames = [np.zeros((60, 80, 3), dtype=np.uint8) for _ in range(3)]
+        for frame in self.frames[1:]:
+            frame[30:35, 50:55] = (255, 0, 0)
+        self.frames[2][5:17, 5:17] = patch_pixels
+        self.frames[2][[0, 59], [0, 79]] = (250, 250, 250)
+        self.template = Template.from_array(patch_pixels, name='patch')
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=80, height=60)):
+            self.left = Region(0, 0, 40, 60)
+            self.right = Region(40, 0, 40, 60)
+
+    def conditions(self):
+        return (
+            ImageCondition(self.left, self.template, confidence=0.99),
+            ColorCondition(self.right, 'red'),
+            PixelCondition([(0, 0, 'white'), (79, 59, (255, 255, 255))], tolerance=5),
+        )
+
+    def test_wait_any_checks_all_conditions_on_one_snapshot_per_poll(self):
+        source = ReplayFrameSource(self.frames)
+        image, color, pixels = self.conditions()
+
+        with use_frame_source(source):
+            fired = wait_any(image, color, pixels, timeout=1, check_interval=0.001)
+
+        self.assertEqual((fired.index, fired.condition), (1, color))
+        self.assertEqual(fired.result.to_tuple(), (50, 30))
+        self.assertEqual(source.index, 2)
+
+    def test_wait_all_returns_results_once_every_condition_holds(self):
+        source = ReplayFrameSource(self.frames)
+
+        with use_frame_source(source):
+            image, color, pixels = wait_all(*self.conditions(), timeout=1, check_interval=0.001)
+
+        self.assertEqual(image.to_tuple(), (5, 5, 12, 12))
+        self.assertEqual(color.to_tuple(), (50, 30))
+        self.assertEqual(pixels.to_tuple(), (0, 0, 80, 60))
+
+    def test_failed_check_is_repeated_on_unchanged_region(self):
+        color = ColorCondition(self.right, 'red')
+        snapshot = ScreenSnapshot([self.right], source=ReplayFrameSource(self.frames[1:2]))
+
+        with patch.object(ScreenSnapshot, 'find_color', side_effect=RuntimeError('check failed')):
+            with self.assertRaises(RuntimeError):
+                color.evaluate(snapshot)
+
+        self.assertEqual(color.evaluate(snapshot).to_tuple(), (50, 30))
+
+
+class MetricsTests(unittest.TestCase):
+    def setUp(self):
+        frame = np.zeros((20, 20, 3), dtype=np.uint8)
+        frame[5, 5] = (255, 0, 0)
+        self.source = ReplayFrameSource([frame])
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=20, height=20)):
+            self.region = Region(0, 0, 20, 20)
+
+    def test_region_waits_record_spans_and_poll_outcomes(self):
+        metrics = Metrics()
+
+        with use_frame_source(self.source), use_metrics(metrics):
+            found = self.region.wait_color('red', timeout=0)
+            missing = self.region.wait_color('blue', timeout=0)
+
+        self.assertIsNotNone(found)
+        self.assertIsNone(missing)
+        self.assertEqual(metrics['capture'].count, 2)
+        self.assertEqual(metrics['color'].count, 2)
+        self.assertEqual(metrics['wait'].count, 2)
+        self.assertEqual(metrics.counters, {'polls': 2, 'hits': 1, 'misses': 1})
+        self.assertIsNone(get_metrics())
+
+    def test_histogram_quantiles_use_bucket_bounds(self):
+        histogram = Histogram((1, 10, 100))
+        for value in (0.5, 2, 3, 4, 50, 500):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.buckets, [1, 3, 1, 1])
+        self.assertEqual(histogram.quantile(0.5), 10)
+        self.assertEqual(histogram.quantile(0.99), 500)
+        self.assertEqual(histogram.quantile(0), 1)
+        self.assertAlmostEqual(histogram.mean, 93.25)
+
+    def test_flush_writes_memory_jsonl_and_prometheus_sinks(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        memory = MemorySink()
+        jsonl = JsonlSink(Path(tmp.name) / 'stats.jsonl')
+        prometheus = PrometheusSink(Path(tmp.name) / 'stats.prom', labels={'macro': 'loot'})
+        metrics = Metrics([memory, jsonl, prometheus], bounds=(1, 10))
+        metrics.observe('match', 4)
+        metrics.count('hits')
+
+        metrics.flush()
+        metrics.flush()
+
+        self.assertEqual(len(memory.snapshots), 2)
+        self.assertEqual(memory.latest['histograms']['match']['buckets'], [0, 1, 0])
+        self.assertEqual(len(jsonl.path.read_text(encoding='utf-8').splitlines()), 2)
+        text = prometheus.path.read_text(encoding='utf-8')
+        self.assertIn('simpleautogui_hits_total{macro="loot"} 1', text)
+        self.assertIn('simpleautogui_match_seconds_bucket{macro="loot",le="0.001"} 0', text)
+        self.assertIn('simpleautogui_match_seconds_bucket{macro="loot",le="0.01"} 1', text)
+        self.assertIn('simpleautogui_match_seconds_sum{macro="loot"} 0.004', text)
+
+
+class TraceTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        first = rng.integers(0, 255, size=(64, 64, 3), dtype=np.uint8)
+        second = first.copy()
+        second[5:8, 40:43] = (255, 0, 0)
+        self.frames = [first, second, second.copy()]
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=64, height=64)):
+            self.region = Region(0, 0, 64, 64)
+
+    def record(self) -> TraceRecorder:
+        with TraceRecorder(self.tmp.name, ReplayFrameSource(self.frames)) as recorder:
+            for _ in self.frames:
+                recorder.grab((0, 0, 64, 64))
+            recorder.record('click', x=41, y=6, point=Point(41, 6))
+        return recorder
+
+    def test_recorder_stores_changed_tiles_and_trace_decodes_frames(self):
+        recorder = self.record()
+        trace = Trace(self.tmp.name)
+
+        self.assertEqual(recorder.bytes, 64 * 64 * 3 + 32 * 32 * 3)
+        self.assertEqual([event['patch'] for event in trace.frames], [[0, 0, 64, 64], [32, 0, 32, 32], None])
+        for index, frame in enumerate(self.frames):
+            np.testing.assert_array_equal(trace.frame(index), frame)
+        self.assertEqual(trace.actions[0]['point'], [41, 6])
+
+    def test_trace_source_replays_frames_into_waits(self):
+        self.record()
+        source = TraceFrameSource(self.tmp.name)
+
+        with use_frame_source(source):
+            found = self.region.wait_color('red', timeout=1, check_interval=0.01, confidence=1)
+            crop = source.grab((40, 5, 3, 3))
+
+        self.assertEqual(found.to_tuple(), (40, 5))
+        self.assertTrue((crop == (255, 0, 0)).all())
+        with self.assertRaises(ValueError):
+            source.grab((60, 60, 10, 10))
+
+
+class FakeClock:
+    def __init__(self, work: float = 0):
+        self.now = 100.0
+        self.work = work
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
+class PollerTests(unittest.TestCase):
+    def test_poller_never_sleeps_past_deadline_and_counts_polls(self):
+        clock = FakeClock()
+        poller = Poller(timeout=1, interval=0.3, sleep=clock.sleep, clock=clock)
+
+        for _ in poller:
+            clock.now += 0.05
+
+        self.assertEqual(clock.sleeps, [0.25, 0.25, 0.25, 0.05])
+        self.assertEqual(poller.polls, 5)
+        self.assertAlmostEqual(clock.now, 101.05)
+
+    def test_poller_sleeps_zero_after_overrun_polls(self):
+        clock = FakeClock()
+        poller = Poller(timeout=1, interval=0.1, sleep=clock.sleep, clock=clock)
+
+        for _ in poller:
+            clock.now += 0.4
+
+        self.assertEqual(clock.sleeps, [0, 0])
+        self.assertEqual(poller.polls, 3)
+
+    def test_poller_with_zero_timeout_polls_once(self):
+        clock = FakeClock()
+        poller = Poller(timeout=0, sleep=clock.sleep, clock=clock)
+
+        self.assertEqual(list(poller), [1])
+        self.assertEqual(clock.sleeps, [])
+
+    def test_backoff_and_learned_intervals(self):
+        backoff = ExponentialBackoff(initial=0.01, factor=2, max_interval=0.05)
+        learned = LearnedInterval(min_interval=0.02, max_interval=0.5)
+        learned.record(2.0)
+        learned.record(3.0)
+
+        self.assertEqual([backoff.interval(poll, 0) for poll in range(1, 5)], [0.01, 0.02, 0.04, 0.05])
+        self.assertEqual(learned.interval(1, 0.0), 0.5)
+        self.assertAlmostEqual(learned.interval(5, 1.9), 0.1)
+        self.assertEqual(learned.interval(9, 2.5), 0.02)
+
+
+class TemplateRegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def save(self, name: str, value: int, size: int = 10) -> str:
+        path = str(Path(self.tmp.name) / name)
+        Image.new('RGB', (size, size), (value, value, value)).save(path)
+        return path
+
+    def test_registry_decodes_once_and_reloads_changed_files(self):
+        registry = TemplateRegistry()
+        path = self.save('a.png', 10)
+
+        first = registry.get(path)
+        self.assertIs(registry.get(path), first)
+
+        self.save('a.png', 20)
+        os.utime(path, ns=(first.mtime + 10 ** 9, first.mtime + 10 ** 9))
+        reloaded = registry.get(path)
+
+        self.assertIsNot(reloaded, first)
+        self.assertEqual(int(reloaded.color[0, 0, 0]), 20)
+
+    def test_registry_evicts_least_recently_used_by_byte_budget(self):
+        registry = TemplateRegistry(max_bytes=2 * 10 * 10 * 3)
+        a, b, c = self.save('a.png', 1), self.save('b.png', 2), self.save('c.png', 3)
+
+        registry.load([a, b])
+        registry.get(a)
+        registry.get(c)
+
+        self.assertIn(a, registry)
+        self.assertNotIn(b, registry)
+        self.assertIn(c, registry)
+
+    def test_wait_image_accepts_template_objects(self):
+        frame = np.random.default_rng(1).integers(0, 256, size=(40, 40, 3), dtype=np.uint8)
+        template = Template.from_array(frame[10:20, 5:25])
+        with patch.object(base.pg, 'size', return_value=SimpleNamespace(width=40, height=40)):
+            region = Region(100, 100, 40, 40)
+
+        with use_frame_source(ReplayFrameSource([frame], origin=(100, 100))):
+            result = region.wait_image(template, timeout=0)
+
+        self.assertEqual(result.to_tuple(), (105, 110, 20, 10))
+
 
 if __name__ == '__main__':
     unittest.main()